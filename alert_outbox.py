@@ -0,0 +1,359 @@
+"""Alert outbox: scenario hits queued on disk and delivered by an asyncio dispatcher.
+
+The live pipeline enqueues one entry per event (date|title), with the scenarios
+it met. Entries already in the outbox are not queued again, so an event is
+delivered at most once even if a later run evaluates it again. The dispatcher
+sends the undelivered entries to a sink in batches, retries failed batches
+with backoff, and marks an entry delivered only once the sink accepted it.
+
+ALERT_SINK picks the sink:
+    slack               Slack, via SLACK_WEBHOOK_URL or SLACK_BOT_TOKEN + SLACK_CHANNEL_ID
+    file:<path>         JSON lines appended to a local file
+    http://host:port/   JSON POSTs with an Idempotency-Key header (see alert_sink_server.py)
+Default: slack when a Slack credential is set, else file:delivered_alerts.jsonl
+
+    python alert_outbox.py dispatch     # deliver what is queued, then exit
+    python alert_outbox.py status       # count queued / delivered / expired entries
+"""
+
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import requests
+
+from alert_state import alert_key
+from state_file import load_state, save_state
+
+
+ALERT_OUTBOX_FILE = os.getenv('ALERT_OUTBOX_FILE', 'alert_outbox.json')
+ALERT_SINK = os.getenv('ALERT_SINK', '')
+# Entries per sink call, and sink calls in flight at once
+ALERT_BATCH_SIZE = int(os.getenv('ALERT_BATCH_SIZE', '10'))
+ALERT_CONCURRENCY = int(os.getenv('ALERT_CONCURRENCY', '2'))
+# Attempts per batch in one dispatch, with exponential backoff from ALERT_RETRY_DELAY seconds
+ALERT_RETRIES = int(os.getenv('ALERT_RETRIES', '3'))
+ALERT_RETRY_DELAY = float(os.getenv('ALERT_RETRY_DELAY', '1'))
+# An HT alert is useless once the second half is well under way
+ALERT_EXPIRY_MINUTES = int(os.getenv('ALERT_EXPIRY_MINUTES', '45'))
+# Delivered/expired entries stay this long so repeats are still recognised
+OUTBOX_KEEP_DAYS = int(os.getenv('OUTBOX_KEEP_DAYS', '2'))
+SINK_TIMEOUT = float(os.getenv('ALERT_SINK_TIMEOUT', '10'))
+
+_TIME_FORMAT = '%d-%m-%y %H:%M:%S'
+
+
+def format_alert(entry, number=None):
+    """Text of one outbox entry, in the layout the live printout has always used."""
+    alert = entry['alert']
+    lines = [f"{number}. {alert['title']}" if number else alert['title'],
+             f"   Filter: {', '.join(entry['filters'])}",
+             f"   Tournament: {alert['tournament']}",
+             f"   Log Time: {alert['log_time']}",
+             f"   Odds - Home: {alert['home_odds']}, Draw: {alert['draw_odds']}, Away: {alert['away_odds']}"]
+    if alert.get('model_probability') is not None:
+        lines.append(f"   Model: {alert['model_probability']:.0%} chance of a second-half goal")
+    return '\n'.join(lines)
+
+
+def batch_key(entries):
+    """Idempotency key of a batch: the same entries always give the same key."""
+    return hashlib.sha1('\n'.join(sorted(entry['id'] for entry in entries)).encode('utf-8')).hexdigest()
+
+
+class AlertOutbox:
+    """
+    Persisted queue of alert entries keyed by event, with a delivered flag per entry
+    """
+
+    def __init__(self, path=None):
+        self.path = path or ALERT_OUTBOX_FILE
+        self.lock = threading.Lock()
+        self.entries = {entry['id']: entry for entry in load_state(self.path, [])}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def enqueue(self, matches):
+        """
+        Queue scenario hits (dicts from utils.scenario_matches()), one entry per event
+
+        Returns:
+            int: Number of new entries
+        """
+        added = 0
+        now = datetime.now().strftime(_TIME_FORMAT)
+        with self.lock:
+            for match in matches or []:
+                event = alert_key(match['date'], match['title'])
+                entry = self.entries.get(event)
+                if entry is None:
+                    alert = {key: (None if value != value else value) for key, value in match.items()
+                             if key != 'filter'}
+                    entry = self.entries[event] = {
+                        'id': event, 'alert': alert, 'filters': [], 'created': now,
+                        'delivered': None, 'expired': None, 'attempts': 0, 'last_error': None,
+                    }
+                    added += 1
+                # A second scenario for an event still in the queue joins the same message
+                if not entry['delivered'] and match['filter'] not in entry['filters']:
+                    entry['filters'].append(match['filter'])
+        if added:
+            print(f"📮 Queued {added} alert(s) in {self.path}")
+        return added
+
+    def pending(self):
+        """Undelivered entries, oldest first; ones past ALERT_EXPIRY_MINUTES are marked expired."""
+        cutoff = datetime.now() - timedelta(minutes=ALERT_EXPIRY_MINUTES)
+        now = datetime.now().strftime(_TIME_FORMAT)
+        pending = []
+        with self.lock:
+            for entry in self.entries.values():
+                if entry['delivered'] or entry['expired']:
+                    continue
+                if datetime.strptime(entry['created'], _TIME_FORMAT) < cutoff:
+                    entry['expired'] = now
+                    print(f"⌛ Gave up on alert {entry['id']} after {entry['attempts']} attempts")
+                    continue
+                pending.append(entry)
+        return sorted(pending, key=lambda entry: datetime.strptime(entry['created'], _TIME_FORMAT))
+
+    def mark_delivered(self, entries):
+        now = datetime.now().strftime(_TIME_FORMAT)
+        with self.lock:
+            for entry in entries:
+                entry['delivered'] = now
+                entry['last_error'] = None
+
+    def mark_failed(self, entries, error):
+        with self.lock:
+            for entry in entries:
+                entry['last_error'] = str(error)
+
+    def counts(self):
+        with self.lock:
+            entries = list(self.entries.values())
+        return {
+            'queued': sum(1 for entry in entries if not entry['delivered'] and not entry['expired']),
+            'delivered': sum(1 for entry in entries if entry['delivered']),
+            'expired': sum(1 for entry in entries if entry['expired']),
+        }
+
+    def save(self):
+        """Write the outbox atomically, dropping finished entries older than OUTBOX_KEEP_DAYS."""
+        cutoff = datetime.now() - timedelta(days=OUTBOX_KEEP_DAYS)
+        with self.lock:
+            self.entries = {
+                key: entry for key, entry in self.entries.items()
+                if not (entry['delivered'] or entry['expired'])
+                or datetime.strptime(entry['created'], _TIME_FORMAT) >= cutoff}
+            entries = [dict(entry, filters=list(entry['filters'])) for entry in self.entries.values()]
+            # The daemon and the dispatcher thread both save, through the same .tmp file
+            return save_state(self.path, entries)
+
+
+class FileSink:
+    """
+    Appends each entry as a JSON line; entries already in the file are skipped
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.name = f"file:{path}"
+        self.written = None
+
+    def _write(self, entries):
+        if self.written is None:
+            self.written = set()
+            if os.path.exists(self.path):
+                with open(self.path, encoding='utf-8') as f:
+                    self.written = {json.loads(line)['id'] for line in f if line.strip()}
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                if entry['id'] not in self.written:
+                    f.write(json.dumps({'id': entry['id'], 'filters': entry['filters'], **entry['alert']}) + '\n')
+                    self.written.add(entry['id'])
+
+    async def send(self, entries):
+        await asyncio.to_thread(self._write, entries)
+
+
+class HttpSink:
+    """
+    POSTs {"alerts": [...]} as JSON with an Idempotency-Key header per batch
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self.name = url
+
+    def _post(self, entries):
+        payload = {'alerts': [{'id': entry['id'], 'filters': entry['filters'], **entry['alert']}
+                              for entry in entries]}
+        response = requests.post(self.url, json=payload, timeout=SINK_TIMEOUT,
+                                 headers={'Idempotency-Key': batch_key(entries)})
+        response.raise_for_status()
+
+    async def send(self, entries):
+        await asyncio.to_thread(self._post, entries)
+
+
+class SlackSink:
+    """
+    One Slack message per batch, through an incoming webhook or chat.postMessage
+    """
+
+    name = 'slack'
+
+    def __init__(self, webhook_url=None, token=None, channel=None):
+        self.webhook_url = webhook_url
+        self.token = token
+        self.channel = channel
+
+    @staticmethod
+    def message(entries):
+        body = '\n\n'.join(format_alert(entry, i) for i, entry in enumerate(entries, 1))
+        return {
+            'username': 'aTom',
+            'icon_emoji': ':cloud:',
+            'text': f":hourglass_flowing_sand: Live | Action Required - {len(entries)} event(s) meeting filter criteria",
+            'blocks': [{'type': 'section', 'text': {'type': 'mrkdwn', 'text': body[:3000]}}],
+        }
+
+    def _post(self, entries):
+        payload = self.message(entries)
+        if self.webhook_url:
+            response = requests.post(self.webhook_url, json=payload, timeout=SINK_TIMEOUT)
+            response.raise_for_status()
+            return
+        response = requests.post('https://slack.com/api/chat.postMessage', json=dict(payload, channel=self.channel),
+                                 headers={'Authorization': f"Bearer {self.token}"}, timeout=SINK_TIMEOUT)
+        response.raise_for_status()
+        result = response.json()
+        if not result.get('ok'):
+            raise RuntimeError(f"Slack error: {result.get('error')}")
+
+    async def send(self, entries):
+        await asyncio.to_thread(self._post, entries)
+
+
+def make_sink(spec=None):
+    """
+    Sink named by spec (default: ALERT_SINK, see the module docstring)
+
+    Raises:
+        ValueError: Unknown sink, or Slack without credentials
+    """
+    spec = (spec if spec is not None else ALERT_SINK).strip()
+    webhook_url = os.getenv('SLACK_WEBHOOK_URL')
+    token, channel = os.getenv('SLACK_BOT_TOKEN'), os.getenv('SLACK_CHANNEL_ID')
+    if not spec:
+        spec = 'slack' if webhook_url or token else 'file:delivered_alerts.jsonl'
+    if spec == 'slack':
+        if not webhook_url and not (token and channel):
+            raise ValueError("Slack sink needs SLACK_WEBHOOK_URL or SLACK_BOT_TOKEN and SLACK_CHANNEL_ID")
+        return SlackSink(webhook_url, token, channel)
+    if spec.startswith('file:'):
+        return FileSink(spec[len('file:'):])
+    if spec.startswith(('http://', 'https://')):
+        return HttpSink(spec)
+    raise ValueError(f"Unknown ALERT_SINK: {spec}")
+
+
+class AlertDispatcher:
+    """
+    Delivers the outbox's undelivered entries to a sink in batches, with retries
+    """
+
+    def __init__(self, outbox, sink, batch_size=None, retries=None, retry_delay=None, concurrency=None):
+        self.outbox = outbox
+        self.sink = sink
+        self.batch_size = batch_size or ALERT_BATCH_SIZE
+        self.retries = retries or ALERT_RETRIES
+        self.retry_delay = ALERT_RETRY_DELAY if retry_delay is None else retry_delay
+        self.concurrency = concurrency or ALERT_CONCURRENCY
+
+    async def _send_batch(self, batch, semaphore):
+        async with semaphore:
+            for attempt in range(1, self.retries + 1):
+                for entry in batch:
+                    entry['attempts'] += 1
+                try:
+                    await self.sink.send(batch)
+                    self.outbox.mark_delivered(batch)
+                    return True
+                except Exception as e:
+                    self.outbox.mark_failed(batch, e)
+                    if attempt == self.retries:
+                        print(f"❌ Delivering {len(batch)} alert(s) to {self.sink.name} failed: {e}")
+                        return False
+                    delay = self.retry_delay * 2 ** (attempt - 1)
+                    print(f"🔁 {self.sink.name} failed ({e}) - retry {attempt}/{self.retries - 1} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+
+    async def dispatch(self):
+        """
+        Deliver everything queued once
+
+        Returns:
+            dict: {'delivered': int, 'failed': int}
+        """
+        pending = self.outbox.pending()
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._send_batch(batch, semaphore) for batch in batches))
+        self.outbox.save()
+        stats = {
+            'delivered': sum(len(batch) for batch, ok in zip(batches, results) if ok),
+            'failed': sum(len(batch) for batch, ok in zip(batches, results) if not ok),
+        }
+        if batches:
+            print(f"📨 Delivered {stats['delivered']} alert(s) to {self.sink.name}, {stats['failed']} still queued")
+        return stats
+
+    async def run(self, stop_event, interval=5.0):
+        """Dispatch every interval seconds until stop_event (a threading.Event) is set, then once more."""
+        while not stop_event.is_set():
+            await self.dispatch()
+            await asyncio.to_thread(stop_event.wait, interval)
+        await self.dispatch()
+
+
+def dispatch_outbox(outbox=None, sink=None):
+    """
+    Deliver the queued alerts once (blocking wrapper for scripts and workflows)
+
+    Args:
+        outbox (AlertOutbox): Default: the one in ALERT_OUTBOX_FILE
+        sink: A sink, or a sink spec (default: ALERT_SINK)
+
+    Returns:
+        dict: {'delivered': int, 'failed': int}, or None if the sink couldn't be set up
+    """
+    try:
+        if sink is None or isinstance(sink, str):
+            sink = make_sink(sink)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return None
+    return asyncio.run(AlertDispatcher(outbox or AlertOutbox(), sink).dispatch())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Deliver queued alerts")
+    parser.add_argument('command', choices=['dispatch', 'status'])
+    parser.add_argument('--sink', default=None, help='Sink spec (default: ALERT_SINK)')
+    args = parser.parse_args()
+
+    if args.command == 'dispatch':
+        stats = dispatch_outbox(sink=args.sink)
+        if stats is None:
+            raise SystemExit(1)
+    else:
+        counts = AlertOutbox().counts()
+        print(f"📮 {counts['queued']} queued, {counts['delivered']} delivered, {counts['expired']} expired")
@@ -0,0 +1,104 @@
+"""Local stand-in for the alert sink that records what it receives.
+
+Run it and point the dispatcher at it to check delivery offline:
+
+    python alert_sink_server.py --port 8766 --fail-first 2
+    ALERT_SINK=http://127.0.0.1:8766/ python alert_outbox.py dispatch
+"""
+
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SinkRecorder:
+    """
+    Alerts received so far, deduplicated on the Idempotency-Key header
+    """
+
+    def __init__(self, fail_first=0, fail_status=503):
+        self.lock = threading.Lock()
+        self.batches = {}
+        self.requests = 0
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+
+    @property
+    def alerts(self):
+        with self.lock:
+            return [alert for batch in self.batches.values() for alert in batch]
+
+
+def make_handler(recorder):
+    """Build a request handler that stores POSTed batches in recorder."""
+
+    class SinkHandler(BaseHTTPRequestHandler):
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length)
+            with recorder.lock:
+                recorder.requests += 1
+                # The first fail_first requests fail to exercise the retries
+                if recorder.requests <= recorder.fail_first:
+                    self._send(recorder.fail_status, {'ok': False, 'error': 'stub failure'})
+                    return
+                try:
+                    alerts = json.loads(body)['alerts']
+                except (ValueError, KeyError):
+                    self._send(400, {'ok': False, 'error': 'expected {"alerts": [...]}'})
+                    return
+                key = self.headers.get('Idempotency-Key') or str(len(recorder.batches))
+                duplicate = key in recorder.batches
+                recorder.batches.setdefault(key, alerts)
+            self._send(200, {'ok': True, 'duplicate': duplicate})
+
+        def do_GET(self):
+            self._send(200, {'requests': recorder.requests, 'alerts': recorder.alerts})
+
+        def log_message(self, format, *args):
+            # Keep test output quiet
+            pass
+
+    return SinkHandler
+
+
+def start_sink_server(port=0, fail_first=0, fail_status=503):
+    """
+    Start the stand-in sink in a background thread
+
+    Returns:
+        tuple: (server, recorder, url) - call server.shutdown() when done
+    """
+    recorder = SinkRecorder(fail_first, fail_status)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(recorder))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, recorder, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--fail-first', type=int, default=0,
+                        help='Answer the first N requests with --fail-status')
+    parser.add_argument('--fail-status', type=int, default=503)
+    args = parser.parse_args()
+
+    recorder = SinkRecorder(args.fail_first, args.fail_status)
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(recorder))
+    print(f"🧪 Recording alerts on http://127.0.0.1:{args.port}/ (GET it to see them)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
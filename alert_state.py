@@ -0,0 +1,79 @@
+"""Matches already alerted, kept between polls and between runs.
+
+The live pipeline evaluates the scenarios on freshly scraped records and skips
+the (date, title) keys recorded here. The alerts log is only read back for the
+matches backfill just completed. Keys older than ALERTED_KEEP_DAYS are
+dropped on save.
+"""
+
+
+import os
+import threading
+from datetime import datetime, timedelta
+
+from state_file import load_state, save_state
+
+
+ALERTED_STATE_FILE = os.getenv('ALERTED_STATE_FILE', 'alerted_state.json')
+ALERTED_KEEP_DAYS = int(os.getenv('ALERTED_KEEP_DAYS', '2'))
+
+
+def alert_key(date, title):
+    """Identity of an alert across runs: its log date and match title."""
+    return f"{str(date).strip()}|{str(title).strip()}"
+
+
+class AlertedState:
+    """
+    {alert_key: 'dd-mm-yy'} of the matches alerted so far, plus any other
+    fields the owner keeps in the same file (e.g. the daemon's last_poll)
+    """
+
+    def __init__(self, path=None, keep_days=None):
+        self.path = path or ALERTED_STATE_FILE
+        self.keep_days = ALERTED_KEEP_DAYS if keep_days is None else keep_days
+        state = load_state(self.path, {})
+        self.alerted = dict(state.pop('alerted', {}))
+        self.extra = state
+        # The daemon marks backfilled hits on its writer thread
+        self.lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self.alerted
+
+    def __len__(self):
+        return len(self.alerted)
+
+    def keys(self):
+        with self.lock:
+            return set(self.alerted)
+
+    def mark(self, matches):
+        """
+        Record alerted matches (dicts with 'date' and 'title')
+
+        Returns:
+            int: Number of matches not recorded before
+        """
+        added = 0
+        with self.lock:
+            for match in matches or []:
+                key = alert_key(match['date'], match['title'])
+                if key not in self.alerted:
+                    self.alerted[key] = str(match['date']).strip()
+                    added += 1
+        return added
+
+    def save(self):
+        """Write the state atomically, dropping keys older than keep_days."""
+        cutoff = datetime.now() - timedelta(days=self.keep_days)
+
+        def recent(date_str):
+            try:
+                return datetime.strptime(date_str, '%d-%m-%y') >= cutoff
+            except (TypeError, ValueError):
+                return False
+
+        with self.lock:
+            self.alerted = {key: date for key, date in self.alerted.items() if recent(date)}
+            return save_state(self.path, dict(self.extra, alerted=self.alerted))
@@ -0,0 +1,335 @@
+"""Backtest the alert scenarios against final_db over large threshold grids.
+
+final_db is loaded once into NumPy arrays sorted by draw odds. A configuration
+is (HT goals, draw-odds min/max, set of excluded tournament keywords) and an
+alert "hits" when more goals come after halftime (ft_goals > ht_goals). Rows
+in tournaments hit by scenarios.json's global exclusions are left out, as in
+the rule engine; check_parity() compares one grid point with ScenarioSet.evaluate.
+
+Each tournament gets a bitmask of the candidate keywords it contains, so an
+exclusion set is one integer and eligibility for a whole block of sets is one
+broadcast AND. Prefix sums over the draw-sorted rows then give samples and hits
+for every threshold at once; rows of tournaments with none of the keywords are
+counted once for all sets. Blocks of exclusion sets are spread over a
+process pool that reads the arrays from shared memory.
+
+    python backtest.py --scenario A
+    python backtest.py --scenario B --draw-min 3.5 6 0.05 --max-excluded 4 --top 30
+    python backtest.py --scenario A --keywords women friendly oman u19 --out grid.csv
+"""
+
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from scenarios import ScenarioSet, keyword_regex, load_scenarios
+from storage import get_storage, table_path
+
+
+BACKTEST_WORKERS = int(os.getenv('BACKTEST_WORKERS', str(os.cpu_count() or 1)))
+# Rows x exclusion sets evaluated per broadcast block (bounds worker memory)
+BLOCK_CELLS = int(os.getenv('BACKTEST_BLOCK_CELLS', '8000000'))
+# Bitmasks are uint64, one bit per candidate keyword
+MAX_KEYWORDS = 63
+
+
+class BacktestData:
+    """
+    final_db as arrays sorted by draw odds, restricted to rows with odds and a final score
+    """
+
+    def __init__(self, df):
+        odds = df[['pre-match_odds_home', 'pre-match_odds_draw', 'pre-match_odds_away']].apply(
+            pd.to_numeric, errors='coerce')
+        ht_goals = pd.to_numeric(df['ht_goals'], errors='coerce')
+        ft_goals = pd.to_numeric(df['ft_goals'], errors='coerce')
+        usable = odds.notna().all(axis=1) & ht_goals.notna() & ft_goals.notna()
+
+        order = np.argsort(odds.loc[usable, 'pre-match_odds_draw'].to_numpy(), kind='stable')
+        self.draw = odds.loc[usable, 'pre-match_odds_draw'].to_numpy()[order]
+        self.ht_goals = ht_goals[usable].to_numpy(dtype=np.int64)[order]
+        self.hit = (ft_goals[usable] > ht_goals[usable]).to_numpy()[order]
+        codes, self.tournaments = pd.factorize(df.loc[usable, 'tournament'].fillna('').astype(str))
+        self.codes = codes[order]
+        # The same rows as a frame, in the same order, for the parity check against the rule engine
+        self.frame = pd.concat([df.loc[usable, ['tournament']], odds[usable]], axis=1).iloc[order].assign(
+            ht_goals=self.ht_goals, ft_goals=ft_goals[usable].to_numpy(dtype=np.int64)[order])
+
+    def __len__(self):
+        return len(self.draw)
+
+    @classmethod
+    def load(cls):
+        df = get_storage().read('final_db')
+        if df is None:
+            raise FileNotFoundError(table_path('final_db'))
+        return cls(df)
+
+    def tournament_mask(self, keywords):
+        """Per-row boolean: the tournament contains any of the keywords."""
+        regex = keyword_regex(keywords)
+        if regex is None:
+            return np.zeros(len(self), dtype=bool)
+        return np.array([bool(regex.search(t)) for t in self.tournaments], dtype=bool)[self.codes]
+
+    def keyword_bits(self, keywords):
+        """Per-row uint64: bit i set when the tournament contains keywords[i]."""
+        bits = np.zeros(len(self.tournaments), dtype=np.uint64)
+        for i, keyword in enumerate(keywords):
+            regex = keyword_regex([keyword])
+            found = np.array([bool(regex.search(t)) for t in self.tournaments], dtype=bool)
+            bits[found] |= np.uint64(1 << i)
+        return bits[self.codes]
+
+
+def exclusion_sets(n_keywords, max_size=None):
+    """Every set of up to max_size of n_keywords keywords, as uint64 bitmasks (empty set first)."""
+    max_size = n_keywords if max_size is None else min(max_size, n_keywords)
+    masks = [sum(1 << i for i in chosen)
+             for size in range(max_size + 1) for chosen in combinations(range(n_keywords), size)]
+    return np.array(masks, dtype=np.uint64)
+
+
+def threshold_grid(start, stop, step):
+    """Inclusive arange, rounded so 3.9 stays 3.9."""
+    return np.round(np.arange(start, stop + step / 2, step), 6)
+
+
+# Worker side: arrays attached from shared memory once per process
+_shared = {}
+
+
+def _attach(specs):
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _shared[name] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+
+def _count_block(arrays, ht_value, sets, lo_pos, hi_pos):
+    """
+    Samples and hits for ht_value x a block of exclusion sets x every (min, max) threshold
+
+    Returns:
+        tuple: (samples, hits) int64 arrays shaped (len(sets), len(lo_pos))
+    """
+    rows = np.flatnonzero(arrays['base'] & (arrays['ht_goals'] == ht_value))
+    bits = arrays['bits'][rows]
+    hit = arrays['hit'][rows]
+
+    def in_range(positions):
+        # Rows (sorted positions) inside each [lo_pos, hi_pos) threshold window
+        return np.searchsorted(positions, hi_pos) - np.searchsorted(positions, lo_pos)
+
+    # Rows of tournaments with none of the keywords count for every set alike
+    free = rows[bits == 0]
+    samples = np.broadcast_to(in_range(free), (len(sets), len(lo_pos))).copy()
+    hits = np.broadcast_to(in_range(free[hit[bits == 0]]), (len(sets), len(lo_pos))).copy()
+
+    # The rest: (sets, rows) eligible when none of the row's keywords is in the set
+    tagged = rows[bits != 0]
+    if len(tagged):
+        eligible = (bits[bits != 0][None, :] & sets[:, None]) == 0
+        lo, hi = np.searchsorted(tagged, lo_pos), np.searchsorted(tagged, hi_pos)
+        for weights, counts in ((eligible, samples), (eligible & hit[bits != 0][None, :], hits)):
+            # prefix[:, i] = eligible rows among the first i tagged rows
+            prefix = np.zeros((len(sets), len(tagged) + 1), dtype=np.int64)
+            np.cumsum(weights, axis=1, out=prefix[:, 1:])
+            counts += prefix[:, hi] - prefix[:, lo]
+    return samples, hits
+
+
+def _run_task(task):
+    arrays = {name: array for name, (_, array) in _shared.items()}
+    ht_value, start, stop, lo_pos, hi_pos = task
+    samples, hits = _count_block(arrays, ht_value, arrays['sets'][start:stop], lo_pos, hi_pos)
+    return task[:3], samples, hits
+
+
+def run_grid(data, ht_values, draw_mins, draw_maxs=None, keywords=(), max_excluded=None,
+             include=None, workers=None, exclude=None):
+    """
+    Evaluate every configuration of the grid
+
+    Args:
+        data (BacktestData): Loaded final_db
+        ht_values (list): HT goal counts to test, each on its own
+        draw_mins (array): Lower draw-odds bounds (>=)
+        draw_maxs (array): Upper draw-odds bounds (<=); default no upper bound
+        keywords (list): Candidate tournament keywords to exclude (up to 63)
+        max_excluded (int): Largest exclusion set tried (default: all subsets)
+        include (list): Tournament keywords a row must contain (scenario C style)
+        workers (int): Processes; 1 runs in-process
+        exclude (list): Tournament keywords always excluded (scenarios.json's global list)
+
+    Returns:
+        DataFrame: ht_goals, draw_min, draw_max, excluded, samples, hits, hit_rate
+    """
+    keywords = list(keywords)
+    if len(keywords) > MAX_KEYWORDS:
+        raise ValueError(f"At most {MAX_KEYWORDS} candidate keywords, got {len(keywords)}")
+    workers = BACKTEST_WORKERS if workers is None else workers
+    draw_maxs = np.array([np.inf]) if draw_maxs is None else np.asarray(draw_maxs, dtype=float)
+    draw_mins = np.asarray(draw_mins, dtype=float)
+
+    # Every (min, max) pair with min <= max, as positions in the sorted draw odds
+    lows, highs = np.meshgrid(draw_mins, draw_maxs, indexing='ij')
+    keep = lows <= highs
+    lows, highs = lows[keep], highs[keep]
+    lo_pos = np.searchsorted(data.draw, lows, side='left')
+    hi_pos = np.searchsorted(data.draw, highs, side='right')
+
+    sets = exclusion_sets(len(keywords), max_excluded)
+    base = np.ones(len(data), dtype=bool) if not include else data.tournament_mask(include)
+    if exclude:
+        base &= ~data.tournament_mask(exclude)
+    arrays = {'base': base, 'ht_goals': data.ht_goals, 'hit': data.hit,
+              'bits': data.keyword_bits(keywords), 'sets': sets}
+
+    block = max(1, BLOCK_CELLS // max(len(data), 1))
+    tasks = [(int(ht), start, min(start + block, len(sets)), lo_pos, hi_pos)
+             for ht in ht_values for start in range(0, len(sets), block)]
+
+    samples = np.zeros((len(ht_values), len(sets), len(lows)), dtype=np.int64)
+    hits = np.zeros_like(samples)
+    ht_row = {int(ht): i for i, ht in enumerate(ht_values)}
+
+    if workers <= 1 or len(tasks) == 1:
+        for ht, start, stop, _, _ in tasks:
+            samples[ht_row[ht], start:stop], hits[ht_row[ht], start:stop] = _count_block(
+                arrays, ht, sets[start:stop], lo_pos, hi_pos)
+    else:
+        blocks = []
+        try:
+            specs = {}
+            for name, array in arrays.items():
+                shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+                blocks.append(shm)
+                specs[name] = (shm.name, array.shape, array.dtype)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(specs,)) as pool:
+                for (ht, start, stop), block_samples, block_hits in pool.map(_run_task, tasks):
+                    samples[ht_row[ht], start:stop] = block_samples
+                    hits[ht_row[ht], start:stop] = block_hits
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    labels = [', '.join(keyword for i, keyword in enumerate(keywords) if int(mask) >> i & 1)
+              for mask in sets]
+    n_ht, n_sets, n_thresholds = samples.shape
+    result = pd.DataFrame({
+        'ht_goals': np.repeat(np.asarray(ht_values, dtype=int), n_sets * n_thresholds),
+        'draw_min': np.tile(lows, n_ht * n_sets),
+        'draw_max': np.tile(highs, n_ht * n_sets),
+        'excluded': np.tile(np.repeat(np.array(labels, dtype=object), n_thresholds), n_ht),
+        'samples': samples.ravel(),
+        'hits': hits.ravel(),
+    })
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result['hit_rate'] = result['hits'] / result['samples']
+    return result
+
+
+def scenario_grid_args(name, scenario_set=None):
+    """
+    Default sweep for a scenario from scenarios.json: its HT goals, keywords, include list,
+    the global exclusions and its own draw-odds bounds
+    """
+    scenario_set = scenario_set or load_scenarios()
+    for rule in scenario_set.rules:
+        if rule.name == name:
+            draw = [(low, high) for column, low, high in rule.bounds if column == 'pre-match_odds_draw']
+            return {'ht_values': rule.ht_goals or [0, 1], 'keywords': rule.exclude_keywords,
+                    'include': rule.include_keywords, 'exclude': scenario_set.exclude_keywords,
+                    'draw': draw[0] if draw else (None, None)}
+    raise ValueError(f"No scenario named {name!r} in scenarios.json")
+
+
+def check_parity(data, ht_value, draw_min=None, draw_max=None, keywords=(), include=None, exclude=None):
+    """
+    Samples and hits of one grid point (every keyword excluded) from run_grid() and from
+    ScenarioSet.evaluate() on the same rows
+
+    Returns:
+        tuple: (grid (samples, hits), rule engine (samples, hits))
+    """
+    # The scenario's keywords joined to the global list give the one set with every keyword excluded
+    grid = run_grid(data, [ht_value], [-np.inf if draw_min is None else draw_min],
+                    None if draw_max is None else [draw_max], include=include, workers=1,
+                    exclude=list(exclude or []) + list(keywords))
+    point = grid.iloc[0]
+    rule = {'name': 'parity', 'ht_goals': [ht_value], 'include_tournaments': list(include or []),
+            'exclude_tournaments': list(keywords)}
+    if draw_min is not None or draw_max is not None:
+        rule['draw_odds'] = {'min': draw_min, 'max': draw_max}
+    scenario_set = ScenarioSet({'exclude_tournaments': list(exclude or []), 'scenarios': [rule]})
+    frame = data.frame[~scenario_set.excluded(data.frame)]
+    matches = [rows for _, rows in scenario_set.evaluate(frame)]
+    matches = matches[0] if matches else frame.iloc[:0]
+    engine = (len(matches), int((matches['ft_goals'] > matches['ht_goals']).sum()))
+    return (int(point['samples']), int(point['hits'])), engine
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Sweep scenario thresholds over final_db")
+    parser.add_argument('--scenario', default='A', help='Scenario name in scenarios.json (default: A)')
+    parser.add_argument('--ht', type=int, nargs='+', default=None, help='HT goal counts (default: the scenario\'s)')
+    parser.add_argument('--draw-min', type=float, nargs=3, default=[3.0, 6.0, 0.1],
+                        metavar=('START', 'STOP', 'STEP'), help='Lower draw-odds bounds')
+    parser.add_argument('--draw-max', type=float, nargs=3, default=None,
+                        metavar=('START', 'STOP', 'STEP'), help='Upper draw-odds bounds (default: none)')
+    parser.add_argument('--keywords', nargs='+', default=None,
+                        help='Candidate exclusion keywords (default: the scenario\'s exclude list)')
+    parser.add_argument('--max-excluded', type=int, default=None, help='Largest exclusion set tried')
+    parser.add_argument('--min-samples', type=int, default=30, help='Hide configurations with fewer alerts')
+    parser.add_argument('--workers', type=int, default=None, help=f'Processes (default: {BACKTEST_WORKERS})')
+    parser.add_argument('--top', type=int, default=20, help='Configurations to print')
+    parser.add_argument('--out', default=None, help='Write the full grid to this CSV')
+    args = parser.parse_args()
+
+    grid = scenario_grid_args(args.scenario)
+    keywords = args.keywords if args.keywords is not None else grid['keywords']
+    max_excluded = args.max_excluded
+    if max_excluded is None and len(keywords) > 12:
+        max_excluded = 3
+        print(f"ℹ️ {len(keywords)} keywords - trying exclusion sets of up to {max_excluded} (see --max-excluded)")
+
+    started_at = time.perf_counter()
+    data = BacktestData.load()
+    loaded_at = time.perf_counter()
+    results = run_grid(
+        data, args.ht or grid['ht_values'], threshold_grid(*args.draw_min),
+        threshold_grid(*args.draw_max) if args.draw_max else None,
+        keywords, max_excluded, grid['include'], args.workers, grid['exclude'])
+    finished_at = time.perf_counter()
+
+    # The scenario as configured, counted both ways
+    ht_value = (args.ht or grid['ht_values'])[0]
+    swept, engine = check_parity(data, ht_value, *grid['draw'], keywords, grid['include'], grid['exclude'])
+    if swept == engine:
+        print(f"✅ Parity with the rule engine at HT {ht_value}, draw {grid['draw']}: "
+              f"{swept[0]} samples, {swept[1]} hits")
+    else:
+        print(f"⚠️ Grid gives {swept[0]} samples / {swept[1]} hits but the rule engine "
+              f"{engine[0]} / {engine[1]} at HT {ht_value}, draw {grid['draw']}")
+
+    print(f"📊 {len(results):,} configurations over {len(data):,} alerts with scores "
+          f"(load {loaded_at - started_at:.2f}s, sweep {finished_at - loaded_at:.2f}s)")
+    if args.out:
+        results.to_csv(args.out, index=False)
+        print(f"💾 Grid saved to {args.out}")
+
+    best = results[results['samples'] >= args.min_samples].sort_values(
+        ['hit_rate', 'samples'], ascending=False).head(args.top)
+    if best.empty:
+        print(f"No configuration has {args.min_samples} or more alerts")
+    else:
+        print(best.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
@@ -0,0 +1,215 @@
+"""Shared headless Chrome sessions for the live, today and results scrapers."""
+
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# On-disk cache of the resolved chromedriver binary
+DRIVER_CACHE_FILE = os.getenv(
+    'CHROMEDRIVER_CACHE_FILE', os.path.join(SCRIPT_DIR, '.chromedriver_path.json'))
+# Re-resolve periodically so Chrome upgrades pick up a matching driver
+DRIVER_CACHE_TTL_HOURS = float(os.getenv('CHROMEDRIVER_CACHE_TTL_HOURS', '24'))
+
+# Number of idle sessions kept warm between scrapes
+POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '1'))
+# Recycle a session after it has served this many pages or minutes
+MAX_PAGES_PER_SESSION = int(os.getenv('DRIVER_MAX_PAGES', '60'))
+MAX_SESSION_AGE_MINUTES = float(os.getenv('DRIVER_MAX_AGE_MINUTES', '60'))
+
+
+def resolve_chromedriver_path():
+    """
+    Resolve the chromedriver binary once and cache its path on disk
+    CHROMEDRIVER_PATH overrides the lookup entirely
+
+    Returns:
+        str: Path to the chromedriver executable
+    """
+    explicit_path = os.getenv('CHROMEDRIVER_PATH')
+    if explicit_path:
+        return explicit_path
+
+    cached_path = None
+    try:
+        with open(DRIVER_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        cached_path = cache.get('path')
+        age_hours = (time.time() - cache.get('resolved_at', 0)) / 3600
+        if cached_path and os.path.isfile(cached_path) and age_hours < DRIVER_CACHE_TTL_HOURS:
+            return cached_path
+    except (FileNotFoundError, ValueError, AttributeError):
+        pass
+
+    try:
+        driver_path = ChromeDriverManager().install()
+    except Exception as e:
+        # Keep scraping with a stale driver rather than not at all
+        if cached_path and os.path.isfile(cached_path):
+            print(f"⚠️ Could not refresh chromedriver, using cached path: {e}")
+            return cached_path
+        raise
+
+    try:
+        with open(DRIVER_CACHE_FILE, 'w') as f:
+            json.dump({'path': driver_path, 'resolved_at': time.time()}, f)
+    except OSError as e:
+        print(f"⚠️ Could not cache chromedriver path: {e}")
+
+    return driver_path
+
+
+def build_chrome_options(user_agent=None):
+    """
+    Build the headless Chrome options shared by all scrapers
+    """
+    chrome_options = Options()
+    # Run without opening a browser window
+    chrome_options.add_argument("--headless")
+    # For stability in some environments
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument(
+        "--disable-dev-shm-usage")  # Avoid resource issues
+    chrome_options.add_argument("--disable-gpu")  # Additional stability
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-logging")  # Reduce log noise
+    chrome_options.add_argument("--log-level=3")  # Only fatal errors
+    chrome_options.add_argument("--window-size=1920,1080")
+    if user_agent:
+        # Reuse the rotated user-agent for consistency
+        chrome_options.add_argument(f"user-agent={user_agent}")
+    return chrome_options
+
+
+class DriverSession:
+    """
+    A browser session handed out by the pool, with its page count and age
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+    def get(self, url):
+        """Navigate to url and count it as a served page."""
+        self.driver.get(url)
+        self.pages += 1
+
+    def count_page(self):
+        """Count an in-page navigation (pagination, date change) as a served page."""
+        self.pages += 1
+
+    def is_expired(self):
+        age_minutes = (time.time() - self.created_at) / 60
+        return self.pages >= MAX_PAGES_PER_SESSION or age_minutes >= MAX_SESSION_AGE_MINUTES
+
+    def is_healthy(self):
+        """Check the browser still answers over the WebDriver wire."""
+        try:
+            self.driver.execute_script("return document.readyState")
+            return bool(self.driver.window_handles)
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"⚠️ Error closing browser session: {e}")
+
+
+class DriverPool:
+    """
+    Keeps warm Chrome sessions alive across scrapes in the same process
+    """
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _launch(self, user_agent=None):
+        service = Service(resolve_chromedriver_path())
+        driver = webdriver.Chrome(
+            service=service, options=build_chrome_options(user_agent))
+        return DriverSession(driver)
+
+    def _take_idle(self):
+        with self._lock:
+            while self._idle:
+                session = self._idle.pop()
+                if not session.is_expired() and session.is_healthy():
+                    return session
+                session.quit()
+        return None
+
+    def _release(self, session):
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size and not session.is_expired():
+                self._idle.append(session)
+                return
+        session.quit()
+
+    @contextmanager
+    def session(self, user_agent=None):
+        """
+        Lend a browser session for the duration of a with-block
+        The session goes back to the pool on success and is torn down on error
+
+        Args:
+            user_agent (str): User-agent for a freshly launched session
+        """
+        session = self._take_idle() or self._launch(user_agent)
+        try:
+            yield session
+        except BaseException:
+            session.quit()
+            raise
+        self._release(session)
+
+    def shutdown(self):
+        """Quit every idle session and stop accepting returns."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for session in idle:
+            session.quit()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Return the process-wide driver pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def pooled_driver(user_agent=None):
+    """
+    Shortcut for get_driver_pool().session(user_agent)
+
+    Usage:
+        with pooled_driver(headers['User-Agent']) as session:
+            session.get(url)
+            html = session.driver.page_source
+    """
+    return get_driver_pool().session(user_agent)
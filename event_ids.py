@@ -0,0 +1,50 @@
+"""Integer event keys built from the SportyBet game id.
+
+The today page and both feeds carry a 5-digit game id per fixture. Ids are
+reused across days, so an event is identified by (date, game id), packed into
+one integer: '07-09-25' + 40321 -> 25090740321. Joins and dedup use that key
+where both sides have it and fall back to (date, title) / team names otherwise.
+"""
+
+
+import pandas as pd
+
+
+GAME_ID_COLUMN = 'game-id'
+# yymmdd * GAME_ID_SPAN + game id
+GAME_ID_SPAN = 100000
+
+
+def parse_game_id(value):
+    """Game id as an int ('40321', 40321.0, 'ID: 40321'), or None."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    digits = ''.join(ch for ch in str(value).split('.')[0] if ch.isdigit())
+    if not digits or int(digits) >= GAME_ID_SPAN:
+        return None
+    return int(digits)
+
+
+def game_ids(values):
+    """Game ids of a column as an Int64 Series (<NA> where missing or malformed)."""
+    values = pd.Series(values, dtype=object)
+    return pd.Series([parse_game_id(value) for value in values], index=values.index, dtype='Int64')
+
+
+def event_keys(dates, ids):
+    """
+    Integer event keys for aligned date ('dd-mm-yy') and game id columns
+
+    Returns:
+        Series of Int64, <NA> where the date or the id is missing
+    """
+    dates = pd.Series(dates, dtype=object)
+    parsed = pd.to_datetime(dates.astype(str).str.strip(), format='%d-%m-%y', errors='coerce')
+    day = (parsed.dt.year % 100 * 10000 + parsed.dt.month * 100 + parsed.dt.day).astype('Int64')
+    return day * GAME_ID_SPAN + game_ids(pd.Series(ids, dtype=object).values).values
+
+
+def event_key(date, game_id):
+    """Integer event key of one fixture, or None."""
+    key = event_keys([date], [game_id]).iat[0]
+    return None if pd.isna(key) else int(key)
@@ -0,0 +1,388 @@
+"""lxml extraction layer for the live_list, today and liveResult pages.
+
+Every selector is compiled once at import time. The functions return the same
+rows/dicts as the BeautifulSoup extractors in utils.py; run
+
+    python extractors.py --parity
+
+to compare both implementations on the pages stored in recordings/.
+"""
+
+
+import argparse
+import os
+import re
+import time
+
+import lxml.html
+from lxml import etree
+
+
+RECORDINGS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'recordings')
+
+# WebDriver paths that can leak into page_source and upset the parsers
+_WDM_PATH_RE = re.compile(r'/[^<>]*?\.wdm/[^<>]*?chromedriver[^<>]*?')
+_WDM_BRACKET_RE = re.compile(r'\[[^<>\[\]]*?chromedriver[^<>\[\]]*?\]')
+GAME_ID_RE = re.compile(r'\b\d{5}\b')
+
+
+def _has_class(name):
+    """XPath predicate for an element carrying the CSS class name."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _class_is(value):
+    """XPath predicate for an exact class attribute, as BeautifulSoup class_='a b' matches."""
+    return f"normalize-space(@class)='{value}'"
+
+
+def _first(expression):
+    """Compile an XPath that returns the first match, like BeautifulSoup find()."""
+    return etree.XPath(f"({expression})[1]")
+
+
+# live_list page
+LIVE_ROWS = etree.XPath(
+    f"//div[{_class_is('m-table-row m-content-row match-row football-row')}]")
+# today page
+TODAY_ROWS = etree.XPath(
+    f"//div[{_class_is('m-table-row m-content-row match-row')}]")
+LEAGUES = etree.XPath(f"//div[{_has_class('match-league')}]")
+LEAGUE_ROWS = etree.XPath(
+    f".//div[{_class_is('m-table-row m-content-row match-row')}]")
+LEAGUE_TITLE = _first(f".//div[{_has_class('league-title')}]")
+LEAGUE_NAME = _first(f".//span[{_has_class('text')}]")
+# Row cells shared by live_list and today
+LEFT_TEAM_CELL = _first(f".//*[{_class_is('m-table-cell left-team-cell')}]")
+LEFT_TEAM_TABLE = _first(f".//*[{_has_class('left-team-table')}]")
+GAME_ID = _first(f".//*[{_has_class('game-id')}]")
+CLOCK_TIME = _first(f".//*[{_has_class('clock-time')}]")
+TEAMS = _first(f".//*[{_has_class('teams')}]")
+HOME_TEAM = _first(f".//*[{_has_class('home-team')}]")
+AWAY_TEAM = _first(f".//*[{_has_class('away-team')}]")
+SCORE = _first(f".//*[{_has_class('score')}]")
+SCORE_ITEMS = etree.XPath(f".//*[{_has_class('score-item')}]")
+MARKET_CELL = _first(f".//div[{_class_is('m-table-cell market-cell two-markets')}]")
+MARKET = _first(f".//div[{_class_is('m-market market')}]")
+OUTCOMES = etree.XPath(f".//div[{_has_class('m-outcome')}]")
+OUTCOME_ODDS = _first(f".//span[{_has_class('m-outcome-odds')}]")
+# liveResult page
+RESULT_SECTION = _first(f"//section[{_has_class('result-list')}]")
+RESULT_BLOCKS = etree.XPath(f".//dl[{_has_class('list')}]")
+BLOCK_TITLE = _first(".//dt")
+BLOCK_MATCHES = etree.XPath(".//dd")
+RESULT_EVENT = _first(f".//ul[{_has_class('result-event')}]")
+RESULT_HOME = _first(f".//li[{_has_class('home')}]")
+RESULT_AWAY = _first(f".//li[{_has_class('away')}]")
+RESULT_SCORE = _first(f".//li[{_has_class('score')}]")
+SCORE_COM = _first(f".//div[{_has_class('score-com')}]")
+SCORE_DETAIL = _first(f".//div[{_has_class('score-detail')}]")
+
+
+def clean_page_source(page_source):
+    """
+    Remove WebDriver-related paths that can leak into driver.page_source
+    """
+    page_source = _WDM_PATH_RE.sub('', page_source)
+    return _WDM_BRACKET_RE.sub('', page_source)
+
+
+def parse_html(page_source):
+    """Parse a page into an lxml document (pass-through for parsed documents)."""
+    if isinstance(page_source, (str, bytes)):
+        return lxml.html.document_fromstring(page_source)
+    return page_source
+
+
+def _one(xpath, element):
+    found = xpath(element)
+    return found[0] if found else None
+
+
+def _left_team_table(row):
+    left_team_cell = _one(LEFT_TEAM_CELL, row)
+    return _one(LEFT_TEAM_TABLE, left_team_cell) if left_team_cell is not None else None
+
+
+def _text(element, separator=''):
+    """Equivalent of BeautifulSoup get_text(separator, strip=True)."""
+    return separator.join(s.strip() for s in element.itertext() if s.strip())
+
+
+def build_today_record(current_date, time_text, title, tournament, game_id_text,
+                       home_team, away_team, odds_home='', odds_draw='', odds_away=''):
+    """
+    Assemble a today-page match dict, reducing the game-id cell to its 5-digit id
+    """
+    game_id_match = GAME_ID_RE.search(game_id_text or '')
+    return {
+        'date': current_date,
+        'time': time_text,
+        'title': title,
+        'tournament': tournament,
+        'game-id': game_id_match.group() if game_id_match else (game_id_text or ''),
+        'home-team': home_team,
+        'away-team': away_team,
+        'pre-match_odds_home': odds_home,
+        'pre-match_odds_draw': odds_draw,
+        'pre-match_odds_away': odds_away,
+    }
+
+
+def build_result_record(tournament, home_team, away_team, score_text):
+    """
+    Assemble a liveResult match dict from a 'home:away' score, or None if unparseable
+    """
+    score_clean = (score_text or '').strip().replace(' ', '')
+    if ':' not in score_clean:
+        return None
+    try:
+        home_ft_goals, away_ft_goals = (int(goals) for goals in score_clean.split(':'))
+    except ValueError:
+        return None
+    return {
+        'tournament': tournament,
+        'home_team': home_team,
+        'away_team': away_team,
+        'home_ft_goals': home_ft_goals,
+        'away_ft_goals': away_ft_goals,
+        'ft_goals': home_ft_goals + away_ft_goals
+    }
+
+
+def _row_teams(row):
+    """Return (title, home_team, away_team) of a match row, or None."""
+    teams = _one(TEAMS, row)
+    if teams is None:
+        return None
+    home = _one(HOME_TEAM, teams)
+    away = _one(AWAY_TEAM, teams)
+    if home is None or away is None:
+        return None
+    home_team = _text(home)
+    away_team = _text(away)
+    return teams.get('title', f"{home_team} vs {away_team}"), home_team, away_team
+
+
+def parse_live_rows(page_source):
+    """
+    lxml counterpart of utils.extract_live_rows()
+
+    Args:
+        page_source (str): live_list HTML, or a document from parse_html()
+
+    Returns:
+        list: Rows with title, home-team, away-team, clock, home_score, away_score
+    """
+    doc = parse_html(page_source)
+    live_rows = []
+    for match in LIVE_ROWS(doc):
+        row = {
+            'title': None,
+            'home-team': None,
+            'away-team': None,
+            'clock': '',
+            'home_score': None,
+            'away_score': None,
+        }
+
+        left_team_table = _left_team_table(match)
+        if left_team_table is not None:
+            game_id_elem = _one(GAME_ID, left_team_table)
+            if game_id_elem is not None:
+                row['clock'] = _text(game_id_elem)
+
+        teams = _row_teams(match)
+        if teams:
+            row['title'], row['home-team'], row['away-team'] = teams
+
+        score_container = _one(SCORE, match)
+        if score_container is not None:
+            score_items = SCORE_ITEMS(score_container)
+            if len(score_items) >= 2:
+                row['home_score'] = _text(score_items[0])
+                row['away_score'] = _text(score_items[1])
+
+        live_rows.append(row)
+    return live_rows
+
+
+def parse_today_matches(page_source, current_date):
+    """
+    lxml counterpart of utils.extract_today_matches()
+    League names are resolved in one pass over the leagues instead of a
+    parent lookup per row
+
+    Args:
+        page_source (str): today page HTML, or a document from parse_html()
+        current_date (str): Date stamp in '%d-%m-%y' format
+
+    Returns:
+        list: Match dicts as returned by scrape_sb_today()
+    """
+    doc = parse_html(page_source)
+
+    # Nested leagues come later in document order, so the closest one wins
+    row_tournament = {}
+    for league in LEAGUES(doc):
+        league_title = _one(LEAGUE_TITLE, league)
+        name_elem = _one(LEAGUE_NAME, league_title) if league_title is not None else None
+        tournament = _text(name_elem) if name_elem is not None else "Unknown Tournament"
+        for row in LEAGUE_ROWS(league):
+            row_tournament[row] = tournament
+
+    matches = []
+    for match in TODAY_ROWS(doc):
+        time_text = ""
+        game_id_text = ""
+        left_team_table = _left_team_table(match)
+        if left_team_table is not None:
+            game_id_elem = _one(GAME_ID, left_team_table)
+            if game_id_elem is not None:
+                game_id_text = _text(game_id_elem)
+            time_elem = _one(CLOCK_TIME, left_team_table)
+            if time_elem is not None:
+                time_text = _text(time_elem)
+
+        teams = _row_teams(match)
+        if not teams:
+            continue
+        title, home_team, away_team = teams
+
+        odds = ["", "", ""]
+        market_cell = _one(MARKET_CELL, match)
+        market = _one(MARKET, market_cell) if market_cell is not None else None
+        if market is not None:
+            outcomes = OUTCOMES(market)
+            if len(outcomes) >= 3:
+                for i in range(3):
+                    odds_elem = _one(OUTCOME_ODDS, outcomes[i])
+                    odds[i] = _text(odds_elem) if odds_elem is not None else ""
+
+        matches.append(build_today_record(
+            current_date, time_text, title,
+            row_tournament.get(match, "Unknown Tournament"), game_id_text,
+            home_team, away_team, *odds))
+    return matches
+
+
+def _final_score_text(score_div):
+    """Full-time score from a score-com cell, skipping the nested halftime detail."""
+    score_detail = _one(SCORE_DETAIL, score_div)
+    if score_detail is None:
+        return _text(score_div)
+
+    # Text nodes sitting directly in score-com
+    score_text = (score_div.text or '').strip()
+    for child in score_div:
+        score_text += (child.tail or '').strip()
+
+    if not score_text or not any(c.isdigit() for c in score_text):
+        detail_text = _text(score_detail)
+        for part in _text(score_div, '|').split('|'):
+            if part.strip() != detail_text and ':' in part:
+                score_text = part.strip()
+                break
+    return score_text
+
+
+def parse_result_matches(page_source):
+    """
+    lxml counterpart of utils.extract_match_data()
+
+    Args:
+        page_source (str): liveResult HTML, or a document from parse_html()
+
+    Returns:
+        list: Dicts with tournament, home_team, away_team and full-time goals
+    """
+    doc = parse_html(page_source)
+    matches = []
+
+    result_section = _one(RESULT_SECTION, doc)
+    if result_section is None:
+        print("❌ Could not find result-list section")
+        return matches
+
+    for block in RESULT_BLOCKS(result_section):
+        dt_tag = _one(BLOCK_TITLE, block)
+        tournament = _text(dt_tag) if dt_tag is not None else "Unknown Tournament"
+        tournament = tournament.strip('"')
+
+        for match_dd in BLOCK_MATCHES(block):
+            result_event = _one(RESULT_EVENT, match_dd)
+            if result_event is None:
+                continue
+            home_li = _one(RESULT_HOME, result_event)
+            away_li = _one(RESULT_AWAY, result_event)
+            score_li = _one(RESULT_SCORE, result_event)
+            if home_li is None or away_li is None or score_li is None:
+                continue
+            score_div = _one(SCORE_COM, score_li)
+            if score_div is None:
+                continue
+
+            match_data = build_result_record(
+                tournament, _text(home_li), _text(away_li), _final_score_text(score_div))
+            if match_data:
+                matches.append(match_data)
+    return matches
+
+
+def check_parity(recordings_dir=RECORDINGS_DIR, current_date='07-09-25'):
+    """
+    Compare the lxml extractors with the BeautifulSoup ones on recorded pages
+
+    Returns:
+        bool: True when every recorded page produces identical output
+    """
+    from bs4 import BeautifulSoup
+    import utils
+
+    cases = [
+        ('live_list.html', parse_live_rows, utils.extract_live_rows),
+        ('today.html', lambda html: parse_today_matches(html, current_date),
+         lambda soup: utils.extract_today_matches(soup, current_date)),
+        ('live_result.html', parse_result_matches, utils.extract_match_data),
+    ]
+
+    all_equal = True
+    for filename, lxml_extract, bs4_extract in cases:
+        path = os.path.join(recordings_dir, filename)
+        if not os.path.exists(path):
+            print(f"⏭️ {filename}: no recording")
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            page_source = clean_page_source(f.read())
+
+        start = time.perf_counter()
+        expected = bs4_extract(BeautifulSoup(page_source, 'html.parser'))
+        bs4_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        actual = lxml_extract(page_source)
+        lxml_ms = (time.perf_counter() - start) * 1000
+
+        if actual == expected:
+            print(f"✅ {filename}: {len(actual)} rows identical "
+                  f"(html.parser {bs4_ms:.1f} ms, lxml {lxml_ms:.1f} ms)")
+        else:
+            all_equal = False
+            print(f"❌ {filename}: outputs differ")
+            for i, (a, e) in enumerate(zip(actual, expected)):
+                if a != e:
+                    print(f"   row {i}: lxml={a} bs4={e}")
+            if len(actual) != len(expected):
+                print(f"   lxml rows: {len(actual)}, bs4 rows: {len(expected)}")
+    return all_equal
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="lxml extraction layer")
+    parser.add_argument('--parity', action='store_true',
+                        help='Compare against the BeautifulSoup extractors on recorded pages')
+    parser.add_argument('--recordings', default=RECORDINGS_DIR)
+    args = parser.parse_args()
+    if args.parity:
+        raise SystemExit(0 if check_parity(args.recordings) else 1)
+    parser.print_help()
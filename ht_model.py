@@ -0,0 +1,272 @@
+"""Second-half goal model from eda_interactive.ipynb, scored with NumPy only.
+
+The notebook trains one Keras network per HT goal count:
+
+    ht_goals 0   P(at least 1 goal at FT)
+    ht_goals 1   P(at least 2 goals at FT)
+
+Loading TensorFlow in the 9-minute live job is far too slow. The notebook's
+last cell therefore calls export_ht_models(), which writes everything scoring
+needs into HT_MODEL_FILE (a plain .npz):
+
+- the feature names;
+- the label-encoder classes of the tournament and team features;
+- the training means used to fill missing values;
+- the StandardScaler mean and scale;
+- the weights and activation of each Dense layer (Dropout is a no-op at inference).
+
+HTModelScorer loads the file once. It scores every enriched HT candidate of a
+poll in one batch of matrix products. get_ht_scorer() reloads it when the file
+changes, so a re-export is picked up by a running daemon.
+
+The probability goes on each alert as 'model_probability'. Scenarios can bound
+it like the odds, e.g. {"model_probability": {"min": 0.85}}. Without an
+exported model it is NaN, so such scenarios don't fire.
+
+    python ht_model.py info
+    python ht_model.py score          # score the last 20 alerts in the log
+"""
+
+
+import argparse
+import os
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from today_index import ODDS_COLUMNS
+
+
+HT_MODEL_FILE = os.getenv('HT_MODEL_FILE', 'ht_model.npz')
+PROBABILITY_COLUMN = 'model_probability'
+
+# Encoded feature -> the column its classes come from (as LabelEncoder saw them in the notebook)
+CATEGORICAL_FEATURES = {
+    'tournament_encoded': 'tournament',
+    'home_team_encoded': 'home-team',
+    'away_team_encoded': 'away-team',
+}
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0.0),
+    'tanh': np.tanh,
+    'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-np.clip(x, -500, 500))),
+}
+
+
+def _categories(values):
+    """Category strings as the notebook encoded them: missing tournaments are 'Unknown'."""
+    return pd.Series(values, dtype=object).astype(str)
+
+
+def model_features(df):
+    """
+    The notebook's create_features() without the label encoding
+
+    Returns:
+        DataFrame: Numeric feature columns aligned to df.index (categoricals still as text)
+    """
+    def column(name):
+        return df[name] if name in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+
+    features = pd.DataFrame(index=df.index)
+    features['tournament'] = _categories(column('tournament').fillna('Unknown')).values
+    for name in ('home-team', 'away-team'):
+        features[name] = _categories(column(name)).values
+    odds = {name: pd.to_numeric(column(name), errors='coerce') for name in ODDS_COLUMNS}
+    home, draw, away = (1 / odds[name] for name in ODDS_COLUMNS)
+    total = home + draw + away
+    features['home_prob_norm'] = home / total
+    features['draw_prob_norm'] = draw / total
+    features['away_prob_norm'] = away / total
+    features['team_strength_diff'] = features['away_prob_norm'] - features['home_prob_norm']
+    for name in ('home_ht_goals', 'away_ht_goals'):
+        features[name] = pd.to_numeric(column(name), errors='coerce')
+    features['ht_goal_diff'] = features['home_ht_goals'] - features['away_ht_goals']
+    return features
+
+
+def export_ht_models(models, path=None):
+    """
+    Write trained notebook models to a NumPy artefact for HTModelScorer
+
+    Args:
+        models (dict): {ht_goals: (keras model, fitted StandardScaler, X, features_df)} where X is
+            the training matrix from prepare_model_data() and features_df the create_features()
+            output it was taken from
+        path (str): Output file (default: HT_MODEL_FILE)
+
+    Returns:
+        str: Path written
+    """
+    path = path or HT_MODEL_FILE
+    arrays = {'ht_goals': np.array(sorted(int(goals) for goals in models), dtype=np.int64),
+              'exported': np.array(datetime.now().strftime('%d-%m-%y %H:%M:%S'))}
+    for goals, (model, scaler, X, features_df) in models.items():
+        prefix = f"ht{int(goals)}."
+        names = list(X.columns)
+        arrays[prefix + 'features'] = np.array(names)
+        arrays[prefix + 'fill'] = X.mean().to_numpy(dtype=np.float64)
+        arrays[prefix + 'mean'] = np.asarray(scaler.mean_, dtype=np.float64)
+        arrays[prefix + 'scale'] = np.asarray(scaler.scale_, dtype=np.float64)
+        for feature, column in CATEGORICAL_FEATURES.items():
+            if feature in names:
+                arrays[f"{prefix}classes.{feature}"] = np.unique(_categories(features_df[column]).to_numpy(dtype=str))
+        activations = []
+        for layer in model.layers:
+            weights = layer.get_weights()
+            # Dropout and other weightless layers do nothing at inference
+            if not weights:
+                continue
+            arrays[f"{prefix}W{len(activations)}"] = np.asarray(weights[0], dtype=np.float64)
+            arrays[f"{prefix}b{len(activations)}"] = np.asarray(weights[1], dtype=np.float64)
+            activations.append(layer.get_config().get('activation', 'linear'))
+        arrays[prefix + 'activations'] = np.array(activations)
+    np.savez_compressed(path, **arrays)
+    # savez adds .npz when the name has no extension
+    return path if path.endswith('.npz') else f"{path}.npz"
+
+
+class HTModelScorer:
+    """
+    Exported networks keyed by HT goal count, run as plain NumPy matrix products
+    """
+
+    def __init__(self, path=None):
+        self.path = path or HT_MODEL_FILE
+        self.models = {}
+        with np.load(self.path, allow_pickle=False) as data:
+            self.exported = str(data['exported'])
+            for goals in data['ht_goals']:
+                prefix = f"ht{int(goals)}."
+                names = [str(name) for name in data[prefix + 'features']]
+                activations = [str(name) for name in data[prefix + 'activations']]
+                unknown = set(activations) - set(ACTIVATIONS)
+                if unknown:
+                    raise ValueError(f"{self.path}: unsupported activations {', '.join(sorted(unknown))}")
+                self.models[int(goals)] = {
+                    'features': names,
+                    'fill': data[prefix + 'fill'],
+                    'mean': data[prefix + 'mean'],
+                    # StandardScaler leaves constant features unscaled
+                    'scale': np.where(data[prefix + 'scale'] == 0, 1.0, data[prefix + 'scale']),
+                    'classes': {feature: pd.Index(data[f"{prefix}classes.{feature}"])
+                                for feature in CATEGORICAL_FEATURES if feature in names},
+                    'layers': [(data[f"{prefix}W{i}"], data[f"{prefix}b{i}"], ACTIVATIONS[name])
+                               for i, name in enumerate(activations)],
+                }
+
+    def __len__(self):
+        return len(self.models)
+
+    def matrix(self, features, model):
+        """Scaled input matrix of one model for rows of model_features()."""
+        columns = []
+        for name in model['features']:
+            if name in model['classes']:
+                codes = model['classes'][name].get_indexer(features[CATEGORICAL_FEATURES[name]])
+                columns.append(np.where(codes >= 0, codes, np.nan))
+            else:
+                columns.append(features[name].to_numpy(dtype=np.float64))
+        X = np.column_stack(columns) if columns else np.empty((len(features), 0))
+        X = np.where(np.isnan(X), model['fill'], X)
+        return (X - model['mean']) / model['scale']
+
+    def score(self, df):
+        """
+        Probability of a second-half goal for each row
+
+        Args:
+            df (DataFrame): Enriched alert rows (ht_goals, home/away HT goals, teams, tournament, odds)
+
+        Returns:
+            ndarray: float per row, NaN where no model covers the row's HT goals
+        """
+        probability = np.full(len(df), np.nan)
+        if df.empty or not self.models:
+            return probability
+        ht_goals = pd.to_numeric(df['ht_goals'], errors='coerce').to_numpy(dtype=float)
+        features = model_features(df)
+        for goals, model in self.models.items():
+            rows = np.flatnonzero(ht_goals == goals)
+            if not len(rows):
+                continue
+            out = self.matrix(features.iloc[rows], model)
+            for weights, bias, activation in model['layers']:
+                out = activation(out @ weights + bias)
+            probability[rows] = out[:, 0]
+        return probability
+
+
+_scorer = None
+_scorer_mtime = None
+_scorer_lock = threading.Lock()
+
+
+def get_ht_scorer():
+    """
+    Process-wide HTModelScorer, reloaded when HT_MODEL_FILE changes on disk
+
+    Returns:
+        HTModelScorer, or None while no model has been exported
+    """
+    global _scorer, _scorer_mtime
+    with _scorer_lock:
+        try:
+            mtime = os.path.getmtime(HT_MODEL_FILE)
+        except OSError:
+            _scorer, _scorer_mtime = None, None
+            return None
+        if mtime != _scorer_mtime:
+            try:
+                _scorer = HTModelScorer()
+                print(f"🧠 Loaded HT models for {sorted(_scorer.models)} HT goals from {HT_MODEL_FILE} "
+                      f"(exported {_scorer.exported})")
+            except Exception as e:
+                print(f"❌ Error loading HT model from {HT_MODEL_FILE}: {e}")
+                _scorer = None
+            _scorer_mtime = mtime
+        return _scorer
+
+
+def attach_model_probability(df):
+    """
+    Copy of df with the model's probability in PROBABILITY_COLUMN (NaN without a model)
+    """
+    df = df.copy()
+    scorer = get_ht_scorer()
+    df[PROBABILITY_COLUMN] = scorer.score(df) if scorer is not None else np.nan
+    return df
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Second-half goal model scorer")
+    parser.add_argument('command', choices=['info', 'score'])
+    parser.add_argument('--last', type=int, default=20, help='Alerts to score (default: 20)')
+    args = parser.parse_args()
+
+    scorer = get_ht_scorer()
+    if scorer is None:
+        print(f"⏭️ No model at {HT_MODEL_FILE} - run the export cell of eda_interactive.ipynb")
+        raise SystemExit(1)
+    if args.command == 'info':
+        for goals, model in sorted(scorer.models.items()):
+            shape = ' -> '.join(str(weights.shape[0]) for weights, _, _ in model['layers']) + ' -> 1'
+            print(f"🧠 HT {goals}: {shape} on {', '.join(model['features'])}")
+    else:
+        from storage import get_storage
+        alerts = get_storage().read('alerts')
+        if alerts is None or alerts.empty:
+            print("⏭️ No alerts to score")
+            raise SystemExit(0)
+        alerts = alerts.tail(args.last)
+        started = time.perf_counter()
+        probabilities = scorer.score(alerts)
+        elapsed = (time.perf_counter() - started) * 1000
+        for title, ht_goals, probability in zip(alerts['title'], alerts['ht_goals'], probabilities):
+            print(f"{title} (HT {ht_goals}): {'-' if np.isnan(probability) else f'{probability:.1%}'}")
+        print(f"⏱️ Scored {len(alerts)} alerts in {elapsed:.1f} ms")
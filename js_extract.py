@@ -0,0 +1,184 @@
+"""In-browser row extraction: one execute_script call per page instead of page_source.
+
+Each snippet walks the rendered DOM with the same rules as the HTML extractors
+and returns only the fields we use as a JSON array string.
+"""
+
+
+import json
+
+from extractors import build_result_record, build_today_record
+
+
+# Helpers shared by every snippet:
+# text() mirrors BeautifulSoup get_text(strip=True) and first()/all() match
+# class_='a b' (exact attribute) or class_='a' (single class) like find()/find_all()
+_JS_HELPERS = r"""
+const norm = (el) => (el.getAttribute('class') || '').trim().split(/\s+/).join(' ');
+const hasClass = (el, name) => (' ' + norm(el) + ' ').indexOf(' ' + name + ' ') !== -1;
+const matches = (el, tag, cls) =>
+    (!tag || el.tagName.toLowerCase() === tag) &&
+    (cls.indexOf(' ') !== -1 ? norm(el) === cls : hasClass(el, cls));
+const all = (root, tag, cls) =>
+    Array.from(root.getElementsByTagName(tag || '*')).filter((el) => matches(el, tag, cls));
+const first = (root, tag, cls) => (root ? all(root, tag, cls)[0] || null : null);
+const text = (el, sep) => {
+    const parts = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        const part = walker.currentNode.nodeValue.trim();
+        if (part) parts.push(part);
+    }
+    return parts.join(sep || '');
+};
+const teamsOf = (row) => {
+    const teams = first(row, null, 'teams');
+    if (!teams) return null;
+    const home = first(teams, null, 'home-team');
+    const away = first(teams, null, 'away-team');
+    if (!home || !away) return null;
+    const homeTeam = text(home), awayTeam = text(away);
+    const title = teams.hasAttribute('title') ? teams.getAttribute('title') : homeTeam + ' vs ' + awayTeam;
+    return {title: title, home: homeTeam, away: awayTeam};
+};
+const leftTeamTable = (row) => first(first(row, null, 'm-table-cell left-team-cell'), null, 'left-team-table');
+"""
+
+LIVE_LIST_JS = _JS_HELPERS + r"""
+return JSON.stringify(all(document, 'div', 'm-table-row m-content-row match-row football-row').map((row) => {
+    const out = {title: null, home: null, away: null, clock: '', home_score: null, away_score: null};
+    const gameId = first(leftTeamTable(row), null, 'game-id');
+    if (gameId) out.clock = text(gameId);
+    const teams = teamsOf(row);
+    if (teams) Object.assign(out, teams);
+    const score = first(row, null, 'score');
+    if (score) {
+        const items = all(score, null, 'score-item');
+        if (items.length >= 2) {
+            out.home_score = text(items[0]);
+            out.away_score = text(items[1]);
+        }
+    }
+    return out;
+}));
+"""
+
+TODAY_JS = _JS_HELPERS + r"""
+const rows = [];
+all(document, 'div', 'm-table-row m-content-row match-row').forEach((row) => {
+    const teams = teamsOf(row);
+    if (!teams) return;
+    let tournament = 'Unknown Tournament';
+    let league = row.parentElement;
+    while (league && !(league.tagName.toLowerCase() === 'div' && hasClass(league, 'match-league'))) {
+        league = league.parentElement;
+    }
+    const name = first(first(league, 'div', 'league-title'), 'span', 'text');
+    if (name) tournament = text(name);
+    const table = leftTeamTable(row);
+    const gameId = first(table, null, 'game-id');
+    const clock = first(table, null, 'clock-time');
+    const odds = ['', '', ''];
+    const market = first(first(row, 'div', 'm-table-cell market-cell two-markets'), 'div', 'm-market market');
+    if (market) {
+        const outcomes = all(market, 'div', 'm-outcome');
+        if (outcomes.length >= 3) {
+            for (let i = 0; i < 3; i++) {
+                const value = first(outcomes[i], 'span', 'm-outcome-odds');
+                odds[i] = value ? text(value) : '';
+            }
+        }
+    }
+    rows.push({
+        title: teams.title, home: teams.home, away: teams.away, tournament: tournament,
+        game_id: gameId ? text(gameId) : '', time: clock ? text(clock) : '', odds: odds
+    });
+});
+return JSON.stringify(rows);
+"""
+
+LIVE_RESULT_JS = _JS_HELPERS + r"""
+const rows = [];
+const section = first(document, 'section', 'result-list');
+if (!section) return null;
+all(section, 'dl', 'list').forEach((block) => {
+    const dt = block.getElementsByTagName('dt')[0];
+    const tournament = (dt ? text(dt) : 'Unknown Tournament').replace(/^"+|"+$/g, '');
+    Array.from(block.getElementsByTagName('dd')).forEach((dd) => {
+        const event = first(dd, 'ul', 'result-event');
+        if (!event) return;
+        const home = first(event, 'li', 'home');
+        const away = first(event, 'li', 'away');
+        const scoreLi = first(event, 'li', 'score');
+        if (!home || !away || !scoreLi) return;
+        const scoreDiv = first(scoreLi, 'div', 'score-com');
+        if (!scoreDiv) return;
+        let score = '';
+        const detail = first(scoreDiv, 'div', 'score-detail');
+        if (!detail) {
+            score = text(scoreDiv);
+        } else {
+            // Text nodes sitting directly in score-com, skipping the halftime detail
+            scoreDiv.childNodes.forEach((node) => {
+                if (node.nodeType === Node.TEXT_NODE) score += node.nodeValue.trim();
+            });
+            if (!/\d/.test(score)) {
+                const detailText = text(detail);
+                const part = text(scoreDiv, '|').split('|')
+                    .find((p) => p.trim() !== detailText && p.indexOf(':') !== -1);
+                if (part) score = part.trim();
+            }
+        }
+        rows.push({tournament: tournament, home: text(home), away: text(away), score: score});
+    });
+});
+return JSON.stringify(rows);
+"""
+
+
+def _run(driver, script):
+    result = driver.execute_script(script)
+    return json.loads(result) if result else None
+
+
+def extract_live_rows_js(driver):
+    """
+    In-browser counterpart of extractors.parse_live_rows()
+    Returns rows with title, home-team, away-team, clock, home_score, away_score
+    """
+    return [{
+        'title': row['title'],
+        'home-team': row['home'],
+        'away-team': row['away'],
+        'clock': row['clock'],
+        'home_score': row['home_score'],
+        'away_score': row['away_score'],
+    } for row in _run(driver, LIVE_LIST_JS) or []]
+
+
+def extract_today_matches_js(driver, current_date):
+    """
+    In-browser counterpart of extractors.parse_today_matches()
+    Returns match dicts as returned by scrape_sb_today()
+    """
+    return [build_today_record(
+        current_date, row['time'], row['title'], row['tournament'], row['game_id'],
+        row['home'], row['away'], *row['odds'],
+    ) for row in _run(driver, TODAY_JS) or []]
+
+
+def extract_result_matches_js(driver):
+    """
+    In-browser counterpart of extractors.parse_result_matches()
+    Returns dicts with tournament, home_team, away_team and full-time goals
+    """
+    rows = _run(driver, LIVE_RESULT_JS)
+    if rows is None:
+        print("❌ Could not find result-list section")
+        return []
+    matches = []
+    for row in rows:
+        match_data = build_result_record(row['tournament'], row['home'], row['away'], row['score'])
+        if match_data:
+            matches.append(match_data)
+    return matches
@@ -0,0 +1,213 @@
+"""Append-only CSV writes deduplicated through a persisted key index.
+
+Every CSV written here gets a sidecar '<file>.keys' holding one hashed
+(date, title) key per line. The sidecar is loaded once per process, new rows
+are checked against it and only the rows not seen before are appended to the
+CSV, so a write costs O(new rows) however long the history gets.
+
+Rows that carry a game id also get an event key line ('e<date+id>', see
+event_ids), so a fixture logged again under a differently spelled title is
+still recognised as a duplicate.
+
+The sidecar also records the CSV's size after each write ('@<bytes>' lines).
+If the CSV was changed by anything else (a full rewrite, a merge) the sizes
+no longer agree and the index is rebuilt from the CSV once.
+"""
+
+
+import csv
+import hashlib
+import os
+
+import pandas as pd
+
+from event_ids import event_keys
+
+
+KEY_INDEX_SUFFIX = os.getenv('CSV_KEY_INDEX_SUFFIX', '.keys')
+KEY_COLUMNS = ('date', 'title')
+EVENT_KEY_COLUMNS = ('date', 'game-id')
+
+# abspath -> KeyIndex, shared by every writer in the process
+_INDEXES = {}
+
+
+def _clean(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ''
+    return str(value).strip()
+
+
+def row_key(*values):
+    """Hashed key of the given column values, e.g. row_key(date, title)."""
+    raw = '|'.join(_clean(value) for value in values)
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def read_header(filename):
+    """Column names from the first line of a CSV, or None if it has none."""
+    try:
+        with open(filename, newline='', encoding='utf-8') as f:
+            return next(csv.reader(f), None)
+    except OSError:
+        return None
+
+
+class KeyIndex:
+    """
+    Set of hashed row keys for one CSV, persisted next to it
+    """
+
+    def __init__(self, csv_path, key_columns=KEY_COLUMNS, event_columns=EVENT_KEY_COLUMNS, load=True):
+        self.csv_path = csv_path
+        self.index_path = csv_path + KEY_INDEX_SUFFIX
+        self.key_columns = tuple(key_columns)
+        self.event_columns = tuple(event_columns)
+        self.keys = set()
+        self.csv_size = None
+        if load:
+            self.load()
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def load(self):
+        """Read the sidecar, rebuilding it when it doesn't describe the current CSV."""
+        keys, size = set(), None
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('@'):
+                        size = int(line[1:])
+                    elif line:
+                        keys.add(line)
+        except (OSError, ValueError):
+            size = None
+
+        if size is not None and size == _file_size(self.csv_path):
+            self.keys, self.csv_size = keys, size
+        else:
+            self.rebuild()
+
+    def key_columns_of(self, columns):
+        """Key columns present in columns (a CSV without 'date' is keyed on title alone)."""
+        return [col for col in self.key_columns if col in columns]
+
+    def keys_of(self, df):
+        """Hashed key of every row of df, as a list."""
+        cols = self.key_columns_of(df.columns)
+        if not cols:
+            return []
+        return [row_key(*values) for values in zip(*(df[col].tolist() for col in cols))]
+
+    def event_keys_of(self, df):
+        """Event key of every row of df ('e<key>', None without a game id), as a list."""
+        if not all(col in df.columns for col in self.event_columns):
+            return [None] * len(df)
+        keys = event_keys(*(df[col] for col in self.event_columns))
+        return [None if pd.isna(key) else f"e{key}" for key in keys]
+
+    def rebuild(self, df=None):
+        """
+        Recompute the index from the CSV (or from df, its in-memory contents) and rewrite the sidecar
+        """
+        if df is None:
+            header = read_header(self.csv_path) or []
+            cols = self.key_columns_of(header)
+            cols += [col for col in self.event_columns if col in header and col not in cols]
+            df = pd.read_csv(self.csv_path, usecols=cols, dtype=str, keep_default_na=False) \
+                if cols else pd.DataFrame()
+            if header:
+                print(f"🔑 Rebuilt key index for {self.csv_path}")
+        self.keys = set(self.keys_of(df))
+        self.keys.update(key for key in self.event_keys_of(df) if key)
+        self.csv_size = _file_size(self.csv_path)
+        self._write(self.keys, mode='w')
+
+    def add(self, keys):
+        """Record keys written to the CSV by this process."""
+        self.keys.update(keys)
+        self.csv_size = _file_size(self.csv_path)
+        self._write(keys, mode='a')
+
+    def _write(self, keys, mode):
+        try:
+            with open(self.index_path, mode, encoding='utf-8') as f:
+                for key in keys:
+                    f.write(f"{key}\n")
+                if self.csv_size is not None:
+                    f.write(f"@{self.csv_size}\n")
+        except OSError as e:
+            print(f"⚠️ Could not write key index {self.index_path}: {e}")
+
+
+def get_key_index(filename):
+    """Process-wide KeyIndex for filename, reloaded if the CSV changed underneath it."""
+    path = os.path.abspath(filename)
+    index = _INDEXES.get(path)
+    if index is None:
+        index = _INDEXES[path] = KeyIndex(filename)
+    elif index.csv_size != _file_size(filename):
+        index.load()
+    return index
+
+
+def reindex_csv(filename, df):
+    """Refresh the key index after filename was rewritten from df."""
+    path = os.path.abspath(filename)
+    if path not in _INDEXES:
+        _INDEXES[path] = KeyIndex(filename, load=False)
+    _INDEXES[path].rebuild(df)
+
+
+def append_new_rows(data, filename, **to_csv_kwargs):
+    """
+    Append the records of data whose (date, title) key isn't in filename yet
+    (nor, for rows with a game id, their (date, game-id) event key)
+
+    Args:
+        data (list): List of dictionaries to write
+        filename (str): Target CSV; created with a header if missing
+        **to_csv_kwargs: Passed to DataFrame.to_csv (quoting, escapechar, ...)
+
+    Returns:
+        tuple: (DataFrame, int) - Rows actually appended and number of duplicates skipped
+    """
+    new_df = pd.DataFrame(data)
+    if new_df.empty:
+        return new_df, 0
+
+    header = read_header(filename) if os.path.exists(filename) else None
+    if header:
+        missing = [col for col in new_df.columns if col not in header]
+        if missing:
+            print(f"⚠️ Dropping columns not in {filename}: {', '.join(missing)}")
+        new_df = new_df.reindex(columns=header)
+
+    index = get_key_index(filename)
+    keys = pd.Series(index.keys_of(new_df), index=new_df.index, dtype=object)
+    if keys.empty:
+        raise ValueError(f"{filename} has none of the key columns {', '.join(KEY_COLUMNS)}")
+    events = pd.Series(index.event_keys_of(new_df), index=new_df.index, dtype=object)
+    has_event = events.notna()
+    unique = ~keys.isin(index.keys) & ~keys.duplicated() & \
+        ~(has_event & (events.isin(index.keys) | events.duplicated()))
+    unique_df = new_df[unique]
+
+    if not unique_df.empty:
+        with open(filename, 'a', newline='', encoding='utf-8') as f:
+            unique_df.to_csv(f, header=not header, index=False, **to_csv_kwargs)
+        index.add(keys[unique].tolist() + events[unique & has_event].tolist())
+
+    return unique_df, len(new_df) - len(unique_df)
@@ -0,0 +1,254 @@
+"""Kickoff-aware scheduling for the live scrape.
+
+Builds a sorted index of today's kickoff times from the today CSV and predicts
+each fixture's halftime window (kickoff + HT_WINDOW_START..HT_WINDOW_END
+minutes). Matches already logged at HT whose full-time score hasn't been
+captured from the live feed also get a full-time window (kickoff +
+FT_WINDOW_START..FT_WINDOW_END), so the feed is watched as they finish. The
+live job only needs to run while at least one window is open, and should poll
+more often when many are.
+
+    python kickoff_scheduler.py            # print today's HT and FT windows
+    python kickoff_scheduler.py --loop     # run live.py whenever a window is open
+"""
+
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from alert_state import alert_key
+from storage import get_storage, table_path
+
+
+# Predicted halftime window relative to kickoff, in minutes
+HT_WINDOW_START = int(os.getenv('HT_WINDOW_START_MINUTES', '45'))
+HT_WINDOW_END = int(os.getenv('HT_WINDOW_END_MINUTES', '60'))
+# Predicted full-time window of an alerted match: from about its 85th minute
+# (a left-H2 capture needs a sighting that late) until it has surely finished
+FT_WINDOW_START = int(os.getenv('FT_WINDOW_START_MINUTES', '100'))
+FT_WINDOW_END = int(os.getenv('FT_WINDOW_END_MINUTES', '125'))
+# Poll every POLL_MINUTES normally and every PEAK_POLL_MINUTES once
+# PEAK_THRESHOLD or more fixtures are inside their window
+POLL_MINUTES = float(os.getenv('LIVE_POLL_MINUTES', '6'))
+PEAK_POLL_MINUTES = float(os.getenv('LIVE_PEAK_POLL_MINUTES', '3'))
+PEAK_THRESHOLD = int(os.getenv('LIVE_PEAK_THRESHOLD', '10'))
+# Longest idle sleep while waiting for the next window to open
+MAX_IDLE_MINUTES = float(os.getenv('LIVE_MAX_IDLE_MINUTES', '30'))
+
+
+class KickoffIndex:
+    """
+    Sorted kickoff times for one day with O(log n) halftime- and fulltime-window queries
+    """
+
+    def __init__(self, kickoffs, finals=None):
+        self.kickoffs = sorted(kickoffs)
+        self.finals = sorted(finals or [])
+
+    def __len__(self):
+        return len(self.kickoffs)
+
+    def set_finals(self, finals):
+        """Replace the kickoffs of the alerted matches still waiting for a full-time score."""
+        self.finals = sorted(finals or [])
+
+    @staticmethod
+    def _count(kickoffs, now, start, end):
+        # kickoff + start <= now <= kickoff + end
+        lo = bisect_left(kickoffs, now - timedelta(minutes=end))
+        hi = bisect_right(kickoffs, now - timedelta(minutes=start))
+        return max(0, hi - lo)
+
+    @staticmethod
+    def _next_start(kickoffs, now, start):
+        i = bisect_right(kickoffs, now - timedelta(minutes=start))
+        return kickoffs[i] + timedelta(minutes=start) if i < len(kickoffs) else None
+
+    def active_count(self, now):
+        """Number of fixtures whose predicted HT window contains now."""
+        return self._count(self.kickoffs, now, HT_WINDOW_START, HT_WINDOW_END)
+
+    def finishing_count(self, now):
+        """Number of alerted matches without a full-time score whose FT window contains now."""
+        return self._count(self.finals, now, FT_WINDOW_START, FT_WINDOW_END)
+
+    def open_count(self, now):
+        """Number of HT and FT windows open at now."""
+        return self.active_count(now) + self.finishing_count(now)
+
+    def next_window_start(self, now):
+        """Start of the next HT or FT window that opens after now, or None."""
+        starts = [start for start in (self._next_start(self.kickoffs, now, HT_WINDOW_START),
+                                      self._next_start(self.finals, now, FT_WINDOW_START)) if start]
+        return min(starts) if starts else None
+
+    def next_poll_delay(self, now):
+        """
+        Seconds to wait before the next live poll
+        Dense at peak, normal while any window is open, otherwise until the next window
+        """
+        active = self.open_count(now)
+        if active >= PEAK_THRESHOLD:
+            return PEAK_POLL_MINUTES * 60
+        if active > 0:
+            return POLL_MINUTES * 60
+        next_start = self.next_window_start(now)
+        if next_start is None:
+            return MAX_IDLE_MINUTES * 60
+        return min(max((next_start - now).total_seconds(), 0), MAX_IDLE_MINUTES * 60)
+
+
+def final_kickoffs(date=None, today_df=None, alerts_df=None):
+    """
+    Kickoffs of the day's alerted matches whose full-time score the live feed hasn't captured
+    A match not found in the today table is taken to have kicked off HT_WINDOW_START
+    minutes before it was logged at HT
+
+    Args:
+        date (datetime): Day to look at, defaults to today
+        today_df (DataFrame): Preloaded today table; read from storage when omitted
+        alerts_df (DataFrame): Preloaded alerts log; read from storage when omitted
+
+    Returns:
+        list: Kickoff datetimes ([] if the alerts log can't be read)
+    """
+    date = date or datetime.now()
+    date_str = date.strftime('%d-%m-%y')
+
+    try:
+        storage = get_storage()
+        if alerts_df is None:
+            alerts_df = storage.read('alerts', columns=['date', 'log_time', 'title'], date=date_str)
+        if alerts_df is None or alerts_df.empty:
+            return []
+        alerts_df = alerts_df[alerts_df['date'].astype(str).str.strip() == date_str]
+        titles = alerts_df['title'].astype(str).str.strip()
+
+        captured = storage.read('live_results', columns=['date', 'title'], date=date_str)
+        if captured is not None and not captured.empty:
+            done = {alert_key(day, title) for day, title in zip(captured['date'], captured['title'])}
+            waiting = [alert_key(date_str, title) not in done for title in titles]
+            alerts_df, titles = alerts_df[waiting], titles[waiting]
+        if alerts_df.empty:
+            return []
+
+        kickoffs = pd.to_datetime(date_str + ' ' + alerts_df['log_time'].astype(str).str.strip(),
+                                  format='%d-%m-%y %H:%M', errors='coerce') - timedelta(minutes=HT_WINDOW_START)
+        if today_df is None:
+            today_df = storage.read('today', columns=['date', 'time', 'title'], date=date_str)
+        if today_df is not None and not today_df.empty:
+            today_df = today_df[today_df['date'].astype(str).str.strip() == date_str]
+            times = pd.Series(pd.to_datetime(date_str + ' ' + today_df['time'].astype(str).str.strip(),
+                                             format='%d-%m-%y %H:%M', errors='coerce').values,
+                              index=today_df['title'].astype(str).str.strip().values)
+            times = times[~times.index.duplicated(keep='first')]
+            kickoffs = pd.Series(titles.map(times).values, index=kickoffs.index).fillna(kickoffs)
+        return kickoffs.dropna().dt.to_pydatetime().tolist()
+    except Exception as e:
+        print(f"⚠️ Could not load alerted matches from {table_path('alerts')}: {e}")
+        return []
+
+
+def load_kickoff_index(date=None, today_df=None, alerts_df=None):
+    """
+    Build the kickoff index for date from the date/time columns of the today table,
+    with the FT windows of the alerted matches still waiting for a score
+
+    Args:
+        date (datetime): Day to index, defaults to today
+        today_df (DataFrame): Preloaded today table; read from storage when omitted
+        alerts_df (DataFrame): Preloaded alerts log; read from storage when omitted
+
+    Returns:
+        KickoffIndex, or None if the table can't be read
+    """
+    date = date or datetime.now()
+    date_str = date.strftime('%d-%m-%y')
+
+    try:
+        if today_df is None:
+            today_df = get_storage().read('today', columns=['date', 'time', 'title'], date=date_str)
+        if today_df is None:
+            raise FileNotFoundError(table_path('today'))
+    except Exception as e:
+        print(f"⚠️ Could not load kickoff times from {table_path('today')}: {e}")
+        return None
+
+    finals = final_kickoffs(date, today_df, alerts_df)
+    today_df = today_df[today_df['date'].astype(str).str.strip() == date_str]
+    today_df = today_df.drop_duplicates(subset=['title'])
+    kickoff_times = pd.to_datetime(
+        date_str + ' ' + today_df['time'].astype(str).str.strip(), format='%d-%m-%y %H:%M', errors='coerce')
+    return KickoffIndex(kickoff_times.dropna().dt.to_pydatetime().tolist(), finals)
+
+
+def should_run_live(now=None, index=None):
+    """
+    Decide whether a live poll can find anything at halftime, or an alerted match
+    finishing, right now
+    Fails open (returns True) when there is no kickoff data for today
+
+    Returns:
+        tuple: (bool, int) - Whether to poll and number of HT and FT windows open
+    """
+    now = now or datetime.now()
+    index = index if index is not None else load_kickoff_index(date=now)
+    if not index:
+        return True, 0
+    active = index.open_count(now)
+    return active > 0, active
+
+
+def run_schedule(job, index=None):
+    """
+    Call job() whenever a fixture is in its HT window or an alerted match in its FT window,
+    sleeping by next_poll_delay()
+    Reloads the kickoff index when the day changes, and the FT windows on every pass
+    """
+    index_date = None
+    while True:
+        now = datetime.now()
+        if index is None or index_date != now.date():
+            index = load_kickoff_index(date=now) or KickoffIndex([])
+            index_date = now.date()
+            print(f"🗓️ Tracking {len(index)} kickoffs for {now.strftime('%d-%m-%y')}")
+        else:
+            index.set_finals(final_kickoffs(now))
+
+        active, finishing = index.active_count(now), index.finishing_count(now)
+        if active or finishing:
+            print(f"⚽ {active} fixture(s) in their HT window, {finishing} alerted match(es) "
+                  f"in their FT window at {now.strftime('%H:%M')}")
+            job()
+        time.sleep(index.next_poll_delay(datetime.now()))
+
+
+def _run_live_script():
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'live.py')
+    subprocess.run([sys.executable, script])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Kickoff-aware live polling")
+    parser.add_argument('--loop', action='store_true', help='Run live.py whenever a window is open')
+    args = parser.parse_args()
+
+    if args.loop:
+        run_schedule(_run_live_script)
+    else:
+        now = datetime.now()
+        index = load_kickoff_index(date=now)
+        if index is not None:
+            print(f"🗓️ {len(index)} kickoffs today, {index.active_count(now)} in their HT window now")
+            print(f"🏁 {len(index.finals)} alerted matches waiting for FT, "
+                  f"{index.finishing_count(now)} in their FT window now")
+            next_start = index.next_window_start(now)
+            if next_start:
+                print(f"⏭️ Next window opens at {next_start.strftime('%H:%M')}")
@@ -3,15 +3,51 @@
 
 from datetime import datetime
 import os
-from utils import scrape_sb_live, update_alert_log, backfill_tournament_and_odds, filter_recent_matches
+from utils import (scrape_sb_live, build_alert_records, evaluate_live_records, append_alert_records,
+                   backfill_tournament_and_odds, recent_backfilled_records, load_today_df,
+                   capture_live_final_scores, update_alerts_with_final_scores)
+from alert_state import AlertedState
+from alert_outbox import AlertOutbox
+from live_state import LiveStateTracker
+from today_index import TodayIndex
+from odds_history import OddsHistory
+from kickoff_scheduler import should_run_live
 
 
-# Scrape fresh data
-matches_data = scrape_sb_live()
+# Skip the browser entirely when no fixture can be at half time and no alerted
+# match is finishing (set LIVE_KICKOFF_GATE=0 to always scrape)
+if os.getenv('LIVE_KICKOFF_GATE', '1') != '0':
+    run_live, active = should_run_live()
+    if not run_live:
+        print("💤 No tracked fixture is in its HT or FT window - skipping live scrape")
+        raise SystemExit(0)
 
-# Save to file
-update_alert_log(matches_data)
+# Scrape fresh data; only matches that reached HT since the last run come back
+tracker = LiveStateTracker()
+matches_data = scrape_sb_live(tracker)
+tracker.save()
 
-backfill_tournament_and_odds()
+# Build the today.csv lookup once for both enrichment steps, with the latest pre-match odds
+today_index = TodayIndex(load_today_df(), OddsHistory())
+records = build_alert_records(matches_data or [], today_index=today_index)
 
-filter_recent_matches()
+# Alert straight from the scraped records; matches alerted by an earlier run are skipped.
+# Hits go to the outbox, delivered by `python alert_outbox.py dispatch`
+alerted = AlertedState()
+outbox = AlertOutbox()
+evaluate_live_records(records, alerted, outbox)
+outbox.save()
+alerted.save()
+
+# Then persist them
+append_alert_records(records)
+
+# Matches that only now got their tournament or odds get their scenario pass here
+backfilled = recent_backfilled_records(backfill_tournament_and_odds(today_index=today_index))
+if backfilled and evaluate_live_records(backfilled, alerted, outbox):
+    outbox.save()
+    alerted.save()
+
+# Alerted matches that finished since the last run go straight into final_db
+if capture_live_final_scores(tracker.transitions):
+    update_alerts_with_final_scores()
@@ -0,0 +1,219 @@
+"""Long-running live pipeline: the same steps as live.py in one process.
+
+The pooled browser, the today.csv lookup table and the alerts log stay in
+memory between polls, as does the per-match live state (see live_state.py), so
+each poll only handles the matches that just reached HT. Each poll evaluates
+the scenarios on those freshly scraped records and alerts straight away;
+appending the new rows to the log (see keyed_csv) and the backfill then run on
+a background writer thread. Alerts go
+to the outbox (see alert_outbox.py), which an asyncio dispatcher thread delivers
+to ALERT_SINK. The set of matches already alerted is checkpointed so a restart
+does not alert them again.
+
+    python live_daemon.py                 # kickoff-aware poll interval
+    python live_daemon.py --interval 5    # poll every 5 minutes
+    python live_daemon.py --once          # a single poll, then exit
+"""
+
+
+import argparse
+import asyncio
+import os
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from alert_outbox import AlertDispatcher, AlertOutbox, make_sink
+from alert_state import AlertedState
+from driver_pool import get_driver_pool
+from kickoff_scheduler import KickoffIndex, final_kickoffs, load_kickoff_index
+from live_state import LiveStateTracker
+from odds_history import OddsHistory, odds_history_version
+from storage import get_storage, table_path
+from today_index import TodayIndex
+from utils import (backfill_tournament_and_odds, build_alert_records, capture_live_final_scores,
+                   evaluate_live_records, load_alerts_df, load_today_df, recent_backfilled_records,
+                   scrape_sb_live, update_alerts_with_final_scores)
+
+
+CHECKPOINT_FILE = os.getenv('LIVE_CHECKPOINT_FILE', 'live_checkpoint.json')
+# Alerted keys older than this are dropped from the checkpoint
+CHECKPOINT_KEEP_DAYS = int(os.getenv('LIVE_CHECKPOINT_KEEP_DAYS', '2'))
+# Seconds between outbox dispatches
+DISPATCH_INTERVAL = float(os.getenv('ALERT_DISPATCH_INTERVAL', '5'))
+
+
+class LiveDaemon:
+    """
+    Runs scrape -> alert on a loop with in-memory state, persisting in the background
+    """
+
+    def __init__(self, interval_minutes=None, checkpoint_file=None):
+        self.interval_minutes = interval_minutes
+        self.checkpoint_file = checkpoint_file or CHECKPOINT_FILE
+        self.storage = get_storage()
+        self.stop_event = threading.Event()
+
+        self.state = AlertedState(self.checkpoint_file, CHECKPOINT_KEEP_DAYS)
+        # One writer thread, so appends and backfills run in poll order
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='alerts-writer')
+        self.outbox = AlertOutbox()
+        self.dispatch_stop = threading.Event()
+        self.dispatcher = None
+        self.tracker = LiveStateTracker()
+        self.alerts_df = load_alerts_df()
+        self.today_df = None
+        self.today_index = TodayIndex()
+        self.today_version = None
+        self.kickoff_index = None
+        self.kickoff_date = None
+
+    def refresh_today(self):
+        """Reload the today table and the kickoff index only when the table, the odds history or the day changed."""
+        version = (self.storage.version('today'), odds_history_version())
+        today = datetime.now().date()
+        if version != self.today_version or today != self.kickoff_date:
+            self.today_df = load_today_df()
+            self.today_index = TodayIndex(self.today_df, OddsHistory())
+            self.kickoff_index = load_kickoff_index(datetime.now(), self.today_df, self.alerts_df)
+            self.today_version, self.kickoff_date = version, today
+            rows = 0 if self.today_df is None else len(self.today_df)
+            print(f"🗓️ Loaded {rows} fixtures from {table_path('today')} "
+                  f"({self.today_index.odds_updated} with moved odds)")
+
+    def append_alerts(self, records):
+        """
+        Add records not logged yet to the alerts table and the in-memory frame
+
+        Returns:
+            int: Number of new records written
+        """
+        if not records:
+            return 0
+        try:
+            new_df, skipped = self.storage.append('alerts', records)
+        except Exception as e:
+            print(f"❌ Error updating {table_path('alerts')}: {e}")
+            return 0
+
+        if new_df.empty:
+            print(f"⏭️ All {len(records)} records were duplicates - no new data saved")
+            return 0
+
+        if self.alerts_df is None:
+            self.alerts_df = new_df.reset_index(drop=True)
+        else:
+            self.alerts_df = pd.concat([self.alerts_df, new_df], ignore_index=True)
+        print(f"📝 Added {len(new_df)} new records to {table_path('alerts')}")
+        if skipped:
+            print(f"⏭️ Skipped {skipped} duplicate records")
+        return len(new_df)
+
+    def persist(self, records, today_index, transitions):
+        """
+        Append the poll's records to the alerts log, backfill (alerting the rows it completed),
+        and finalise the alerted matches that just finished (runs on the writer thread)
+        """
+        try:
+            if records:
+                self.append_alerts(records)
+            if self.alerts_df is not None and not self.alerts_df.empty and today_index.rows:
+                backfilled = recent_backfilled_records(
+                    backfill_tournament_and_odds(self.alerts_df, today_index=today_index), self.alerts_df)
+                # Matches that only now got their tournament or odds get their scenario pass here
+                if backfilled and evaluate_live_records(backfilled, self.state, self.outbox):
+                    self.outbox.save()
+                    self.state.save()
+            if capture_live_final_scores(transitions, self.alerts_df):
+                update_alerts_with_final_scores()
+        except Exception as e:
+            print(f"❌ Persisting poll failed: {e}")
+
+    def poll(self):
+        """
+        One pass of the live pipeline
+
+        Returns:
+            list: Matches that triggered an alert on this poll
+        """
+        self.refresh_today()
+
+        # Only matches that reached HT since the previous poll
+        matches_data = scrape_sb_live(self.tracker)
+        self.tracker.save()
+        records = build_alert_records(matches_data or [], today_index=self.today_index)
+
+        # Alert before anything is written
+        alerted = evaluate_live_records(records, self.state, self.outbox) if records else []
+        if alerted:
+            self.outbox.save()
+        self.state.extra['last_poll'] = datetime.now().strftime('%d-%m-%y %H:%M')
+        self.state.save()
+
+        self.writer.submit(self.persist, records, self.today_index, self.tracker.transitions)
+        return alerted
+
+    def next_delay(self):
+        """Seconds until the next poll: the fixed interval, or kickoff-aware by default."""
+        if self.interval_minutes:
+            return self.interval_minutes * 60
+        index = self.kickoff_index or KickoffIndex([])
+        # Alerted matches keep arriving, and leave once their FT score is captured
+        index.set_finals(final_kickoffs(datetime.now(), self.today_df, self.alerts_df))
+        return index.next_poll_delay(datetime.now())
+
+    def stop(self, signum=None, frame=None):
+        if not self.stop_event.is_set():
+            print("🛑 Stop requested - finishing current poll")
+        self.stop_event.set()
+
+    def start_dispatcher(self):
+        """Deliver the outbox from a background thread running its own event loop."""
+        try:
+            dispatcher = AlertDispatcher(self.outbox, make_sink())
+        except ValueError as e:
+            print(f"⚠️ Alerts stay queued in {self.outbox.path}: {e}")
+            return
+        self.dispatcher = threading.Thread(
+            target=asyncio.run, args=(dispatcher.run(self.dispatch_stop, DISPATCH_INTERVAL),),
+            name='alerts-dispatcher', daemon=True)
+        self.dispatcher.start()
+        print(f"📨 Delivering alerts to {dispatcher.sink.name}")
+
+    def run(self, once=False):
+        """Poll until stopped by SIGINT/SIGTERM, then release the browser pool."""
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        print(f"🚀 Live daemon started ({len(self.state)} alerted matches in checkpoint)")
+        self.start_dispatcher()
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    self.poll()
+                except Exception as e:
+                    print(f"❌ Poll failed: {e}")
+                if once:
+                    break
+                delay = self.next_delay()
+                print(f"⏱️ Next poll in {delay / 60:.1f} min")
+                self.stop_event.wait(delay)
+        finally:
+            self.writer.shutdown(wait=True)
+            # The dispatcher makes a last pass over the outbox before it exits
+            self.dispatch_stop.set()
+            if self.dispatcher is not None:
+                self.dispatcher.join()
+            get_driver_pool().shutdown()
+            print("👋 Live daemon stopped")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the live pipeline as a long-running process")
+    parser.add_argument('--interval', type=float, default=None,
+                        help='Poll interval in minutes (default: kickoff-aware)')
+    parser.add_argument('--once', action='store_true', help='Run a single poll and exit')
+    args = parser.parse_args()
+
+    LiveDaemon(interval_minutes=args.interval).run(once=args.once)
@@ -0,0 +1,330 @@
+"""In-play snapshots of every live match, kept as compact per-day column files.
+
+Each poll of the live feed appends one row per live match:
+
+    event    dictionary code of the match (its game id, or its title - see live_state.event_id)
+    ts       poll time, epoch seconds
+    phase    0 unknown, 1 H1, 2 HT, 3 H2, 4 FT
+    minute   match minute from the clock (45 at HT, -1 when unknown)
+    home     home goals
+    away     away goals
+
+Rows are stored per day in LIVE_SERIES_DIR/YYYY-MM-DD/, one raw little-endian
+array file per column (17 bytes a row) and events.json for that day's event
+dictionary. Appends only write to the end of the files. Reads memory-map them,
+so months of polls can be scanned at NumPy speed without loading them:
+
+    from live_series import LiveSeriesStore
+    store = LiveSeriesStore()
+    chunk = store.chunk('2026-10-17')
+    second_half = chunk['phase'] == 3
+    goals = chunk['home'][second_half] + chunk['away'][second_half]
+    df = store.to_frame(start='2026-10-01')   # decoded, for pandas work
+
+    python live_series.py info
+    python live_series.py show g41233712
+"""
+
+
+import argparse
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from live_state import PHASES, clock_minute, event_id, match_phase
+from state_file import load_state, save_state
+
+
+LIVE_SERIES_DIR = os.getenv('LIVE_SERIES_DIR', 'live_series')
+# Set LIVE_SERIES=0 to stop recording snapshots
+LIVE_SERIES_ENABLED = os.getenv('LIVE_SERIES', '1') != '0'
+
+# Column name -> dtype of its file
+COLUMNS = {
+    'event': '<u4',
+    'ts': '<i8',
+    'phase': '<u1',
+    'minute': '<i2',
+    'home': '<u1',
+    'away': '<u1',
+}
+PHASE_CODES = {phase: code for code, phase in enumerate(PHASES, start=1)}
+PHASE_LABELS = np.array([''] + list(PHASES), dtype=object)
+EVENTS_FILE = 'events.json'
+
+_DAY_FORMAT = '%Y-%m-%d'
+
+
+def _score(value):
+    try:
+        return min(max(int(value), 0), 255)
+    except (TypeError, ValueError):
+        return None
+
+
+class SeriesChunk:
+    """
+    One day of snapshots: memory-mapped columns plus the day's event dictionary
+    """
+
+    def __init__(self, day, columns, events, titles):
+        self.day = day
+        self.columns = columns
+        self.events = events
+        self.titles = titles
+        self._codes = None
+
+    def __len__(self):
+        return len(self.columns['ts'])
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def code(self, event):
+        """Dictionary code of an event id in this chunk, or None if it wasn't live that day."""
+        if self._codes is None:
+            self._codes = {name: code for code, name in enumerate(self.events)}
+        return self._codes.get(event)
+
+    def rows_of(self, event):
+        """Positions of one event's snapshots, in poll order."""
+        code = self.code(event)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.columns['event'] == code)
+
+    def to_frame(self):
+        """The chunk decoded into a DataFrame (event as a categorical, ts as datetime)."""
+        codes = np.asarray(self.columns['event']).astype('int64')
+        df = pd.DataFrame({name: np.asarray(values) for name, values in self.columns.items()})
+        df['event'] = pd.Categorical.from_codes(codes, categories=self.events)
+        df['title'] = np.asarray(self.titles, dtype=object)[codes] if len(codes) else []
+        df['ts'] = pd.to_datetime(df['ts'], unit='s')
+        df['phase'] = PHASE_LABELS[np.asarray(self.columns['phase'])]
+        return df
+
+
+class LiveSeriesStore:
+    """
+    Append-only per-day column files of live snapshots under a directory
+    """
+
+    def __init__(self, root=None):
+        self.root = root or LIVE_SERIES_DIR
+        self.lock = threading.Lock()
+        # day -> (event list, titles, {event: code}) of the chunk being appended to
+        self._dictionaries = {}
+
+    def day_dir(self, day):
+        return os.path.join(self.root, day)
+
+    def days(self):
+        """Days with stored snapshots, oldest first."""
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names
+                      if os.path.isfile(os.path.join(self.root, name, EVENTS_FILE)))
+
+    def _dictionary(self, day):
+        if day not in self._dictionaries:
+            state = load_state(os.path.join(self.day_dir(day), EVENTS_FILE), {})
+            events, titles = list(state.get('events', [])), list(state.get('titles', []))
+            self._dictionaries[day] = (events, titles, {event: code for code, event in enumerate(events)})
+        return self._dictionaries[day]
+
+    def encode(self, live_rows, now):
+        """
+        Column arrays of one poll's live rows; new events are added to the day's dictionary
+
+        Rows without a readable score are skipped.
+
+        Returns:
+            tuple: (day, {column: array}, dictionary changed)
+        """
+        day = now.strftime(_DAY_FORMAT)
+        events, titles, codes = self._dictionary(day)
+        known = len(events)
+        values = {name: [] for name in COLUMNS}
+        ts = int(now.timestamp())
+        for row in live_rows:
+            home, away = _score(row.get('home_score')), _score(row.get('away_score'))
+            if home is None or away is None:
+                continue
+            event = event_id(row)
+            if event not in codes:
+                codes[event] = len(events)
+                events.append(event)
+                titles.append(str(row.get('title') or '').strip())
+            phase = match_phase(row.get('clock'))
+            values['event'].append(codes[event])
+            values['ts'].append(ts)
+            values['phase'].append(PHASE_CODES.get(phase, 0))
+            values['minute'].append(clock_minute(row.get('clock'), phase))
+            values['home'].append(home)
+            values['away'].append(away)
+        arrays = {name: np.asarray(values[name], dtype=dtype) for name, dtype in COLUMNS.items()}
+        return day, arrays, len(events) > known
+
+    def append(self, live_rows, now=None):
+        """
+        Append one poll's live rows to the day's chunk
+
+        Args:
+            live_rows (list): Normalised live rows (title, game-id, clock, scores)
+            now (datetime): Poll time (default: now)
+
+        Returns:
+            int: Number of snapshots written
+        """
+        now = now or datetime.now()
+        with self.lock:
+            day, arrays, new_events = self.encode(live_rows or [], now)
+            written = len(arrays['ts'])
+            if not written:
+                return 0
+            directory = self.day_dir(day)
+            os.makedirs(directory, exist_ok=True)
+            # The dictionary goes first so every stored code can be decoded
+            if new_events or not os.path.exists(os.path.join(directory, EVENTS_FILE)):
+                events, titles, _ = self._dictionaries[day]
+                if not save_state(os.path.join(directory, EVENTS_FILE), {'events': events, 'titles': titles}):
+                    del self._dictionaries[day]
+                    return 0
+            for name, array in arrays.items():
+                with open(os.path.join(directory, f"{name}.bin"), 'ab') as f:
+                    f.write(array.tobytes())
+            # Only the current day is appended to
+            self._dictionaries = {day: self._dictionaries[day]}
+        return written
+
+    def chunk(self, day):
+        """
+        Memory-map one day of snapshots
+
+        Returns:
+            SeriesChunk: Read-only columns, or None if nothing was stored that day
+        """
+        directory = self.day_dir(day)
+        state = load_state(os.path.join(directory, EVENTS_FILE))
+        if state is None:
+            return None
+        sizes = {}
+        for name, dtype in COLUMNS.items():
+            path = os.path.join(directory, f"{name}.bin")
+            sizes[name] = os.path.getsize(path) // np.dtype(dtype).itemsize if os.path.exists(path) else 0
+        # A write cut short leaves some columns longer than others: only whole rows are read
+        rows = min(sizes.values())
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            columns[name] = np.memmap(os.path.join(directory, f"{name}.bin"), dtype=dtype, mode='r',
+                                      shape=(rows,)) if rows else np.empty(0, dtype=dtype)
+        return SeriesChunk(day, columns, state.get('events', []), state.get('titles', []))
+
+    def chunks(self, start=None, end=None):
+        """
+        Yield the day chunks between start and end ('YYYY-MM-DD', inclusive), oldest first
+        """
+        for day in self.days():
+            if (start and day < start) or (end and day > end):
+                continue
+            chunk = self.chunk(day)
+            if chunk is not None and len(chunk):
+                yield chunk
+
+    def to_frame(self, start=None, end=None):
+        """
+        Snapshots between start and end decoded into one DataFrame
+
+        Returns:
+            DataFrame: day, event, title, ts, phase, minute, home, away
+        """
+        frames = [chunk.to_frame().assign(day=chunk.day) for chunk in self.chunks(start, end)]
+        if not frames:
+            return pd.DataFrame(columns=['day', 'event', 'title', 'ts', 'phase', 'minute', 'home', 'away'])
+        df = pd.concat(frames, ignore_index=True)
+        df['event'] = df['event'].astype(str)
+        return df[['day', 'event', 'title', 'ts', 'phase', 'minute', 'home', 'away']]
+
+    def event_series(self, event, start=None, end=None):
+        """
+        Snapshots of one event (e.g. 'g41233712'), in poll order
+
+        Returns:
+            DataFrame: ts, phase, minute, home, away
+        """
+        frames = []
+        for chunk in self.chunks(start, end):
+            rows = chunk.rows_of(event)
+            if len(rows):
+                frames.append(pd.DataFrame({
+                    'ts': pd.to_datetime(np.asarray(chunk['ts'][rows]), unit='s'),
+                    'phase': PHASE_LABELS[np.asarray(chunk['phase'][rows])],
+                    'minute': np.asarray(chunk['minute'][rows]),
+                    'home': np.asarray(chunk['home'][rows]),
+                    'away': np.asarray(chunk['away'][rows]),
+                }))
+        if not frames:
+            return pd.DataFrame(columns=['ts', 'phase', 'minute', 'home', 'away'])
+        return pd.concat(frames, ignore_index=True)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_live_series():
+    """
+    Return the process-wide LiveSeriesStore on LIVE_SERIES_DIR
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LiveSeriesStore()
+        return _store
+
+
+def record_live_snapshots(live_rows, now=None):
+    """
+    Store one poll's live rows (a no-op when LIVE_SERIES=0 or the poll failed)
+
+    Returns:
+        int: Number of snapshots written, or None if error
+    """
+    if not LIVE_SERIES_ENABLED or not live_rows:
+        return 0
+    try:
+        return get_live_series().append(live_rows, now)
+    except Exception as e:
+        print(f"❌ Error recording live snapshots: {e}")
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="In-play snapshots of live matches")
+    parser.add_argument('command', choices=['info', 'show'])
+    parser.add_argument('event', nargs='?', help="Event to show: 'g<game id>' or 't<title>'")
+    parser.add_argument('--start', help='First day (YYYY-MM-DD)')
+    parser.add_argument('--end', help='Last day (YYYY-MM-DD)')
+    args = parser.parse_args()
+
+    store = get_live_series()
+    if args.command == 'info':
+        total, size = 0, 0
+        for chunk in store.chunks(args.start, args.end):
+            total += len(chunk)
+            size += sum(os.path.getsize(os.path.join(store.day_dir(chunk.day), f"{name}.bin")) for name in COLUMNS)
+            print(f"📈 {chunk.day}: {len(chunk)} snapshots of {len(chunk.events)} matches")
+        print(f"📦 {total} snapshots, {size / 1024:.1f} KiB in {store.root}")
+    elif not args.event:
+        parser.error('show needs an event')
+    else:
+        series = store.event_series(args.event, args.start, args.end)
+        if series.empty:
+            print(f"⏭️ No snapshots of {args.event}")
+        for row in series.itertuples(index=False):
+            print(f"{row.ts:%Y-%m-%d %H:%M} {row.phase or '?':>2} {row.minute:>3}' {row.home}-{row.away}")
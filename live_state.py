@@ -0,0 +1,235 @@
+"""Per-match live state carried across polls.
+
+Every live row is tracked by event (game id, or the title when the row has
+none) with its phase (H1, HT, H2, FT) and score. Each poll is diffed against
+the previous one. A row whose (phase, score) signature is unchanged is
+skipped after one CRC comparison. Changed rows produce transitions:
+
+    kickoff   first seen in H1
+    goal      the score went up
+    ht        H1 -> HT (or first seen at HT)
+    h2        HT -> H2 (or first seen in H2)
+    ft        finished: the clock says FT, or a match seen late in H2 on the
+              previous poll left the live list
+
+Only transitions are passed downstream (see utils.scrape_sb_live()), so the
+work per poll follows what changed rather than the size of the live list. The
+state is saved to LIVE_STATE_FILE so separate runs diff against each other.
+"""
+
+
+import os
+import re
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+
+from event_ids import parse_game_id
+from state_file import load_state, save_state
+
+
+LIVE_STATE_FILE = os.getenv('LIVE_STATE_FILE', 'live_state.json')
+# Matches not seen for this long are dropped (ids are reused on other days)
+LIVE_STATE_KEEP_HOURS = float(os.getenv('LIVE_STATE_KEEP_HOURS', '4'))
+# A second-half match that leaves the list counts as finished only if it was seen
+# this recently, at this minute or later; otherwise it may just have been skipped
+LEFT_H2_MAX_GAP_MINUTES = float(os.getenv('LEFT_H2_MAX_GAP_MINUTES', '20'))
+LEFT_H2_MIN_MINUTE = int(os.getenv('LEFT_H2_MIN_MINUTE', '85'))
+
+PHASES = ('H1', 'HT', 'H2', 'FT')
+# Transition emitted on entering each phase
+PHASE_TRANSITIONS = {'H1': 'kickoff', 'HT': 'ht', 'H2': 'h2', 'FT': 'ft'}
+
+_TIME_FORMAT = '%d-%m-%y %H:%M:%S'
+_CLOCK_MINUTE = re.compile(r'(\d{1,3}):\d{2}')
+
+
+def classify_clock(clock_text):
+    """
+    Classify a live clock label such as 'HT' or "H2 67:12"
+    Returns (is_halftime, is_first_half, is_second_half)
+    """
+    time_text = (clock_text or '').upper()
+    is_halftime = any(x in time_text for x in [
+                      'HT', 'HALF', 'HALFTIME', 'HALF-TIME'])
+    is_first_half = any(x in time_text for x in [
+                        'H1', '1ST', 'FIRST'])
+    is_second_half = any(x in time_text for x in [
+                         'H2', '2ND', 'SECOND'])
+    return is_halftime, is_first_half, is_second_half
+
+
+def match_phase(clock_text):
+    """Phase of a clock label: 'HT', 'H1', 'H2', 'FT', or '' when unknown (e.g. penalties)."""
+    is_halftime, is_first_half, is_second_half = classify_clock(clock_text)
+    if is_halftime:
+        return 'HT'
+    if is_first_half:
+        return 'H1'
+    if is_second_half:
+        return 'H2'
+    time_text = (clock_text or '').upper()
+    if any(x in time_text for x in ['FT', 'ENDED', 'FULL']):
+        return 'FT'
+    return ''
+
+
+def clock_minute(clock_text, phase=None):
+    """Match minute of a clock label such as 'H2 67:12' (45 at HT, 90 at FT, -1 when unknown)."""
+    found = _CLOCK_MINUTE.search(clock_text or '')
+    if found:
+        return int(found.group(1))
+    return {'HT': 45, 'FT': 90}.get(phase or match_phase(clock_text), -1)
+
+
+def _score(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def row_signature(phase, home_score, away_score):
+    """Stable hash of what a transition can depend on (the clock's seconds are left out)."""
+    return zlib.crc32(f"{phase}|{home_score}|{away_score}".encode('utf-8'))
+
+
+def event_id(row):
+    """Tracking key of a live row: its game id, or its title."""
+    game_id = parse_game_id(row.get('game-id'))
+    return f"g{game_id}" if game_id is not None else f"t{str(row.get('title') or '').strip()}"
+
+
+class LiveStateTracker:
+    """
+    {event: last phase/score} across polls, diffed into transitions
+    """
+
+    def __init__(self, path=None):
+        self.path = path or LIVE_STATE_FILE
+        state = load_state(self.path, {})
+        self.matches = dict(state.get('matches', {}))
+        self.counts = dict(state.get('counts', {}))
+        self.transitions = []
+        self.changed = 0
+
+    def __len__(self):
+        return len(self.matches)
+
+    def _transition(self, kind, entry, row, previous_phase):
+        return {
+            'kind': kind,
+            'event': entry['event'],
+            'title': entry['title'],
+            'game-id': entry['game-id'],
+            'home-team': entry['home-team'],
+            'away-team': entry['away-team'],
+            'from': previous_phase,
+            'to': entry['phase'],
+            'home_score': entry['home_score'],
+            'away_score': entry['away_score'],
+            'ht_score': entry.get('ht_score'),
+            'row': row,
+        }
+
+    def update(self, live_rows, now=None):
+        """
+        Diff a poll's live rows against the stored state
+
+        Args:
+            live_rows (list): Normalised rows (title, game-id, teams, clock, scores); None for a failed poll
+            now (datetime): Poll time (default: now)
+
+        Returns:
+            list: Transitions of this poll, in row order (also kept in self.transitions)
+        """
+        now = now or datetime.now()
+        stamp = now.strftime(_TIME_FORMAT)
+        transitions = []
+        seen = set()
+        phases = Counter()
+        self.changed = 0
+
+        for row in live_rows or []:
+            phase = match_phase(row.get('clock'))
+            if phase:
+                phases[phase] += 1
+            key = event_id(row)
+            seen.add(key)
+            home_score, away_score = _score(row.get('home_score')), _score(row.get('away_score'))
+            signature = row_signature(phase, home_score, away_score)
+            minute = clock_minute(row.get('clock'), phase)
+            entry = self.matches.get(key)
+            if entry is not None and entry['hash'] == signature:
+                entry['last_seen'], entry['minute'] = stamp, minute
+                continue
+            # Rows with an unknown phase (penalties, suspended) keep their last known state
+            if not phase or home_score is None or away_score is None:
+                if entry is not None:
+                    entry['last_seen'] = stamp
+                continue
+
+            self.changed += 1
+            previous = entry
+            entry = self.matches[key] = {
+                'event': key,
+                'title': row.get('title'),
+                'game-id': parse_game_id(row.get('game-id')),
+                'home-team': row.get('home-team'),
+                'away-team': row.get('away-team'),
+                'phase': phase,
+                'home_score': home_score,
+                'away_score': away_score,
+                'ht_score': previous.get('ht_score') if previous else None,
+                'hash': signature,
+                'minute': minute,
+                'first_seen': previous['first_seen'] if previous else stamp,
+                'last_seen': stamp,
+            }
+            if phase == 'HT' and entry['ht_score'] is None:
+                entry['ht_score'] = [home_score, away_score]
+
+            previous_phase = previous['phase'] if previous else None
+            if previous is not None and home_score + away_score > previous['home_score'] + previous['away_score']:
+                transitions.append(self._transition('goal', entry, row, previous_phase))
+            if phase != previous_phase and (previous_phase is None or
+                                            PHASES.index(phase) > PHASES.index(previous_phase)):
+                transitions.append(self._transition(PHASE_TRANSITIONS[phase], entry, row, previous_phase))
+            if phase == 'FT':
+                del self.matches[key]
+
+        # A match seen late in the second half on a recent poll that has left the list
+        # has finished. One seen long ago, or earlier in the half, may just be missing from
+        # this poll and is kept. An empty poll is treated as a failed fetch rather than
+        # every match ending at once
+        if seen:
+            recent = now - timedelta(minutes=LEFT_H2_MAX_GAP_MINUTES)
+            for key in [key for key, entry in self.matches.items()
+                        if key not in seen and entry['phase'] == 'H2'
+                        and entry.get('minute', -1) >= LEFT_H2_MIN_MINUTE
+                        and datetime.strptime(entry['last_seen'], _TIME_FORMAT) >= recent]:
+                entry = self.matches.pop(key)
+                previous_phase = entry['phase']
+                entry['phase'] = 'FT'
+                transitions.append(self._transition('ft', entry, None, previous_phase))
+
+        cutoff = now - timedelta(hours=LIVE_STATE_KEEP_HOURS)
+        self.matches = {key: entry for key, entry in self.matches.items()
+                        if datetime.strptime(entry['last_seen'], _TIME_FORMAT) >= cutoff}
+
+        self.counts = {phase: phases[phase] for phase in PHASES}
+        self.transitions = transitions
+        kinds = Counter(transition['kind'] for transition in transitions)
+        print(f"🔄 Live state: {len(live_rows or [])} rows, {self.changed} changed, {len(self.matches)} tracked"
+              + (f" - {', '.join(f'{count} {kind}' for kind, count in kinds.items())}" if kinds else ''))
+        return transitions
+
+    def rows_entering(self, phase):
+        """Live rows of this poll's transitions into phase (e.g. 'HT')."""
+        kind = PHASE_TRANSITIONS[phase]
+        return [transition['row'] for transition in self.transitions
+                if transition['kind'] == kind and transition['row'] is not None]
+
+    def save(self):
+        """Write the state atomically."""
+        return save_state(self.path, {'matches': self.matches, 'counts': self.counts})
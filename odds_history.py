@@ -0,0 +1,234 @@
+"""Every pre-match 1X2 price seen for a fixture, across the day's today scrapes.
+
+The today table keeps the first row scraped per fixture, so odds that moved
+between runs were lost. Each today scrape now also goes through
+OddsHistory.observe(). A fixture gets a new observation only when one of its
+prices changed, stored delta-encoded as a flat list of ints:
+
+    [minute0, home0, draw0, away0, dminute1, dhome1, ddraw1, daway1, ...]
+
+Minutes are epoch minutes, prices are in hundredths (1.85 -> 185), and a
+missing price is 0. The first observation is absolute and later ones are
+differences from the one before. A cumulative sum decodes the whole series.
+Observations at or after kickoff are ignored, so the last stored price is the
+closing price.
+
+    history = OddsHistory()
+    history.closing('17-10-26', 'Arsenal vs Chelsea', game_id=40321)
+    history.as_of('17-10-26', 'Arsenal vs Chelsea', datetime(2026, 10, 17, 12, 0))
+
+TodayIndex uses closing() to enrich alerts and scenario inputs with the
+latest pre-match price rather than the first one read.
+
+    python odds_history.py show "Arsenal vs Chelsea" --date 17-10-26
+"""
+
+
+import argparse
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from event_ids import parse_game_id
+from state_file import load_state, save_state
+from today_index import ODDS_COLUMNS, coerce_odds, normalize_title
+
+
+ODDS_HISTORY_FILE = os.getenv('ODDS_HISTORY_FILE', 'odds_history.json')
+ODDS_HISTORY_KEEP_DAYS = int(os.getenv('ODDS_HISTORY_KEEP_DAYS', '60'))
+
+_FIELDS = 4
+_DATE_FORMAT = '%d-%m-%y'
+
+
+def _minutes(when):
+    return int(when.timestamp() // 60)
+
+
+def _kickoff(date, time_text):
+    """Kickoff in epoch minutes from the today row's date and 'HH:MM', or None."""
+    try:
+        return _minutes(datetime.strptime(f"{str(date).strip()} {str(time_text).strip()}", f"{_DATE_FORMAT} %H:%M"))
+    except ValueError:
+        return None
+
+
+def _event(date, title, game_id=None):
+    """Key of a fixture: its date with the game id, or with the normalized title."""
+    game_id = parse_game_id(game_id)
+    date = str(date).strip()
+    return f"{date}|{game_id}" if game_id is not None else f"{date}|t{normalize_title(title)}"
+
+
+class OddsHistory:
+    """
+    {fixture: delta-encoded price changes} loaded from ODDS_HISTORY_FILE
+    """
+
+    def __init__(self, path=None):
+        self.path = path or ODDS_HISTORY_FILE
+        self.events = dict(load_state(self.path, {}).get('events', {}))
+        # (date, normalized title) -> key, for lookups without a game id
+        self.titles = {}
+        for key, entry in self.events.items():
+            self.titles.setdefault((entry['date'], normalize_title(entry['title'])), key)
+        self._decoded = {}
+
+    def __len__(self):
+        return len(self.events)
+
+    def _resolve(self, date, title, game_id=None):
+        key = _event(date, title, game_id)
+        if key in self.events:
+            return key
+        return self.titles.get((str(date).strip(), normalize_title(title)))
+
+    def series(self, date, title, game_id=None):
+        """
+        Decoded price changes of one fixture
+
+        Returns:
+            ndarray: int64 rows of (epoch minute, home, draw, away) in hundredths, empty if unknown
+        """
+        key = self._resolve(date, title, game_id)
+        if key is None:
+            return np.empty((0, _FIELDS), dtype=np.int64)
+        if key not in self._decoded:
+            deltas = np.asarray(self.events[key]['odds'], dtype=np.int64).reshape(-1, _FIELDS)
+            self._decoded[key] = np.cumsum(deltas, axis=0)
+        return self._decoded[key]
+
+    @staticmethod
+    def _prices(row):
+        return {column: (int(value) / 100 if value else np.nan) for column, value in zip(ODDS_COLUMNS, row[1:])}
+
+    def as_of(self, date, title, when, game_id=None):
+        """
+        Prices in force at a given time
+
+        Returns:
+            dict: ODDS_COLUMNS -> float (NaN where missing), or None if nothing was seen by then
+        """
+        series = self.series(date, title, game_id)
+        position = np.searchsorted(series[:, 0], _minutes(when), side='right') - 1
+        return self._prices(series[position]) if position >= 0 else None
+
+    def closing(self, date, title, game_id=None):
+        """
+        Last pre-match prices of a fixture
+
+        Returns:
+            dict: ODDS_COLUMNS -> float (NaN where missing), or None if the fixture was never seen
+        """
+        series = self.series(date, title, game_id)
+        return self._prices(series[-1]) if len(series) else None
+
+    def changes(self, date, title, game_id=None):
+        """Number of stored price changes after the first observation."""
+        return max(len(self.series(date, title, game_id)) - 1, 0)
+
+    def observe(self, matches, now=None):
+        """
+        Record the prices of one today scrape
+
+        Args:
+            matches (list): Today rows (date, time, title, game-id and the odds columns)
+            now (datetime): Scrape time (default: now)
+
+        Returns:
+            int: Number of fixtures whose prices were new or changed
+        """
+        now = now or datetime.now()
+        minute = _minutes(now)
+        odds = {column: coerce_odds([match.get(column) for match in matches]) for column in ODDS_COLUMNS}
+        changed = 0
+        for i, match in enumerate(matches):
+            prices = [0 if np.isnan(odds[column].iat[i]) else int(round(odds[column].iat[i] * 100))
+                      for column in ODDS_COLUMNS]
+            if not any(prices):
+                continue
+            date, title = str(match.get('date', '')).strip(), str(match.get('title', '')).strip()
+            kickoff = _kickoff(date, match.get('time'))
+            if kickoff is not None and minute >= kickoff:
+                continue
+
+            key = self._resolve(date, title, match.get('game-id'))
+            if key is None:
+                key = _event(date, title, match.get('game-id'))
+                self.events[key] = {'date': date, 'title': title, 'game-id': parse_game_id(match.get('game-id')),
+                                    'kickoff': kickoff, 'odds': [minute] + prices}
+                self.titles.setdefault((date, normalize_title(title)), key)
+            else:
+                last = self.series(date, title, match.get('game-id'))[-1]
+                if list(last[1:]) == prices:
+                    continue
+                entry = self.events[key]
+                entry['odds'].extend([minute - int(last[0])] + [price - int(previous)
+                                                                 for price, previous in zip(prices, last[1:])])
+                if kickoff is not None:
+                    entry['kickoff'] = kickoff
+                self._decoded.pop(key, None)
+            changed += 1
+        return changed
+
+    def save(self):
+        """Write the history atomically, dropping fixtures older than ODDS_HISTORY_KEEP_DAYS."""
+        cutoff = (datetime.now() - timedelta(days=ODDS_HISTORY_KEEP_DAYS)).date()
+
+        def recent(date_str):
+            try:
+                return datetime.strptime(date_str, _DATE_FORMAT).date() >= cutoff
+            except (TypeError, ValueError):
+                return False
+
+        self.events = {key: entry for key, entry in self.events.items() if recent(entry['date'])}
+        return save_state(self.path, {'events': self.events}, indent=None)
+
+
+def odds_history_version(path=None):
+    """Modification time of the history file, to tell when a cached index is stale (None if missing)."""
+    try:
+        return os.path.getmtime(path or ODDS_HISTORY_FILE)
+    except OSError:
+        return None
+
+
+def record_odds_history(matches, now=None):
+    """
+    Fold one today scrape into the odds history file
+
+    Returns:
+        int: Number of fixtures with new or moved prices, or None if error
+    """
+    if not matches:
+        return 0
+    try:
+        history = OddsHistory()
+        changed = history.observe(matches, now)
+        if changed:
+            history.save()
+        moved = sum(1 for match in matches if history.changes(match.get('date'), match.get('title'),
+                                                               match.get('game-id')))
+        print(f"📉 Odds history: {changed} fixtures with new or moved prices "
+              f"({moved} have moved since first seen) in {history.path}")
+        return changed
+    except Exception as e:
+        print(f"❌ Error recording odds history: {e}")
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pre-match odds history of today's fixtures")
+    parser.add_argument('command', choices=['show'])
+    parser.add_argument('title')
+    parser.add_argument('--date', default=datetime.now().strftime(_DATE_FORMAT), help='dd-mm-yy (default: today)')
+    parser.add_argument('--game-id')
+    args = parser.parse_args()
+
+    series = OddsHistory().series(args.date, args.title, args.game_id)
+    if not len(series):
+        print(f"⏭️ No odds seen for {args.title} on {args.date}")
+    for row in series:
+        prices = ' / '.join(f"{value / 100:.2f}" if value else '-' for value in row[1:])
+        print(f"{datetime.fromtimestamp(int(row[0]) * 60):%d-%m-%y %H:%M} {prices}")
@@ -2,8 +2,7 @@
 
 
 from datetime import datetime, timedelta
-import os
-from utils import scrape_sb_results, save_to_csv, update_alerts_with_final_scores, append_to_csv
+from utils import scrape_sb_results, save_records, update_alerts_with_final_scores, result_gaps
 
 # Get current date
 current_date = datetime.now()
@@ -16,14 +15,20 @@ previous_day_str = previous_day.strftime('%d/%m/%Y')
 print(f"Current date: {current_date_str}")
 print(f"Previous day: {previous_day_str}")
 
-# Scrape results from the previous day
-results = scrape_sb_results(previous_day_str)
+# Most scores were already captured on the live feed; only scrape the days
+# with alerts still missing one, and only as many pages as it takes
+gaps = result_gaps()
+if not gaps:
+    print("✅ Every alert up to yesterday has a final score - no results scrape needed")
 
-# Save to file
-csv_file = os.getenv('RESULT_LOG_FILE', 'results.csv')
-save_to_csv(results, csv_file)
+results = []
+for date_str, wanted in gaps.items():
+    print(f"Checking results for: {date_str} ({len(wanted)} alerts without a final score)")
+    results += scrape_sb_results(date_str, wanted)
 
-# Save to file
-# final_file = os.getenv('FINAL_LOG_FILE', 'final_db.csv')
+# Save to the results table
+if results:
+    save_records(results, 'results')
+
+# Merge the scores into final_db
 update_alerts_with_final_scores()
-# append_to_csv(final_db, final_file)
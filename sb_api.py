@@ -0,0 +1,246 @@
+"""Direct client for the SportyBet JSON feeds behind the live_list and today pages."""
+
+
+import os
+import threading
+import time
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Point SB_API_BASE at sb_stub_server.py to run against recorded payloads
+API_BASE = os.getenv('SB_API_BASE', 'https://www.sportybet.com')
+LIVE_FEED_PATH = '/api/ng/factsCenter/liveOrPrematchEvents'
+TODAY_FEED_PATH = '/api/ng/factsCenter/pcUpcomingEvents'
+
+FOOTBALL_SPORT_ID = 'sr:sport:1'
+# 1X2 market and its home/draw/away outcome ids
+MARKET_1X2 = '1'
+OUTCOME_IDS_1X2 = ('1', '2', '3')
+# bizCode returned by the feed on success
+FEED_OK = 10000
+
+REQUEST_TIMEOUT = float(os.getenv('SB_API_TIMEOUT', '10'))
+TODAY_PAGE_SIZE = 100
+TODAY_PAGE_LIMIT = 50
+
+
+class FeedError(Exception):
+    """Raised when a feed response cannot be turned into match data."""
+
+
+def _text(value):
+    return '' if value is None else str(value).strip()
+
+
+def _event_tournament(event, tournament=None):
+    """
+    Tournament label as rendered on the today page, e.g. 'England Premier League'
+    """
+    category = (event.get('sport') or {}).get('category') or {}
+    category_name = _text(category.get('name')) or _text((tournament or {}).get('categoryName'))
+    tournament_name = _text((category.get('tournament') or {}).get('name')) or _text((tournament or {}).get('name'))
+    return ' '.join(part for part in (category_name, tournament_name) if part) or "Unknown Tournament"
+
+
+def _event_odds_1x2(event):
+    """
+    Return the (home, draw, away) odds strings of the 1X2 market, '' when missing
+    """
+    for market in event.get('markets') or []:
+        if _text(market.get('id')) != MARKET_1X2:
+            continue
+        odds = {_text(outcome.get('id')): _text(outcome.get('odds'))
+                for outcome in market.get('outcomes') or []}
+        return tuple(odds.get(outcome_id, '') for outcome_id in OUTCOME_IDS_1X2)
+    return '', '', ''
+
+
+def _iter_events(data):
+    """
+    Yield (tournament, event) pairs from either feed layout:
+    a list of tournaments, or a dict with a 'tournaments' list
+    """
+    if isinstance(data, dict):
+        data = data.get('tournaments')
+    if not isinstance(data, list):
+        raise FeedError("Unexpected feed layout: no tournaments list")
+    for tournament in data:
+        for event in tournament.get('events') or []:
+            yield tournament, event
+
+
+def live_rows_from_payload(payload):
+    """
+    Convert a live feed payload to the normalised rows used by build_live_matches()
+
+    Args:
+        payload (dict): Decoded JSON from the live feed
+
+    Returns:
+        list: Dicts with title, game-id, home-team, away-team, clock, home_score, away_score
+    """
+    live_rows = []
+    for tournament, event in _iter_events(payload.get('data')):
+        home_team = _text(event.get('homeTeamName'))
+        away_team = _text(event.get('awayTeamName'))
+        home_score, away_score = None, None
+        score = _text(event.get('setScore'))
+        if ':' in score:
+            home_score, away_score = score.split(':', 1)
+
+        live_rows.append({
+            'title': f"{home_team} vs {away_team}",
+            # Same id as the today feed, so alerts can be joined on it
+            'game-id': _text(event.get('gameId')),
+            'home-team': home_team,
+            'away-team': away_team,
+            # Same shape as the rendered clock label, e.g. 'HT' or 'H2 67:12'
+            'clock': ' '.join(part for part in (
+                _text(event.get('matchStatus')), _text(event.get('playedSeconds'))) if part),
+            'home_score': home_score,
+            'away_score': away_score,
+        })
+    return live_rows
+
+
+def today_matches_from_payload(payload, current_date):
+    """
+    Convert an upcoming feed payload to the dicts returned by scrape_sb_today()
+
+    Args:
+        payload (dict): Decoded JSON from the upcoming feed
+        current_date (str): Date stamp in '%d-%m-%y' format
+
+    Returns:
+        list: Match dicts with date, time, title, tournament, game-id, teams and odds
+    """
+    matches = []
+    for tournament, event in _iter_events(payload.get('data')):
+        home_team = _text(event.get('homeTeamName'))
+        away_team = _text(event.get('awayTeamName'))
+        if not home_team or not away_team:
+            continue
+
+        time_text = ''
+        start_ms = event.get('estimateStartTime')
+        if start_ms:
+            time_text = datetime.fromtimestamp(int(start_ms) / 1000).strftime('%H:%M')
+
+        odds_home, odds_draw, odds_away = _event_odds_1x2(event)
+        matches.append({
+            'date': current_date,
+            'time': time_text,
+            'title': f"{home_team} vs {away_team}",
+            'tournament': _event_tournament(event, tournament),
+            'game-id': _text(event.get('gameId')),
+            'home-team': home_team,
+            'away-team': away_team,
+            'pre-match_odds_home': odds_home,
+            'pre-match_odds_draw': odds_draw,
+            'pre-match_odds_away': odds_away,
+        })
+    return matches
+
+
+class SportyBetClient:
+    """
+    Keep-alive HTTP client for the live and upcoming football feeds
+    """
+
+    def __init__(self, headers_provider=None, base_url=None, timeout=REQUEST_TIMEOUT):
+        self.headers_provider = headers_provider
+        self.base_url = (base_url or API_BASE).rstrip('/')
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.3,
+                        status_forcelist=[500, 502, 503, 504],
+                        allowed_methods=['GET'])
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retries)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _headers(self):
+        # Rotate browser headers per request but ask for JSON
+        headers = dict(self.headers_provider()) if self.headers_provider else {}
+        headers['Accept'] = 'application/json, text/plain, */*'
+        headers['Connection'] = 'keep-alive'
+        for navigation_header in ('Upgrade-Insecure-Requests', 'Sec-Fetch-User'):
+            headers.pop(navigation_header, None)
+        return headers
+
+    def get_json(self, path, params):
+        """
+        GET a feed endpoint and return the decoded payload
+        Raises FeedError on blocks, non-JSON bodies or a failed bizCode
+        """
+        params = dict(params, _t=int(time.time() * 1000))
+        try:
+            response = self.session.get(f"{self.base_url}{path}", params=params,
+                                        headers=self._headers(), timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            raise FeedError(f"Request to {path} failed: {e}") from e
+
+        if response.status_code in [403, 429]:
+            raise FeedError(f"Blocked: HTTP {response.status_code} from {path}")
+        if response.status_code != 200:
+            raise FeedError(f"HTTP {response.status_code} from {path}")
+
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise FeedError(f"Non-JSON response from {path}") from e
+
+        if not isinstance(payload, dict) or payload.get('bizCode') != FEED_OK:
+            message = payload.get('message') if isinstance(payload, dict) else payload
+            raise FeedError(f"Feed error from {path}: {message}")
+        return payload
+
+    def fetch_live_rows(self):
+        """Return normalised rows for every live football match."""
+        payload = self.get_json(LIVE_FEED_PATH, {'sportId': FOOTBALL_SPORT_ID})
+        return live_rows_from_payload(payload)
+
+    def fetch_today_matches(self, current_date):
+        """Return today's upcoming matches, following the feed's pagination."""
+        matches = []
+        for page_num in range(1, TODAY_PAGE_LIMIT + 1):
+            payload = self.get_json(TODAY_FEED_PATH, {
+                'sportId': FOOTBALL_SPORT_ID,
+                'marketId': MARKET_1X2,
+                'pageSize': TODAY_PAGE_SIZE,
+                'pageNum': page_num,
+                'todayGames': 'true',
+            })
+            page_matches = today_matches_from_payload(payload, current_date)
+            matches.extend(page_matches)
+
+            data = payload.get('data')
+            total = data.get('totalNum') if isinstance(data, dict) else None
+            if not page_matches or total is None or page_num * TODAY_PAGE_SIZE >= int(total):
+                break
+        else:
+            print("⚠️ Reached page limit")
+        return matches
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_feed_client(headers_provider=None):
+    """
+    Return the process-wide feed client so connections stay pooled between polls
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SportyBetClient(headers_provider)
+        return _client
@@ -0,0 +1,97 @@
+"""Local stand-in for the SportyBet feeds that serves recorded payloads.
+
+Run it and point the scrapers at it to work offline:
+
+    python sb_stub_server.py --port 8765
+    SB_API_BASE=http://127.0.0.1:8765 SB_FETCH_MODE=api python live.py
+"""
+
+
+import argparse
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from sb_api import LIVE_FEED_PATH, TODAY_FEED_PATH
+
+
+RECORDINGS_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'recordings')
+
+# Request path -> recorded payload file
+ROUTES = {
+    LIVE_FEED_PATH: 'live_feed.json',
+    TODAY_FEED_PATH: 'today_feed.json',
+}
+
+
+def make_handler(recordings_dir, fail_status=None):
+    """
+    Build a request handler serving recordings_dir
+    fail_status answers every request with that HTTP status to exercise fallbacks
+    """
+
+    class StubHandler(BaseHTTPRequestHandler):
+
+        def _send(self, status, body, content_type='application/json'):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if fail_status:
+                self._send(fail_status, b'{"bizCode": 19000, "message": "stub failure"}')
+                return
+
+            path = urlparse(self.path).path
+            filename = ROUTES.get(path)
+            if filename is None:
+                # Anything else in the recordings folder, e.g. /live_list.html
+                filename = os.path.basename(path)
+            file_path = os.path.join(recordings_dir, filename)
+            if not filename or not os.path.isfile(file_path):
+                self._send(404, b'{"bizCode": 404, "message": "no recording"}')
+                return
+
+            with open(file_path, 'rb') as f:
+                body = f.read()
+            content_type = 'text/html; charset=utf-8' if filename.endswith('.html') else 'application/json'
+            self._send(200, body, content_type)
+
+        def log_message(self, format, *args):
+            # Keep test output quiet
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(port=0, recordings_dir=RECORDINGS_DIR, fail_status=None):
+    """
+    Start the stub server in a background thread
+
+    Returns:
+        tuple: (server, base_url) - call server.shutdown() when done
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(recordings_dir, fail_status))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--recordings', default=RECORDINGS_DIR)
+    parser.add_argument('--fail-status', type=int, default=None,
+                        help='Answer every request with this HTTP status')
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(args.port, args.recordings, args.fail_status)
+    print(f"🧪 Serving {args.recordings} on {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,205 @@
+"""Alert scenarios loaded from scenarios.json and applied in one vectorised pass.
+
+Each scenario names the HT goal counts it fires on, optional min/max bounds on
+the pre-match odds and on the tournament's stats (matches, average goals and
+second-half conversion rate from final_db), on the second-half goal model's
+probability and tournament keyword lists to include or exclude:
+
+    {"name": "A", "label": "Scenario 🅰️ (0aHT + HDO)", "ht_goals": [0],
+     "draw_odds": {"min": 3.9}, "exclude_tournaments": ["women", "friendly"]}
+    {"name": "G", "ht_goals": [0], "tournament_matches": {"min": 30},
+     "tournament_conversion": {"min": 0.8}}
+    {"name": "M", "ht_goals": [0, 1], "model_probability": {"min": 0.85}}
+
+The file is compiled once into keyword regexes and bounds; tournament keyword
+checks run once per distinct tournament (and are remembered between polls)
+rather than once per row and scenario. get_scenarios() recompiles when the
+file's mtime changes, so a running daemon picks up edits on its next poll.
+
+    python scenarios.py            # validate scenarios.json and list the rules
+"""
+
+
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+SCENARIOS_FILE = os.getenv(
+    'SCENARIOS_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scenarios.json'))
+
+# Scenario bound key -> alerts-log column (the tournament_* ones are attached
+# from the tournament stats store, see tournament_stats.ATTACH_COLUMNS, and
+# model_probability by the second-half goal model, see ht_model.py)
+BOUND_COLUMNS = {
+    'home_odds': 'pre-match_odds_home',
+    'draw_odds': 'pre-match_odds_draw',
+    'away_odds': 'pre-match_odds_away',
+    'tournament_matches': 'tournament_matches',
+    'tournament_average': 'tournament_average',
+    'tournament_conversion': 'tournament_conversion',
+    'model_probability': 'model_probability',
+}
+
+
+def keyword_regex(keywords):
+    """Case-insensitive regex matching any of the keywords, or None for an empty list."""
+    keywords = [str(keyword).strip() for keyword in keywords or [] if str(keyword).strip()]
+    if not keywords:
+        return None
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+
+
+class ScenarioRule:
+    """
+    One compiled scenario: HT goal counts, odds bounds and tournament keyword filters
+    """
+
+    def __init__(self, config):
+        self.name = str(config['name'])
+        self.label = config.get('label', f"Scenario {self.name}")
+        self.ht_goals = [int(goals) for goals in config.get('ht_goals', [])]
+        # [(column, min, max)], None where a side is open
+        self.bounds = []
+        for key, column in BOUND_COLUMNS.items():
+            bound = config.get(key)
+            if bound:
+                self.bounds.append((column, bound.get('min'), bound.get('max')))
+        unknown = set(config) - {'name', 'label', 'ht_goals', 'include_tournaments',
+                                 'exclude_tournaments'} - set(BOUND_COLUMNS)
+        if unknown:
+            raise ValueError(f"Scenario {self.name}: unknown keys {', '.join(sorted(unknown))}")
+        self.include_keywords = list(config.get('include_tournaments') or [])
+        self.exclude_keywords = list(config.get('exclude_tournaments') or [])
+        self.include = keyword_regex(self.include_keywords)
+        self.exclude = keyword_regex(self.exclude_keywords)
+
+    def accepts_tournament(self, tournament):
+        if self.include is not None and not self.include.search(tournament):
+            return False
+        return self.exclude is None or not self.exclude.search(tournament)
+
+    def row_mask(self, df):
+        """Boolean array of the rows passing the HT goal and odds conditions."""
+        mask = np.ones(len(df), dtype=bool)
+        if self.ht_goals:
+            mask &= df['ht_goals'].isin(self.ht_goals).to_numpy()
+        for column, low, high in self.bounds:
+            values = df[column].to_numpy(dtype=float)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        return mask
+
+
+class ScenarioSet:
+    """
+    All compiled scenarios plus the global tournament exclusions
+    """
+
+    def __init__(self, config=None):
+        config = config or {}
+        self.exclude_keywords = list(config.get('exclude_tournaments') or [])
+        self.exclude = keyword_regex(self.exclude_keywords)
+        self.rules = [ScenarioRule(rule) for rule in config.get('scenarios', [])]
+        # tournament -> (passes global filter, passes rule 1, rule 2, ...)
+        self._tournaments = {}
+
+    def __len__(self):
+        return len(self.rules)
+
+    def tournament_flags(self, tournament):
+        flags = self._tournaments.get(tournament)
+        if flags is None:
+            allowed = self.exclude is None or not self.exclude.search(tournament)
+            flags = self._tournaments[tournament] = (allowed,) + tuple(
+                allowed and rule.accepts_tournament(tournament) for rule in self.rules)
+        return flags
+
+    def evaluate(self, df):
+        """
+        Rows of df meeting each scenario (needs ht_goals, tournament and the odds columns)
+
+        Returns:
+            list: (rule, DataFrame of its matching rows) in scenario order, empty ones left out
+        """
+        if df.empty or not self.rules:
+            return []
+        # Keyword checks per distinct tournament, broadcast back through the codes
+        codes, tournaments = pd.factorize(df['tournament'].fillna('').astype(str))
+        flags = np.array([self.tournament_flags(tournament) for tournament in tournaments], dtype=bool)
+        flags = flags.reshape(len(tournaments), len(self.rules) + 1)[codes]
+        hits = []
+        for i, rule in enumerate(self.rules):
+            mask = flags[:, i + 1] & rule.row_mask(df)
+            if mask.any():
+                hits.append((rule, df[mask]))
+        return hits
+
+    def excluded(self, df):
+        """Boolean array of rows whose tournament hits the global exclusions."""
+        if df.empty:
+            return np.zeros(0, dtype=bool)
+        codes, tournaments = pd.factorize(df['tournament'].fillna('').astype(str))
+        allowed = np.array([self.tournament_flags(tournament)[0] for tournament in tournaments], dtype=bool)
+        return ~allowed[codes]
+
+
+_scenarios = None
+_scenarios_mtime = None
+_scenarios_lock = threading.Lock()
+
+
+def load_scenarios(path=None):
+    """
+    Compile a scenarios file
+
+    Returns:
+        ScenarioSet
+
+    Raises:
+        OSError, ValueError: The file is missing or not a valid scenarios config
+    """
+    with open(path or SCENARIOS_FILE, encoding='utf-8') as f:
+        return ScenarioSet(json.load(f))
+
+
+def get_scenarios():
+    """
+    Process-wide ScenarioSet, recompiled when SCENARIOS_FILE changes on disk
+    A broken edit keeps the last good rules in force
+    """
+    global _scenarios, _scenarios_mtime
+    with _scenarios_lock:
+        try:
+            mtime = os.path.getmtime(SCENARIOS_FILE)
+        except OSError:
+            mtime = None
+        if _scenarios is not None and mtime == _scenarios_mtime:
+            return _scenarios
+        try:
+            scenarios = load_scenarios()
+            if _scenarios is not None:
+                print(f"🔄 Reloaded {len(scenarios)} scenarios from {SCENARIOS_FILE}")
+            _scenarios = scenarios
+        except Exception as e:
+            print(f"❌ Error loading scenarios from {SCENARIOS_FILE}: {e}")
+            if _scenarios is None:
+                _scenarios = ScenarioSet()
+        _scenarios_mtime = mtime
+        return _scenarios
+
+
+if __name__ == '__main__':
+    scenario_set = load_scenarios()
+    for scenario in scenario_set.rules:
+        bounds = ', '.join(f"{low if low is not None else '-inf'} <= {column} <= {high if high is not None else 'inf'}"
+                           for column, low, high in scenario.bounds)
+        print(f"✅ {scenario.label}: ht_goals in {scenario.ht_goals or 'any'}; {bounds or 'no odds bounds'}; "
+              f"include={scenario.include.pattern if scenario.include else '-'}; "
+              f"exclude={scenario.exclude.pattern if scenario.exclude else '-'}")
@@ -0,0 +1,43 @@
+"""Small JSON state files (checkpoints, watermarks, queues) written crash-safely."""
+
+
+import json
+import os
+
+
+def load_state(path, default=None):
+    """
+    Read a JSON state file
+
+    Returns:
+        The decoded state, or a copy of default if the file is missing or unreadable
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️ Ignoring unreadable state file {path}: {e}")
+    return json.loads(json.dumps(default)) if default is not None else None
+
+
+def save_state(path, state, indent=2):
+    """
+    Write state as JSON via a temp file + rename so a crash never leaves half a file
+    (indent=None writes it on one line, for files that are mostly long lists)
+
+    Returns:
+        bool: Success status
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=indent, separators=None if indent else (',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        print(f"❌ Error saving state file {path}: {e}")
+        return False
@@ -0,0 +1,536 @@
+"""Storage backends for the today, alerts, results, live_results and final_db
+tables, plus the tournament_stats view derived from final_db (see tournament_stats.py).
+
+ATOM_STORAGE selects the backend:
+    csv     (default) the flat files named by REMOTE_TODAY_FILE, ALERT_LOG_FILE,
+            RESULT_LOG_FILE, LIVE_RESULTS_FILE, FINAL_DB_FILE and TOURNAMENT_STATS_FILE
+    sqlite  one database (ATOM_DB_FILE) in WAL mode with indexes on
+            (date, title), (date, game-id) and (home-team, away-team)
+
+    python storage.py import            # load the CSV history into ATOM_DB_FILE
+    python storage.py export --out-dir notebooks/   # write the tables back to CSV
+"""
+
+
+import argparse
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+from keyed_csv import KEY_COLUMNS, append_new_rows, read_header, reindex_csv
+
+
+STORAGE_BACKEND = os.getenv('ATOM_STORAGE', 'csv').lower()
+SQLITE_DB_FILE = os.getenv('ATOM_DB_FILE', 'atom.db')
+
+_ALERT_COLUMNS = [
+    ('date', 'TEXT'), ('log_time', 'TEXT'), ('tournament', 'TEXT'), ('title', 'TEXT'), ('game-id', 'INTEGER'),
+    ('home-team', 'TEXT'), ('away-team', 'TEXT'),
+    ('pre-match_odds_home', 'REAL'), ('pre-match_odds_draw', 'REAL'), ('pre-match_odds_away', 'REAL'),
+    ('home_ht_goals', 'INTEGER'), ('away_ht_goals', 'INTEGER'), ('ht_goals', 'INTEGER'),
+]
+_FT_COLUMNS = [('home_ft_goals', 'INTEGER'), ('away_ft_goals', 'INTEGER'), ('ft_goals', 'INTEGER')]
+
+# table -> file env var/default, columns (name, SQLite type), unique key, event key
+# (unique where game-id is known), secondary indexes and the to_csv options the
+# file has always been written with
+TABLES = {
+    'today': {
+        'file_env': 'REMOTE_TODAY_FILE',
+        'default_file': 'today.csv',
+        'columns': [
+            ('date', 'TEXT'), ('time', 'TEXT'), ('title', 'TEXT'), ('tournament', 'TEXT'),
+            ('game-id', 'INTEGER'), ('home-team', 'TEXT'), ('away-team', 'TEXT'),
+            ('pre-match_odds_home', 'REAL'), ('pre-match_odds_draw', 'REAL'), ('pre-match_odds_away', 'REAL'),
+        ],
+        'key': ('date', 'title'),
+        'event_key': ('date', 'game-id'),
+        'indexes': [('home-team', 'away-team')],
+        'csv_kwargs': {},
+    },
+    'alerts': {
+        'file_env': 'ALERT_LOG_FILE',
+        'default_file': 'alerts_log.csv',
+        'columns': _ALERT_COLUMNS,
+        'key': ('date', 'title'),
+        'event_key': ('date', 'game-id'),
+        'indexes': [('home-team', 'away-team')],
+        'csv_kwargs': {'quoting': 0, 'escapechar': '\\'},
+    },
+    'results': {
+        'file_env': 'RESULT_LOG_FILE',
+        'default_file': 'results.csv',
+        'columns': [
+            ('date', 'TEXT'), ('tournament', 'TEXT'), ('game-id', 'INTEGER'),
+            ('home_team', 'TEXT'), ('away_team', 'TEXT'),
+        ] + _FT_COLUMNS,
+        'key': None,
+        'event_key': None,
+        'indexes': [('date', 'home_team', 'away_team'), ('date', 'game-id')],
+        'csv_kwargs': {},
+    },
+    'final_db': {
+        'file_env': 'FINAL_DB_FILE',
+        'default_file': 'final_db.csv',
+        'columns': _ALERT_COLUMNS + _FT_COLUMNS,
+        'key': ('date', 'title'),
+        'event_key': ('date', 'game-id'),
+        'indexes': [('home-team', 'away-team')],
+        'csv_kwargs': {},
+    },
+    # Full-time scores seen on the live feed for alerted events (see utils.capture_live_final_scores())
+    'live_results': {
+        'file_env': 'LIVE_RESULTS_FILE',
+        'default_file': 'live_results.csv',
+        'columns': [
+            ('date', 'TEXT'), ('captured_at', 'TEXT'), ('tournament', 'TEXT'), ('title', 'TEXT'),
+            ('game-id', 'INTEGER'), ('home_team', 'TEXT'), ('away_team', 'TEXT'),
+        ] + _FT_COLUMNS + [('capture', 'TEXT')],
+        'key': ('date', 'title'),
+        'event_key': ('date', 'game-id'),
+        'indexes': [],
+        'csv_kwargs': {},
+    },
+    # Running sums per tournament; the draw-odds bucket columns are added on first write
+    'tournament_stats': {
+        'file_env': 'TOURNAMENT_STATS_FILE',
+        'default_file': 'tournament_stats.csv',
+        'columns': [
+            ('tournament', 'TEXT'), ('matches', 'INTEGER'), ('ht_goals_sum', 'INTEGER'),
+            ('ft_goals_sum', 'INTEGER'), ('scored', 'INTEGER'), ('ht0_matches', 'INTEGER'),
+            ('ht0_scored', 'INTEGER'), ('ht1_matches', 'INTEGER'), ('ht1_scored', 'INTEGER'),
+        ],
+        'key': ('tournament',),
+        'event_key': None,
+        'indexes': [],
+        'csv_kwargs': {},
+    },
+}
+
+
+def table_path(table):
+    """CSV file of a table, from its env var."""
+    spec = TABLES[table]
+    return os.getenv(spec['file_env'], spec['default_file'])
+
+
+def _to_frame(data):
+    return data.copy() if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+
+def _filter(df, equals):
+    for column, value in equals.items():
+        df = df[df[column].astype(str).str.strip() == str(value).strip()]
+    return df
+
+
+class CsvStorage:
+    """
+    Tables as flat CSV files: reads scan the file, appends go through keyed_csv
+    """
+
+    name = 'csv'
+
+    def exists(self, table):
+        return os.path.exists(table_path(table))
+
+    def count(self, table):
+        """Number of stored rows (0 if the table doesn't exist)."""
+        path = table_path(table)
+        if not os.path.exists(path):
+            return 0
+        with open(path, 'rb') as f:
+            return max(sum(1 for _ in f) - 1, 0)
+
+    def read(self, table, columns=None, dtype=None, offset=0, **equals):
+        """
+        Rows of table as a DataFrame, or None if the table doesn't exist yet
+
+        Args:
+            table (str): 'today', 'alerts', 'results' or 'final_db'
+            columns (list): Columns to load (default: all)
+            dtype (dict): Column types by name, as for pd.read_csv
+            offset (int): Skip the first offset rows (in insertion order)
+            **equals: Column filters, e.g. date='07-09-25'
+        """
+        path = table_path(table)
+        if not os.path.exists(path):
+            return None
+        usecols = None if columns is None else list(dict.fromkeys(list(columns) + list(equals)))
+        skiprows = range(1, offset + 1) if offset else None
+        df = pd.read_csv(path, usecols=usecols, dtype=dtype, skiprows=skiprows, quoting=0, escapechar='\\')
+        df = _filter(df, equals)
+        return df[list(columns)] if columns is not None else df
+
+    def _widen(self, table, columns):
+        """
+        Rewrite the file once with the schema columns it predates (e.g. game-id),
+        so appends don't drop them
+        """
+        path = table_path(table)
+        header = read_header(path) if os.path.exists(path) else None
+        if not header:
+            return
+        schema = [name for name, _ in TABLES[table]['columns']]
+        missing = [col for col in columns if col in schema and col not in header]
+        if not missing:
+            return
+        df = self.read(table)
+        for column in missing:
+            df[column] = None
+        ordered = [col for col in schema if col in df.columns]
+        self.replace(table, df[ordered + [col for col in df.columns if col not in ordered]])
+        print(f"🧱 Added {', '.join(missing)} to {path}")
+
+    def append(self, table, data):
+        """
+        Add rows whose key isn't stored yet
+
+        Returns:
+            tuple: (DataFrame, int) - Rows added and number of duplicates skipped
+        """
+        spec = TABLES[table]
+        path = table_path(table)
+        if spec['key'] is not None and tuple(spec['key']) == KEY_COLUMNS:
+            data = _to_frame(data)
+            self._widen(table, data.columns)
+            return append_new_rows(data, path, **spec['csv_kwargs'])
+        new_df = _to_frame(data)
+        if spec['key'] is not None and not new_df.empty:
+            # Small tables keyed on other columns: dedupe against a scan of the key
+            key = list(spec['key'])
+            total = len(new_df)
+            new_df = new_df.drop_duplicates(subset=key, keep='first')
+            stored = self.read(table, columns=key)
+            if stored is not None:
+                seen = stored.astype(str).set_index(key).index
+                new_df = new_df[~new_df[key].astype(str).set_index(key).index.isin(seen)]
+            if not new_df.empty:
+                new_df.to_csv(path, mode='a', header=not os.path.exists(path), index=False,
+                              **spec['csv_kwargs'])
+            return new_df, total - len(new_df)
+        if not new_df.empty:
+            new_df.to_csv(path, mode='a', header=not os.path.exists(path), index=False, **spec['csv_kwargs'])
+        return new_df, 0
+
+    def upsert(self, table, data):
+        """
+        Insert rows, or update the stored row with the same key
+
+        Returns:
+            int: Number of rows written
+        """
+        spec = TABLES[table]
+        new_df = _to_frame(data)
+        if new_df.empty:
+            return 0
+        self._widen(table, new_df.columns)
+        existing = self.read(table)
+        if existing is None or spec['key'] is None:
+            return len(self.append(table, new_df)[0])
+
+        key = list(spec['key'])
+        new_df = new_df.drop_duplicates(subset=key, keep='last')
+        existing_keys = existing.set_index(key).index
+        new_keys = new_df.set_index(key).index
+        for column in new_df.columns:
+            if column not in existing.columns:
+                existing[column] = None
+            elif existing[column].dtype != new_df[column].dtype:
+                existing[column] = existing[column].astype(object)
+
+        # Update in place, then append the rows that weren't there
+        positions = existing_keys.get_indexer(new_keys)
+        found = positions >= 0
+        if found.any():
+            updates = new_df[found]
+            existing.loc[existing.index[positions[found]], list(updates.columns)] = updates.values
+        updated_df = pd.concat([existing, new_df[~found]], ignore_index=True)
+        self.replace(table, updated_df)
+        return len(new_df)
+
+    def replace(self, table, data):
+        """Overwrite the whole table with data."""
+        spec = TABLES[table]
+        path = table_path(table)
+        df = _to_frame(data)
+        df.to_csv(path, index=False, **spec['csv_kwargs'])
+        if spec['key'] is not None and tuple(spec['key']) == KEY_COLUMNS:
+            reindex_csv(path, df)
+        return len(df)
+
+    def version(self, table):
+        """Token that changes whenever the table may have changed."""
+        try:
+            stat = os.stat(table_path(table))
+            return stat.st_mtime, stat.st_size
+        except OSError:
+            return None
+
+
+def _names(columns):
+    return ', '.join(f'"{col}"' for col in columns)
+
+
+def _equals(columns):
+    return ' AND '.join(f'"{col}" = ?' for col in columns)
+
+
+class SqliteStorage:
+    """
+    Tables in one SQLite database, written in WAL mode
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, db_file=None):
+        self.db_file = db_file or SQLITE_DB_FILE
+        self.conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.lock = threading.Lock()
+        self.writes = 0
+        self.columns = {}
+        for table in TABLES:
+            self._create(table)
+
+    def _create(self, table):
+        spec = TABLES[table]
+        columns = ', '.join(f'"{name}" {kind}' for name, kind in spec['columns'])
+        with self.conn:
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+            # Databases created before a column joined the schema get it added
+            existing = {row[1] for row in self.conn.execute(f'PRAGMA table_info("{table}")')}
+            for name, kind in spec['columns']:
+                if name not in existing:
+                    self.conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{name}" {kind}')
+            if spec['key'] is not None:
+                key = ', '.join(f'"{col}"' for col in spec['key'])
+                self.conn.execute(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS "{table}_key" ON "{table}" ({key})')
+            if spec['event_key'] is not None:
+                event_key = ', '.join(f'"{col}"' for col in spec['event_key'])
+                self.conn.execute(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS "{table}_event_key" ON "{table}" ({event_key}) '
+                    f'WHERE "game-id" IS NOT NULL')
+            for index in spec['indexes']:
+                name = f"{table}_{'_'.join(index)}".replace('-', '_')
+                cols = ', '.join(f'"{col}"' for col in index)
+                self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({cols})')
+        self.columns[table] = [row[1] for row in self.conn.execute(f'PRAGMA table_info("{table}")')]
+
+    def _ensure_columns(self, table, columns):
+        """Add columns the table doesn't have yet (e.g. extra fields written by newer code)."""
+        for column in columns:
+            if column not in self.columns[table]:
+                self.conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{column}"')
+                self.columns[table].append(column)
+
+    @staticmethod
+    def _rows(df):
+        # NaN and '' are both stored as NULL, as they read back from CSV
+        df = df.astype(object).where(df.notna(), None).replace({'': None})
+        return [tuple(row) for row in df.itertuples(index=False, name=None)]
+
+    def exists(self, table):
+        return self.conn.execute(f'SELECT 1 FROM "{table}" LIMIT 1').fetchone() is not None
+
+    def count(self, table):
+        return self.conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+    def read(self, table, columns=None, dtype=None, offset=0, **equals):
+        """Same as CsvStorage.read(); column filters use the table's indexes."""
+        if not self.exists(table):
+            return None
+        select = '*' if columns is None else ', '.join(f'"{col}"' for col in columns)
+        where = ' AND '.join(f'"{col}" = ?' for col in equals)
+        sql = f'SELECT {select} FROM "{table}"' + (f' WHERE {where}' if where else '') + ' ORDER BY rowid'
+        params = [str(value).strip() for value in equals.values()]
+        if offset:
+            sql += ' LIMIT -1 OFFSET ?'
+            params.append(int(offset))
+        df = pd.read_sql_query(sql, self.conn, params=params)
+        if dtype:
+            df = df.astype({col: kind for col, kind in dtype.items() if col in df.columns})
+        return df
+
+    def append(self, table, data):
+        """Same as CsvStorage.append(); rows are inserted with INSERT OR IGNORE."""
+        new_df = _to_frame(data)
+        if new_df.empty:
+            return new_df, 0
+        columns = list(new_df.columns)
+        cols = ', '.join(f'"{col}"' for col in columns)
+        sql = f'INSERT OR IGNORE INTO "{table}" ({cols}) VALUES ({", ".join("?" * len(columns))})'
+        inserted = []
+        with self.lock, self.conn:
+            self._ensure_columns(table, columns)
+            for row in self._rows(new_df):
+                inserted.append(self.conn.execute(sql, row).rowcount == 1)
+            self.writes += 1
+        added = new_df[inserted]
+        return added, len(new_df) - len(added)
+
+    def upsert(self, table, data):
+        """Same as CsvStorage.upsert(), as one INSERT ... ON CONFLICT DO UPDATE per row."""
+        spec = TABLES[table]
+        new_df = _to_frame(data)
+        if new_df.empty:
+            return 0
+        if spec['key'] is None:
+            return len(self.append(table, new_df)[0])
+        columns = list(new_df.columns)
+        cols = ', '.join(f'"{col}"' for col in columns)
+        key = ', '.join(f'"{col}"' for col in spec['key'])
+        updates = ', '.join(f'"{col}" = excluded."{col}"' for col in columns if col not in spec['key'])
+        sql = (f'INSERT INTO "{table}" ({cols}) VALUES ({", ".join("?" * len(columns))}) '
+               f'ON CONFLICT ({key}) DO ' + (f'UPDATE SET {updates}' if updates else 'NOTHING'))
+        with self.lock, self.conn:
+            self._ensure_columns(table, columns)
+            for row in self._rows(new_df):
+                self.conn.execute(sql, self._claim_event(table, columns, row))
+            self.writes += 1
+        return len(new_df)
+
+    def _claim_event(self, table, columns, row):
+        """
+        Point an upserted row at the stored row of its (date, game-id) event
+
+        ON CONFLICT only covers the key, so a row whose game id is already stored under
+        another title would break the event index. It updates that stored row instead
+        (the same match, as CsvStorage.append() treats it). If its own key is stored too,
+        that row keeps its game id.
+        """
+        spec = TABLES[table]
+        if spec['event_key'] is None or not set(spec['event_key']) <= set(columns):
+            return row
+        event = [row[columns.index(col)] for col in spec['event_key']]
+        if any(value is None for value in event):
+            return row
+        holder = self.conn.execute(
+            f'SELECT {_names(spec["key"])} FROM "{table}" WHERE {_equals(spec["event_key"])}', event).fetchone()
+        key = tuple(row[columns.index(col)] for col in spec['key'])
+        if holder is None or tuple(holder) == key:
+            return row
+        row = list(row)
+        stored = self.conn.execute(
+            f'SELECT {_names(spec["event_key"])} FROM "{table}" WHERE {_equals(spec["key"])}', key).fetchone()
+        if stored is None:
+            for col, value in zip(spec['key'], holder):
+                row[columns.index(col)] = value
+        else:
+            for col, value in zip(spec['event_key'], stored):
+                row[columns.index(col)] = value
+        return tuple(row)
+
+    def replace(self, table, data):
+        """Same as CsvStorage.replace(), in a single transaction."""
+        df = _to_frame(data)
+        with self.lock, self.conn:
+            self.conn.execute(f'DELETE FROM "{table}"')
+            if not df.empty:
+                columns = list(df.columns)
+                self._ensure_columns(table, columns)
+                cols = ', '.join(f'"{col}"' for col in columns)
+                self.conn.executemany(
+                    f'INSERT OR IGNORE INTO "{table}" ({cols}) VALUES ({", ".join("?" * len(columns))})',
+                    self._rows(df))
+            self.writes += 1
+        return len(df)
+
+    def version(self, table):
+        """Changes on writes from this connection or any other process."""
+        return self.conn.execute('PRAGMA data_version').fetchone()[0], self.writes
+
+    def close(self):
+        self.conn.close()
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """
+    Return the process-wide storage backend selected by ATOM_STORAGE
+    """
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            if STORAGE_BACKEND == 'sqlite':
+                _storage = SqliteStorage()
+            elif STORAGE_BACKEND == 'csv':
+                _storage = CsvStorage()
+            else:
+                raise ValueError(f"Unknown ATOM_STORAGE backend: {STORAGE_BACKEND}")
+        return _storage
+
+
+def import_csv_history(db_file=None, tables=None):
+    """
+    One-shot load of the CSV files into the SQLite database
+    Rows already in the database are kept (first (date, title) wins, as in the CSVs)
+
+    Returns:
+        dict: {table: rows imported}
+    """
+    source = CsvStorage()
+    target = SqliteStorage(db_file)
+    imported = {}
+    for table in tables or TABLES:
+        df = source.read(table)
+        if df is None:
+            print(f"⏭️ {table_path(table)} not found, skipping {table}")
+            continue
+        before = target.conn.total_changes
+        if TABLES[table]['key'] is None:
+            target.replace(table, df)
+        else:
+            with target.conn:
+                target._ensure_columns(table, list(df.columns))
+                cols = ', '.join(f'"{col}"' for col in df.columns)
+                target.conn.executemany(
+                    f'INSERT OR IGNORE INTO "{table}" ({cols}) VALUES ({", ".join("?" * len(df.columns))})',
+                    target._rows(df))
+        imported[table] = target.conn.total_changes - before
+        print(f"📥 Imported {imported[table]} of {len(df)} rows from {table_path(table)} into {table}")
+    target.close()
+    return imported
+
+
+def export_csv(db_file=None, out_dir='.', tables=None):
+    """
+    Write the SQLite tables back to CSV files named like the originals
+
+    Returns:
+        dict: {table: path written}
+    """
+    source = SqliteStorage(db_file)
+    written = {}
+    for table in tables or TABLES:
+        df = source.read(table)
+        if df is None:
+            print(f"⏭️ {table} is empty, skipping")
+            continue
+        path = os.path.join(out_dir, os.path.basename(table_path(table)))
+        df.to_csv(path, index=False, **TABLES[table]['csv_kwargs'])
+        written[table] = path
+        print(f"📤 Exported {len(df)} rows from {table} to {path}")
+    source.close()
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Move the CSV history in and out of SQLite")
+    parser.add_argument('command', choices=['import', 'export'])
+    parser.add_argument('--db', default=None, help='SQLite file (default: ATOM_DB_FILE)')
+    parser.add_argument('--tables', nargs='+', choices=list(TABLES), default=None)
+    parser.add_argument('--out-dir', default='.', help='Export directory')
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        import_csv_history(args.db, args.tables)
+    else:
+        export_csv(args.db, args.out_dir, args.tables)
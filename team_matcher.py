@@ -0,0 +1,245 @@
+"""Fuzzy team-name matching for joins across the live, today and results pages.
+
+The pages don't always spell a team the same way ('Tuen Mun SA' / 'Tuen Mun',
+accents, 'II' / 'Reserves'). Names are canonicalised first; what still
+differs is resolved through a trigram inverted index over the candidate teams
+of one day, so a lookup only scores teams that share trigrams with the query.
+Accepted matches are kept in an alias file so later runs are exact hits.
+"""
+
+
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+
+from state_file import load_state, save_state
+
+
+# Dice similarity on trigrams needed to accept a fuzzy match
+MATCH_THRESHOLD = float(os.getenv('TEAM_MATCH_THRESHOLD', '0.6'))
+ALIAS_FILE = os.getenv('TEAM_ALIAS_FILE', 'team_aliases.json')
+
+# Club-form tokens that one page shows and another drops
+_NOISE_TOKENS = {
+    'fc', 'sc', 'sa', 'cf', 'ac', 'afc', 'fk', 'sk', 'cd', 'ud', 'sv', 'if', 'bk', 'ca', 'cs',
+    'club', 'football', 'futbol', 'calcio', 'de', 'the',
+}
+# Tokens that name a different side of the same club, kept in one spelling each
+_MARKER_TOKENS = {
+    'ii': 'reserves', 'res': 'reserves', 'reserve': 'reserves', 'r': 'reserves', 'b': 'reserves',
+    '2': 'reserves', 'jong': 'reserves',
+    'iii': 'thirds', 'c': 'thirds', '3': 'thirds',
+    'w': 'women', 'wfc': 'women', 'lfc': 'women', 'dff': 'women', 'ladies': 'women',
+    'fem': 'women', 'femina': 'women', 'femenino': 'women',
+    'youth': 'youth', 'juniors': 'youth', 'academy': 'youth', 'futures': 'youth',
+    'srl': 'srl',
+}
+# Markers too short to trust anywhere but at the end ('Rostov 2', 'Real Madrid C' - not 'R. Madrid')
+_TRAILING_MARKERS = {'r', 'b', 'c', 'w', '2', '3'}
+_MARKERS = set(_MARKER_TOKENS.values())
+_INITIALS_RE = re.compile(r"\b(?:[a-z]\.){2,}")
+_NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+_AGE_GROUP_RE = re.compile(r"^u\d{2}$")
+
+
+@lru_cache(maxsize=65536)
+def canonical_team(name):
+    """
+    Canonical spelling of a team name: no accents or punctuation, lower case,
+    club-form tokens dropped and reserve/women markers unified
+
+    'Tuen Mun SA' -> 'tuen mun', 'Atlético Madrid II' -> 'atletico madrid reserves',
+    'FC Rostov-2' -> 'rostov reserves', 'A.C. Milan' -> 'milan'
+    """
+    if name is None or name != name:  # None or NaN
+        return ''
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    # Dotted initials are one word: 'a.c. milan' -> 'ac milan'
+    text = _INITIALS_RE.sub(lambda match: match.group(0).replace('.', '') + ' ', text)
+    tokens = [token for token in _NON_WORD_RE.split(text) if token]
+    tokens = [token for token in tokens if token not in _NOISE_TOKENS] or tokens
+    last = len(tokens) - 1
+    return ' '.join(_MARKER_TOKENS.get(token, token)
+                    if token not in _TRAILING_MARKERS or i == last > 0 else token
+                    for i, token in enumerate(tokens))
+
+
+def team_markers(canonical):
+    """Tokens that make a different team, not a different spelling: reserves, women, U21..."""
+    return frozenset(token for token in canonical.split()
+                     if token in _MARKERS or _AGE_GROUP_RE.match(token))
+
+
+@lru_cache(maxsize=65536)
+def trigrams(text):
+    """Character trigrams of a canonical name, padded so short names still have some."""
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _dice(a, b):
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+
+def tokens_covered(canonical, other):
+    """
+    True if every word of the shorter name has a close word in the longer one, so
+    'inter' ~ 'inter milano' passes but 'atletico madrid' ~ 'real madrid' doesn't
+    """
+    short, long_ = sorted((canonical.split(), other.split()), key=len)
+    long_grams = [trigrams(token) for token in long_]
+    for token in short:
+        if token in long_:
+            continue
+        grams = trigrams(token)
+        if not any(_dice(grams, other_grams) >= 0.5 for other_grams in long_grams):
+            return False
+    return True
+
+
+class AliasCache:
+    """
+    Persistent canonical name -> canonical name map of accepted fuzzy matches
+    """
+
+    def __init__(self, path=None):
+        self.path = path or ALIAS_FILE
+        self.aliases = load_state(self.path, {})
+        self.dirty = False
+
+    def get(self, canonical):
+        return self.aliases.get(canonical)
+
+    def add(self, canonical, target):
+        if canonical != target and self.aliases.get(canonical) != target:
+            self.aliases[canonical] = target
+            self.dirty = True
+
+    def save(self):
+        if self.dirty and save_state(self.path, self.aliases):
+            self.dirty = False
+
+
+_alias_cache = None
+
+
+def get_alias_cache():
+    """Process-wide alias cache, loaded once."""
+    global _alias_cache
+    if _alias_cache is None:
+        _alias_cache = AliasCache()
+    return _alias_cache
+
+
+class TeamIndex:
+    """
+    Trigram inverted index over the candidate team names of one day
+    """
+
+    def __init__(self, names, aliases=None):
+        self.aliases = aliases if aliases is not None else get_alias_cache()
+        self.by_canonical = {}
+        self.grams = {}
+        self.markers = {}
+        self.postings = defaultdict(set)
+        for name in names:
+            canonical = canonical_team(name)
+            if not canonical or canonical in self.by_canonical:
+                continue
+            self.by_canonical[canonical] = name
+            self.grams[canonical] = trigrams(canonical)
+            self.markers[canonical] = team_markers(canonical)
+            for gram in self.grams[canonical]:
+                self.postings[gram].add(canonical)
+
+    def __len__(self):
+        return len(self.by_canonical)
+
+    def match(self, name, threshold=None, remember=True):
+        """
+        Best candidate for name; remember=False leaves accepting the alias to the caller
+
+        Returns:
+            tuple: (candidate name, score), or (None, best score) below the threshold
+        """
+        threshold = MATCH_THRESHOLD if threshold is None else threshold
+        canonical = canonical_team(name)
+        if canonical in self.by_canonical:
+            return self.by_canonical[canonical], 1.0
+        alias = self.aliases.get(canonical)
+        if alias in self.by_canonical:
+            return self.by_canonical[alias], 1.0
+
+        # Count shared trigrams over the postings only, then score those candidates
+        # (a first team never matches its reserves or women's side, and every word
+        # of the shorter name has to be there in some spelling)
+        query = trigrams(canonical)
+        markers = team_markers(canonical)
+        shared = defaultdict(int)
+        for gram in query:
+            for candidate in self.postings.get(gram, ()):
+                shared[candidate] += 1
+        scored = sorted(((2 * common / (len(query) + len(self.grams[candidate])), candidate)
+                         for candidate, common in shared.items()), reverse=True)
+        best = None
+        for score, candidate in scored:
+            if score < threshold:
+                break
+            if self.markers[candidate] == markers and tokens_covered(canonical, candidate):
+                best, best_score = candidate, score
+                break
+        if best is None:
+            return None, scored[0][0] if scored else 0.0
+        if remember:
+            self.aliases.add(canonical, best)
+        return self.by_canonical[best], best_score
+
+
+class FixtureMatcher:
+    """
+    Resolves a (home, away) pair against one day's fixtures, both teams fuzzy-matched
+    """
+
+    def __init__(self, fixtures, aliases=None):
+        """
+        Args:
+            fixtures (list): (home, away, value) tuples; value is returned on a match
+        """
+        self.fixtures = defaultdict(list)
+        homes, aways = [], []
+        for home, away, value in fixtures:
+            self.fixtures[(home, away)].append(value)
+            homes.append(home)
+            aways.append(away)
+        self.home_index = TeamIndex(homes, aliases)
+        self.away_index = TeamIndex(aways, aliases)
+
+    def match(self, home, away, threshold=None):
+        """
+        Returns:
+            The fixture's value, or None if either team misses or the pair is ambiguous
+        """
+        home_match, _ = self.home_index.match(home, threshold, remember=False)
+        if home_match is None:
+            return None
+        away_match, _ = self.away_index.match(away, threshold, remember=False)
+        if away_match is None:
+            return None
+        values = self.fixtures.get((home_match, away_match), [])
+        if len(values) != 1:
+            return None
+        # Both sides agree on one fixture: remember the spellings for next time
+        self.home_index.aliases.add(canonical_team(home), canonical_team(home_match))
+        self.away_index.aliases.add(canonical_team(away), canonical_team(away_match))
+        return values[0]
+
+
+def split_title(title):
+    """'Home vs Away' -> ('Home', 'Away'), or (None, None)."""
+    parts = str(title or '').split(' vs ')
+    if len(parts) != 2:
+        return None, None
+    return parts[0].strip(), parts[1].strip()
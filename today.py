@@ -1,17 +1,18 @@
 """Pull upcoming event data and analyse stats."""
 
 
-import os
-from utils import scrape_sb_today, save_to_csv, append_to_csv
+from utils import scrape_sb_today, append_records
+from odds_history import record_odds_history
 
 
 # Scrape fresh data
 matches_data = scrape_sb_today()
 
-# Save to csv file
-csv_file = os.getenv('REMOTE_TODAY_FILE', 'today.csv')
-# events_today = save_to_csv(matches_data, csv_file)
-events_today = append_to_csv(matches_data, csv_file)
+# Save to the today table
+events_today = append_records(matches_data, 'today')
+
+# The today table keeps the first odds seen per fixture; every price move goes to the odds history
+record_odds_history(matches_data)
 
 # Save watchlist events to separate csv file
 # watchlist_events = save_to_csv(matches_data, "watchlist_today.csv")
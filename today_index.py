@@ -0,0 +1,156 @@
+"""Hash-join index over today.csv for tournament, odds and game-id enrichment.
+
+Built once per run from the today table, keyed on the integer event key
+(date + game-id, see event_ids) and on (date, normalized title), so enriching
+live rows or backfilling the alerts log is one dict lookup per row instead of
+a scan of today.csv per match. Rows without a game id use the title key;
+titles that miss exactly (the live page spelling a team differently) fall back
+to a fuzzy fixture match over that day's teams (see team_matcher).
+
+Given an OddsHistory, the odds of each fixture are its closing prices, i.e.
+the last ones seen before kickoff, instead of the first scrape's.
+"""
+
+
+import pandas as pd
+
+from event_ids import GAME_ID_COLUMN, event_key, event_keys, game_ids
+from team_matcher import FixtureMatcher, split_title
+
+
+ODDS_COLUMNS = ['pre-match_odds_home', 'pre-match_odds_draw', 'pre-match_odds_away']
+ENRICH_COLUMNS = ['tournament'] + ODDS_COLUMNS
+# What a lookup returns: the enrichment plus the fixture's game id
+LOOKUP_COLUMNS = ENRICH_COLUMNS + [GAME_ID_COLUMN]
+
+
+def normalize_title(title):
+    """Title as used for matching: case-folded with whitespace collapsed."""
+    if title is None or (isinstance(title, float) and pd.isna(title)):
+        return ''
+    return ' '.join(str(title).split()).casefold()
+
+
+def coerce_odds(values):
+    """
+    Odds as floats, NaN where missing or not a number
+
+    Args:
+        values: Series or list of raw odds ('1.45', 1.45, '', None, '-')
+
+    Returns:
+        Series of float
+    """
+    return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype(float)
+
+
+def key_series(dates, titles):
+    """(date, normalized title) keys for two aligned columns, as a list of tuples."""
+    dates = pd.Series(dates, dtype=object).astype(str).str.strip()
+    titles = pd.Series(titles, dtype=object).map(normalize_title)
+    return list(zip(dates, titles))
+
+
+class TodayIndex:
+    """
+    {(date, normalized title): {'tournament', odds..., 'game-id'}} built from the today table,
+    plus {event key: (date, normalized title)}
+    The first row wins when a fixture was scraped more than once; with an odds_history
+    (see odds_history.py) its odds are replaced by the latest pre-match prices seen
+    """
+
+    def __init__(self, today_df=None, odds_history=None):
+        self.rows = {}
+        self.by_event = {}
+        # date -> [(home, away, key)], turned into a FixtureMatcher the first time a title misses
+        self.fixtures = {}
+        self.matchers = {}
+        self.fuzzy_hits = 0
+        self.odds_updated = 0
+        if today_df is None or today_df.empty:
+            return
+
+        df = today_df.reindex(columns=['date', 'title', 'home-team', 'away-team'] + LOOKUP_COLUMNS)
+        for col in ODDS_COLUMNS:
+            df[col] = coerce_odds(df[col]).values
+        df[GAME_ID_COLUMN] = pd.Series([None if pd.isna(game_id) else int(game_id)
+                                        for game_id in game_ids(df[GAME_ID_COLUMN])], index=df.index, dtype=object)
+        keys = key_series(df['date'], df['title'])
+        events = event_keys(df['date'], df[GAME_ID_COLUMN])
+        values = df[LOOKUP_COLUMNS].to_dict('records')
+        for key, event, value, home, away in zip(keys, events, values, df['home-team'], df['away-team']):
+            if key in self.rows:
+                continue
+            self.rows[key] = value
+            if not pd.isna(event):
+                self.by_event.setdefault(int(event), key)
+            if pd.isna(home) or pd.isna(away):
+                home, away = split_title(key[1])
+            if home and away:
+                self.fixtures.setdefault(key[0], []).append((home, away, key))
+        if odds_history is not None and len(odds_history):
+            self.apply_odds_history(odds_history)
+
+    def apply_odds_history(self, odds_history):
+        """Replace each fixture's odds with its closing prices from odds_history, where it has any."""
+        for (date, title), row in self.rows.items():
+            closing = odds_history.closing(date, title, row[GAME_ID_COLUMN])
+            closing = {col: value for col, value in (closing or {}).items() if not pd.isna(value)}
+            if any(value != row[col] for col, value in closing.items()):
+                self.odds_updated += 1
+                row.update(closing)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def lookup(self, date, title, game_id=None):
+        """Tournament, odds and game id for one fixture (by game id if given, else title), or None."""
+        event = event_key(date, game_id)
+        if event in self.by_event:
+            return self.rows[self.by_event[event]]
+        key = (str(date).strip(), normalize_title(title))
+        row = self.rows.get(key)
+        return row if row is not None else self.fuzzy_lookup(*key)
+
+    def fuzzy_lookup(self, date, title):
+        """Row of the one fixture on date whose teams fuzzy-match title's, or None."""
+        fixtures = self.fixtures.get(date)
+        home, away = split_title(title)
+        if not fixtures or not home or not away:
+            return None
+        matcher = self.matchers.get(date)
+        if matcher is None:
+            matcher = self.matchers[date] = FixtureMatcher(fixtures)
+        key = matcher.match(home, away)
+        if key is None:
+            return None
+        self.fuzzy_hits += 1
+        return self.rows[key]
+
+    def enrich(self, df):
+        """
+        Enrichment for every row of df (needs 'date' and 'title'; a 'game-id' column is used first)
+
+        Returns:
+            DataFrame: LOOKUP_COLUMNS aligned to df.index, NaN where there was no match
+            (by game id, title or fuzzy), plus a boolean 'matched' column
+        """
+        if GAME_ID_COLUMN in df.columns:
+            events = event_keys(df['date'], df[GAME_ID_COLUMN])
+        else:
+            events = pd.Series(pd.NA, index=df.index, dtype='Int64')
+        found = []
+        for key, event in zip(key_series(df['date'], df['title']), events):
+            row = self.rows.get(self.by_event.get(event)) if not pd.isna(event) else None
+            if row is None:
+                row = self.rows.get(key)
+            found.append(row if row is not None else self.fuzzy_lookup(*key))
+        out = pd.DataFrame([row or {} for row in found], index=df.index, columns=LOOKUP_COLUMNS)
+        out[GAME_ID_COLUMN] = out[GAME_ID_COLUMN].astype('Int64')
+        out['matched'] = [row is not None for row in found]
+        return out
+
+    def game_id(self, date, home, away):
+        """Game id of the fixture home vs away on date (exact title, then fuzzy), or None."""
+        row = self.lookup(date, f"{home} vs {away}")
+        return row[GAME_ID_COLUMN] if row is not None else None
@@ -0,0 +1,279 @@
+"""Per-tournament statistics kept up to date from final_db.
+
+The tournament_stats table holds running sums per tournament (matches, HT/FT
+goals, second-half goals after 0 and 1 HT goals, and the same counts per
+pre-match draw-odds bucket), so adding newly finalised rows only touches the
+tournaments they belong to. Means and conversion rates are derived from the
+sums when the table is loaded:
+
+    matches              finalised matches
+    mean_ht_goals        HT goals per match
+    mean_ft_goals        FT goals per match (the old "tournament average")
+    conversion           share of matches with a second-half goal
+    ht0_conversion       the same, for matches 0-0 at HT
+    ht1_conversion       the same, for matches with 1 HT goal
+    draw_<bucket>_conversion  the same, per draw-odds bucket
+
+    python tournament_stats.py rebuild             # recompute from final_db
+    python tournament_stats.py show "Finland Veikkausliiga"
+"""
+
+
+import argparse
+import threading
+
+import numpy as np
+import pandas as pd
+
+from storage import get_storage, table_path
+
+
+STATS_TABLE = 'tournament_stats'
+# Upper edges of the pre-match draw-odds buckets; the last bucket is open
+DRAW_BUCKET_EDGES = [3.0, 3.5, 4.0, 4.5, 5.0]
+DRAW_BUCKETS = (['lt_3.0'] + [f"{low}_{high}" for low, high in zip(DRAW_BUCKET_EDGES, DRAW_BUCKET_EDGES[1:])]
+                + [f"ge_{DRAW_BUCKET_EDGES[-1]}"])
+
+# (matches column, scored column) pairs turned into conversion rates
+_RATES = [('matches', 'scored', 'conversion'),
+          ('ht0_matches', 'ht0_scored', 'ht0_conversion'),
+          ('ht1_matches', 'ht1_scored', 'ht1_conversion')] + [
+    (f"draw_{bucket}_matches", f"draw_{bucket}_scored", f"draw_{bucket}_conversion") for bucket in DRAW_BUCKETS]
+SUM_COLUMNS = ['matches', 'ht_goals_sum', 'ft_goals_sum'] + [
+    column for matches, scored, _ in _RATES for column in (matches, scored) if column != 'matches']
+
+# Stats attached to alert rows: output column -> derived stat
+ATTACH_COLUMNS = {
+    'tournament_matches': 'matches',
+    'tournament_average': 'mean_ft_goals',
+    'tournament_ht_average': 'mean_ht_goals',
+    'tournament_conversion': 'conversion',
+}
+
+
+def _tournaments(values):
+    return pd.Series(values, dtype=object).fillna('').astype(str).str.strip()
+
+
+def row_sums(df):
+    """
+    Sum columns per tournament for finalised final_db rows
+
+    Rows without a tournament or without HT/FT goals are left out.
+
+    Returns:
+        DataFrame: One row per tournament with 'tournament' and SUM_COLUMNS
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=['tournament'] + SUM_COLUMNS)
+    tournament = _tournaments(df['tournament']).to_numpy()
+    ht = pd.to_numeric(df['ht_goals'], errors='coerce').to_numpy(dtype=float)
+    ft = pd.to_numeric(df['ft_goals'], errors='coerce').to_numpy(dtype=float)
+    keep = (tournament != '') & ~np.isnan(ht) & ~np.isnan(ft)
+    ht, ft = ht[keep], ft[keep]
+    scored = ft > ht
+    draw = pd.to_numeric(df['pre-match_odds_draw'], errors='coerce').to_numpy(dtype=float)[keep] \
+        if 'pre-match_odds_draw' in df.columns else np.full(len(ht), np.nan)
+    bucket = np.where(np.isnan(draw), -1, np.searchsorted(DRAW_BUCKET_EDGES, draw, side='right'))
+
+    columns = {
+        'tournament': tournament[keep],
+        'matches': 1,
+        'ht_goals_sum': ht,
+        'ft_goals_sum': ft,
+        'scored': scored,
+        'ht0_matches': ht == 0,
+        'ht0_scored': (ht == 0) & scored,
+        'ht1_matches': ht == 1,
+        'ht1_scored': (ht == 1) & scored,
+    }
+    for i, name in enumerate(DRAW_BUCKETS):
+        columns[f"draw_{name}_matches"] = bucket == i
+        columns[f"draw_{name}_scored"] = (bucket == i) & scored
+    sums = pd.DataFrame(columns).groupby('tournament', sort=False).sum()
+    return sums.astype('int64').reset_index()[['tournament'] + SUM_COLUMNS]
+
+
+def derive(sums):
+    """Means and conversion rates from a frame of SUM_COLUMNS, indexed by tournament."""
+    stats = sums.copy()
+    matches = stats['matches'].where(stats['matches'] > 0)
+    stats['mean_ht_goals'] = stats['ht_goals_sum'] / matches
+    stats['mean_ft_goals'] = stats['ft_goals_sum'] / matches
+    for total, scored, rate in _RATES:
+        stats[rate] = stats[scored] / stats[total].where(stats[total] > 0)
+    return stats
+
+
+class TournamentStats:
+    """
+    The tournament_stats table loaded for point lookups, reloaded when it changes on disk
+    """
+
+    def __init__(self, storage=None):
+        self.storage = storage or get_storage()
+        self._version = object()
+        self.table = derive(pd.DataFrame(columns=SUM_COLUMNS, dtype='int64'))
+        self._rows = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        self.refresh()
+        return len(self.table)
+
+    def refresh(self):
+        """Reload the table if it was written since the last load."""
+        with self.lock:
+            version = self.storage.version(STATS_TABLE)
+            if version == self._version:
+                return
+            df = self.storage.read(STATS_TABLE)
+            sums = pd.DataFrame(columns=['tournament'] + SUM_COLUMNS) if df is None else df
+            for column in SUM_COLUMNS:
+                if column not in sums.columns:
+                    sums[column] = 0
+            sums = sums.assign(tournament=_tournaments(sums['tournament']).values)
+            sums = sums.set_index('tournament')[SUM_COLUMNS].fillna(0).astype('int64')
+            self.table = derive(sums)
+            self._rows = {}
+            self._version = version
+
+    def get(self, tournament):
+        """
+        Stats of one tournament
+
+        Returns:
+            dict: Sums plus derived means and rates, or None for a tournament with no finalised rows
+        """
+        self.refresh()
+        tournament = str(tournament or '').strip()
+        if tournament not in self._rows:
+            if tournament not in self.table.index:
+                return None
+            self._rows[tournament] = self.table.loc[tournament].to_dict()
+        return self._rows[tournament]
+
+    def attach(self, df, columns=None):
+        """
+        Copy of df with the tournament stats as columns (NaN for unknown tournaments)
+
+        Args:
+            df (DataFrame): Rows with a 'tournament' column
+            columns (dict): Output column -> stat name (default: ATTACH_COLUMNS)
+        """
+        self.refresh()
+        df = df.copy()
+        tournaments = _tournaments(df['tournament']) if 'tournament' in df.columns \
+            else pd.Series('', index=df.index)
+        for column, stat in (columns or ATTACH_COLUMNS).items():
+            df[column] = tournaments.map(self.table[stat]).astype(float).values
+        return df
+
+    def add(self, rows, removed=None):
+        """
+        Fold newly finalised final_db rows into the stored sums
+        Only the tournaments the rows belong to are written
+
+        Args:
+            rows (DataFrame): Rows that got their FT score
+            removed (DataFrame): Rows whose previously counted score was replaced (subtracted)
+
+        Returns:
+            int: Number of tournaments updated
+        """
+        delta = row_sums(rows).set_index('tournament')
+        if removed is not None and not removed.empty:
+            delta = delta.sub(row_sums(removed).set_index('tournament'), fill_value=0)
+        if delta.empty:
+            return 0
+        self.refresh()
+        with self.lock:
+            current = self.table[SUM_COLUMNS].reindex(delta.index, fill_value=0)
+            updated = (current + delta).astype('int64').reset_index()
+            self.storage.upsert(STATS_TABLE, updated)
+            self._version = object()
+        return len(updated)
+
+    def rebuild(self, final_df=None):
+        """
+        Recompute the table from the whole of final_db
+
+        Returns:
+            int: Number of tournaments written
+        """
+        if final_df is None:
+            final_df = self.storage.read('final_db')
+        sums = row_sums(final_df)
+        with self.lock:
+            self.storage.replace(STATS_TABLE, sums)
+            self._version = object()
+        return len(sums)
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_tournament_stats():
+    """
+    Return the process-wide TournamentStats on the configured storage
+    """
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = TournamentStats()
+        return _stats
+
+
+def update_tournament_stats(finalised=None, rebuild=False, replaced=None):
+    """
+    Bring tournament_stats up to date after a final_db write
+
+    Args:
+        finalised (DataFrame): Rows that got their FT score in this write
+        replaced (DataFrame): Stored rows, as counted before, whose score this write replaced
+        rebuild (bool): Recompute from the whole of final_db instead (also done when the table is missing)
+
+    Returns:
+        int: Number of tournaments written, or None if error
+    """
+    try:
+        stats = get_tournament_stats()
+        if rebuild or not stats.storage.exists(STATS_TABLE):
+            written = stats.rebuild()
+            print(f"📊 Rebuilt stats for {written} tournaments in {table_path(STATS_TABLE)}")
+        else:
+            written = stats.add(finalised, replaced)
+            print(f"📊 Updated stats for {written} tournaments in {table_path(STATS_TABLE)}")
+        return written
+    except Exception as e:
+        print(f"❌ Error updating tournament stats: {e}")
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Per-tournament statistics from final_db")
+    parser.add_argument('command', choices=['rebuild', 'show'])
+    parser.add_argument('tournaments', nargs='*', help='Tournaments to show (default: the 20 largest)')
+    args = parser.parse_args()
+
+    if args.command == 'rebuild':
+        update_tournament_stats(rebuild=True)
+    else:
+        tournament_stats = get_tournament_stats()
+        if not tournament_stats.storage.exists(STATS_TABLE):
+            print(f"⏭️ No tournament stats in {table_path(STATS_TABLE)} - run: python tournament_stats.py rebuild")
+            raise SystemExit(1)
+        tournament_stats.refresh()
+        names = args.tournaments or list(tournament_stats.table['matches'].nlargest(20).index)
+        for name in names:
+            row = tournament_stats.get(name)
+            if row is None:
+                print(f"⏭️ {name}: no finalised matches")
+                continue
+            buckets = ', '.join(f"{bucket} {row[f'draw_{bucket}_conversion']:.0%}"
+                                for bucket in DRAW_BUCKETS if row[f'draw_{bucket}_matches'])
+            print(f"📊 {name}: {int(row['matches'])} matches, {row['mean_ht_goals']:.2f} HT / "
+                  f"{row['mean_ft_goals']:.2f} FT goals, conversion {row['conversion']:.0%} "
+                  f"(0 at HT {row['ht0_conversion']:.0%}, 1 at HT {row['ht1_conversion']:.0%}); "
+                  f"by draw odds: {buckets or '-'}")
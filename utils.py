@@ -3,6 +3,7 @@
 
 import requests
 from bs4 import BeautifulSoup
+import numpy as np
 import pandas as pd
 import time
 import re
@@ -13,14 +14,40 @@ from urllib.parse import urljoin
 import csv
 from datetime import datetime, timedelta
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException
+
+from driver_pool import pooled_driver
+from extractors import clean_page_source, parse_live_rows, parse_today_matches, parse_result_matches
+from js_extract import extract_live_rows_js, extract_today_matches_js, extract_result_matches_js
+from waits import (LIVE_ROWS_CSS, TODAY_ROWS_CSS, RESULT_ROWS_CSS, list_marker, politeness_delay,
+                   report_wait_stats, wait_for_elements, wait_for_list_change, wait_for_rows_stable)
+from sb_api import get_feed_client
+from keyed_csv import append_new_rows
+from state_file import load_state, save_state
+from storage import get_storage, table_path
+from today_index import LOOKUP_COLUMNS, ODDS_COLUMNS, TodayIndex, coerce_odds
+from event_ids import GAME_ID_COLUMN, event_keys, game_ids, parse_game_id
+from scenarios import get_scenarios
+from team_matcher import FixtureMatcher, get_alias_cache
+from alert_state import alert_key
+from live_state import classify_clock
+from live_series import record_live_snapshots
+from tournament_stats import get_tournament_stats, update_tournament_stats
+from odds_history import OddsHistory
+from ht_model import PROBABILITY_COLUMN, attach_model_probability
+
+
+# Where scrape_sb_live/scrape_sb_today get their data from:
+# 'auto' tries the JSON feeds and falls back to the browser,
+# 'api' and 'browser' force a single source
+SB_FETCH_MODE = os.getenv('SB_FETCH_MODE', 'auto').lower()
+# Page extractor: 'lxml' (compiled selectors) or 'bs4' (BeautifulSoup html.parser)
+SB_PARSER = os.getenv('SB_PARSER', 'lxml').lower()
+# 'html' ships page_source to Python, 'js' extracts rows in the browser (js_extract.py)
+SB_EXTRACT_MODE = os.getenv('SB_EXTRACT_MODE', 'html').lower()
 
 
 def get_random_headers():
@@ -48,11 +75,58 @@ def get_random_headers():
         }
 
 
-def scrape_sb_live():
+def scrape_sb_live(tracker=None):
     """
     Scrapes SportyBet live football matches and extracts halftime data
+    Tries the JSON live feed first and falls back to the browser (see SB_FETCH_MODE)
+
+    Args:
+        tracker (LiveStateTracker): Diff the poll against the previous one and only
+            return matches that have just reached HT (see live_state.py)
+
     Returns a list of dictionaries containing match data
     """
+    live_rows = fetch_sb_live_rows()
+    # Keep the minute and score of every live match for the in-play history
+    record_live_snapshots(live_rows)
+    if tracker is None:
+        return build_live_matches(live_rows or [])
+    tracker.update(live_rows)
+    return build_live_matches(tracker.rows_entering('HT'), phase_counts=tracker.counts)
+
+
+def fetch_sb_live_rows():
+    """
+    Normalised live rows from the JSON feed, or the browser as a fallback
+
+    Returns:
+        list: Rows as from extract_live_rows(), or None if the poll failed
+    """
+    if SB_FETCH_MODE != 'browser':
+        try:
+            return get_feed_client(get_random_headers).fetch_live_rows()
+        except Exception as e:
+            if SB_FETCH_MODE == 'api':
+                print(f"❌ Live feed failed: {e}")
+                return None
+            print(f"⚠️ Live feed failed, falling back to browser: {e}")
+
+    return fetch_sb_live_rows_browser()
+
+
+def scrape_sb_live_browser():
+    """
+    Scrapes the rendered SportyBet live_list page in a headless browser
+    Returns a list of dictionaries containing match data
+    """
+    return build_live_matches(fetch_sb_live_rows_browser() or [])
+
+
+def fetch_sb_live_rows_browser():
+    """
+    Normalised rows of the rendered SportyBet live_list page
+    Returns a list of rows (see extract_live_rows()), or None if the page couldn't be loaded
+    """
     url = "https://www.sportybet.com/ng/sport/football/live_list"
 
     # Headers to mimic a real browser
@@ -75,45 +149,31 @@ def scrape_sb_live():
     # print("🌐 Fetching data...")
 
     try:
-        # Set up headless Chrome
-        chrome_options = Options()
-        # Run without opening a browser window
-        chrome_options.add_argument("--headless")
-        # For stability in some environments
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument(
-            "--disable-dev-shm-usage")  # Avoid resource issues
-        chrome_options.add_argument("--disable-gpu")  # Additional stability
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-logging")  # Reduce log noise
-        chrome_options.add_argument("--log-level=3")  # Only fatal errors
-        # Reuse your user-agent for consistency
-        chrome_options.add_argument(f"user-agent={headers['User-Agent']}")
-
-        # Initialize driver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-
-        # print("🛠️ Initializing browser...")
-        driver.get(url)
-
-        # Random delay to mimic human behavior
-        time.sleep(random.uniform(1, 3))
-
-        # Wait for JS to load (adjust timeout if needed; 10 seconds should suffice for this site)
-        driver.implicitly_wait(10)
-
-        # print("✅ Page loaded with JS rendered")
-
-        # Get page source and clean it before parsing
-        page_source = driver.page_source
-
-        # Clean the page source to remove any problematic content
+        # Borrow a warm headless Chrome session from the shared pool
+        with pooled_driver(headers['User-Agent']) as session:
+            driver = session.driver
+
+            # print("🛠️ Initializing browser...")
+            started_at = time.monotonic()
+            session.get(url)
+
+            # Wait for the JS-rendered rows (politeness floor included)
+            wait_for_rows_stable(driver, LIVE_ROWS_CSS, 'live_list', started_at=started_at)
+            report_wait_stats()
+
+            # print("✅ Page loaded with JS rendered")
+
+            if SB_EXTRACT_MODE == 'js':
+                return extract_live_rows_js(driver)
+
+            # Get page source and clean it before parsing
+            page_source = driver.page_source
+
         # Remove any WebDriver-related paths that might be causing issues
-        page_source = re.sub(
-            r'/[^<>]*?\.wdm/[^<>]*?chromedriver[^<>]*?', '', page_source)
-        page_source = re.sub(
-            r'\[[^<>\[\]]*?chromedriver[^<>\[\]]*?\]', '', page_source)
+        page_source = clean_page_source(page_source)
+
+        if SB_PARSER == 'lxml':
+            return parse_live_rows(page_source)
 
         # Parse with explicit parser and error handling
         try:
@@ -131,166 +191,193 @@ def scrape_sb_live():
                     soup = BeautifulSoup(page_source, 'html5lib')
                 except Exception as e3:
                     print(f"❌ All parsers failed. html5lib error: {e3}")
-                    return []
-
-        # # Parse the fully rendered HTML
-        # soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-        # driver.quit()  # Clean up browser session
-
-        # Find all matches with the correct class structure
-        matches = soup.find_all(
-            'div', class_='m-table-row m-content-row match-row football-row')
-        # print(f"Found {len(matches)} ongoing events")
-
-        extracted_data = []
-        halftime_matches = 0
-        first_half_matches = 0
-        second_half_matches = 0
-        zero_goal_matches = 0
-        one_goal_matches = 0
-
-        # # Load watchlist CSV
-        # try:
-        #     watchlist_df = pd.read_csv('watchlist_today.csv')
-        #     watchlist_titles = set(watchlist_df['title'])  # Convert titles to a set for O(1) lookup
-        # except Exception as e:
-        #     print(f"⚠️ Could not load watchlist_today.csv: {e}")
-        #     watchlist_titles = set()
-
-        for match in matches:
-            try:
-                # Check if this is a halftime match
-                left_team_cell = match.find(
-                    class_='m-table-cell left-team-cell')
-                is_halftime = False
-                is_first_half = False
-                is_second_half = False
-
-                if left_team_cell:
-                    left_team_table = left_team_cell.find(
-                        class_='left-team-table')
-                    if left_team_table:
-                        game_id_elem = left_team_table.find(class_='game-id')
-                        if game_id_elem:
-                            time_text = game_id_elem.get_text(
-                                strip=True).upper()
-                            # print(f"Game ID text: {time_text}")  # Debug output
-                            is_halftime = any(x in time_text for x in [
-                                              'HT', 'HALF', 'HALFTIME', 'HALF-TIME'])
-                            is_first_half = any(x in time_text for x in [
-                                                'H1', '1ST', 'FIRST'])
-                            is_second_half = any(x in time_text for x in [
-                                                 'H2', '2ND', 'SECOND'])
-
-                # Skip if not a halftime, first half, or second half match
-                if not (is_halftime or is_first_half or is_second_half):
-                    continue
-
-                # Update counters
-                if is_halftime:
-                    halftime_matches += 1
-                if is_first_half:
-                    first_half_matches = first_half_matches + \
-                        1 if 'first_half_matches' in locals() else 1
-                if is_second_half:
-                    second_half_matches = second_half_matches + \
-                        1 if 'second_half_matches' in locals() else 1
-
-                # Find teams container
-                teams_container = match.find(class_='teams')
-                if not teams_container:
-                    continue
+                    return None
+
+        return extract_live_rows(soup)
+
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Error fetching data: {e}")
+        return None
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        return None
+
 
+def extract_live_rows(soup):
+    """
+    Extract one normalised row per match from a parsed live_list page
+    Rows hold title, home-team, away-team, clock, home_score and away_score
+    (None when the cell is missing) so every data source feeds build_live_matches()
+    """
+    # Find all matches with the correct class structure
+    matches = soup.find_all(
+        'div', class_='m-table-row m-content-row match-row football-row')
+    # print(f"Found {len(matches)} ongoing events")
+
+    live_rows = []
+    for match in matches:
+        try:
+            row = {
+                'title': None,
+                'home-team': None,
+                'away-team': None,
+                'clock': '',
+                'home_score': None,
+                'away_score': None,
+            }
+
+            left_team_cell = match.find(
+                class_='m-table-cell left-team-cell')
+            if left_team_cell:
+                left_team_table = left_team_cell.find(
+                    class_='left-team-table')
+                if left_team_table:
+                    game_id_elem = left_team_table.find(class_='game-id')
+                    if game_id_elem:
+                        row['clock'] = game_id_elem.get_text(strip=True)
+
+            # Find teams container
+            teams_container = match.find(class_='teams')
+            if teams_container:
                 # Extract team names
                 home_team_elem = teams_container.find(class_='home-team')
                 away_team_elem = teams_container.find(class_='away-team')
 
-                if not home_team_elem or not away_team_elem:
-                    continue
+                if home_team_elem and away_team_elem:
+                    row['home-team'] = home_team_elem.get_text(strip=True)
+                    row['away-team'] = away_team_elem.get_text(strip=True)
 
-                home_team = home_team_elem.get_text(strip=True)
-                away_team = away_team_elem.get_text(strip=True)
+                    # Extract title from teams container
+                    row['title'] = teams_container.get(
+                        'title', f"{row['home-team']} vs {row['away-team']}")
 
-                # Extract title from teams container
-                title = teams_container.get(
-                    'title', f"{home_team} vs {away_team}")
+            # Find score container and score items
+            score_container = match.find(class_='score')
+            if score_container:
+                score_items = score_container.find_all(class_='score-item')
+                if len(score_items) >= 2:
+                    row['home_score'] = score_items[0].get_text(strip=True)
+                    row['away_score'] = score_items[1].get_text(strip=True)
 
-                # Find score container
-                score_container = match.find(class_='score')
-                if not score_container:
-                    continue
+            live_rows.append(row)
 
-                # Find score items
-                score_items = score_container.find_all(class_='score-item')
-                if len(score_items) < 2:
-                    continue
+        except Exception as e:
+            print(f"⚠️ Error processing match: {e}")
+            continue
 
-                # Extract scores and convert to integers
-                try:
-                    home_score = int(score_items[0].get_text(strip=True))
-                    away_score = int(score_items[1].get_text(strip=True))
-                    total_goals = home_score + away_score
-                except (ValueError, IndexError):
-                    continue
-
-                # Matches with 0 total goals at HT
-                if total_goals == 0 and is_halftime:
-                    match_data = {
-                        'title': title,
-                        'home-team': home_team,
-                        'away-team': away_team,
-                        'home_ht_goals': home_score,
-                        'away_ht_goals': away_score,
-                        'ht_goals': total_goals
-                    }
-                    extracted_data.append(match_data)
+    return live_rows
+
+
+def build_live_matches(live_rows, phase_counts=None):
+    """
+    Apply the halftime filters to normalised live rows and print the poll summary
+
+    Args:
+        live_rows (list): Rows from extract_live_rows() or the live feed client
+        phase_counts (dict): HT/H1/H2 counts of the whole poll, when live_rows is only
+            the part of it that changed (see LiveStateTracker)
+
+    Returns:
+        list: Halftime matches with 0 or 1 goals, as returned by scrape_sb_live()
+    """
+    extracted_data = []
+    halftime_matches = 0
+    first_half_matches = 0
+    second_half_matches = 0
+    zero_goal_matches = 0
+    one_goal_matches = 0
+
+    for row in live_rows:
+        try:
+            is_halftime, is_first_half, is_second_half = classify_clock(
+                row.get('clock'))
+
+            # Skip if not a halftime, first half, or second half match
+            if not (is_halftime or is_first_half or is_second_half):
+                continue
+
+            # Update counters
+            if is_halftime:
+                halftime_matches += 1
+            if is_first_half:
+                first_half_matches += 1
+            if is_second_half:
+                second_half_matches += 1
+
+            if not row.get('home-team') or not row.get('away-team'):
+                continue
+
+            # Extract scores and convert to integers
+            try:
+                home_score = int(row['home_score'])
+                away_score = int(row['away_score'])
+                total_goals = home_score + away_score
+            except (ValueError, TypeError, KeyError):
+                continue
+
+            # Matches with 0 or 1 total goals at HT
+            if is_halftime and total_goals in (0, 1):
+                match_data = {
+                    'title': row['title'],
+                    'game-id': row.get('game-id'),
+                    'home-team': row['home-team'],
+                    'away-team': row['away-team'],
+                    'home_ht_goals': home_score,
+                    'away_ht_goals': away_score,
+                    'ht_goals': total_goals
+                }
+                extracted_data.append(match_data)
+                if total_goals == 0:
                     zero_goal_matches += 1
                     # print(f"| 👀 0aHT: {home_team} vs {away_team} |")
-                    # # Check if in watchlist
-                    # if title in watchlist_titles:
-                    #     print(f"👀⭐ Watchlist event: {home_team} vs {away_team}")
-                    # else:
-                    #     print(f"👀 0-goal HT event: {home_team} vs {away_team}")
-
-                # Matches with 1 total goals at HT
-                if total_goals == 1 and is_halftime:
-                    new_match_data = {
-                        'title': title,
-                        'home-team': home_team,
-                        'away-team': away_team,
-                        'home_ht_goals': home_score,
-                        'away_ht_goals': away_score,
-                        'ht_goals': total_goals
-                    }
-                    extracted_data.append(new_match_data)
+                else:
                     one_goal_matches += 1
                     # print(f"| 💡 1aHT: {home_team} vs {away_team} |")
 
-            except Exception as e:
-                print(f"⚠️ Error processing match: {e}")
-                continue
+        except Exception as e:
+            print(f"⚠️ Error processing match: {e}")
+            continue
 
-        # print(f"\n📊 Summary:")
-        # print(f"   - Total events found: {len(matches)}")
-        print(
-            f"   - HT: {halftime_matches}, H1: {first_half_matches}, H2: {second_half_matches}")
-        print(f"   - 0aHT: {zero_goal_matches}")
-        print(f"   - 1aHT: {one_goal_matches}")
+    if phase_counts is not None:
+        halftime_matches = phase_counts.get('HT', 0)
+        first_half_matches = phase_counts.get('H1', 0)
+        second_half_matches = phase_counts.get('H2', 0)
 
-        return extracted_data
+    # print(f"\n📊 Summary:")
+    # print(f"   - Total events found: {len(live_rows)}")
+    print(
+        f"   - HT: {halftime_matches}, H1: {first_half_matches}, H2: {second_half_matches}")
+    print(f"   - 0aHT: {zero_goal_matches}")
+    print(f"   - 1aHT: {one_goal_matches}")
 
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error fetching data: {e}")
-        return []
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        return []
+    return extracted_data
 
 
 def scrape_sb_today():
     """
     Scrapes SportyBet today's football matches and extracts match data
+    Tries the JSON upcoming feed first and falls back to the browser (see SB_FETCH_MODE)
+    Returns a list of dictionaries containing match data
+    """
+    if SB_FETCH_MODE != 'browser':
+        try:
+            current_date = datetime.now().strftime('%d-%m-%y')
+            all_extracted_data = get_feed_client(
+                get_random_headers).fetch_today_matches(current_date)
+            summarise_today_matches(all_extracted_data)
+            return all_extracted_data
+        except Exception as e:
+            if SB_FETCH_MODE == 'api':
+                print(f"❌ Upcoming feed failed: {e}")
+                return []
+            print(f"⚠️ Upcoming feed failed, falling back to browser: {e}")
+
+    return scrape_sb_today_browser()
+
+
+def scrape_sb_today_browser():
+    """
+    Scrapes the rendered SportyBet today page in a headless browser
     Returns a list of dictionaries containing match data
     """
     url = "https://www.sportybet.com/ng/sport/football/today"
@@ -314,197 +401,52 @@ def scrape_sb_today():
     #     return []
 
     try:
-        # Set up headless Chrome
-        chrome_options = Options()
-        # Run without opening a browser window
-        chrome_options.add_argument("--headless")
-        # For stability in some environments
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument(
-            "--disable-dev-shm-usage")  # Avoid resource issues
-        chrome_options.add_argument("--disable-gpu")  # Additional stability
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-logging")  # Reduce log noise
-        chrome_options.add_argument("--log-level=3")  # Only fatal errors
-        # Reuse your user-agent for consistency
-        chrome_options.add_argument(f"user-agent={headers['User-Agent']}")
-
-        # Initialize driver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-
-        driver.get(url)
-
-        # time.sleep(random.uniform(1, 3))  # Random delay to mimic human behavior
-
-        # Wait for JS to load (adjust timeout if needed; 10 seconds should suffice for this site)
-        driver.implicitly_wait(10)
-
-        page_count = 0
-        all_extracted_data = []
-
-        while True:
-            page_count += 1
-            # print(f"📄 Processing page {page_count}...")
-            time.sleep(random.uniform(1, 3))
+        # Borrow a warm headless Chrome session from the shared pool
+        with pooled_driver(headers['User-Agent']) as session:
+            driver = session.driver
 
-            # Get page source and clean it before parsing
-            page_source = driver.page_source
+            started_at = time.monotonic()
+            session.get(url)
 
-            # Clean the page source to remove any problematic content
-            # Remove any WebDriver-related paths that might be causing issues
-            page_source = re.sub(
-                r'/[^<>]*?\.wdm/[^<>]*?chromedriver[^<>]*?', '', page_source)
-            page_source = re.sub(
-                r'\[[^<>\[\]]*?chromedriver[^<>\[\]]*?\]', '', page_source)
+            # Wait for the JS-rendered rows (politeness floor included)
+            wait_for_rows_stable(driver, TODAY_ROWS_CSS, 'today', started_at=started_at)
 
-            # Parse with explicit parser and error handling
-            try:
-                # Try html.parser first (most robust)
-                soup = BeautifulSoup(page_source, 'html.parser')
-            except Exception as e1:
-                print(f"⚠️ Parser failed on page {page_count + 1}: {e1}")
-                break
+            page_count = 0
+            all_extracted_data = []
 
-            # Find all matches with the correct class structure
-            matches = soup.find_all(
-                'div', class_='m-table-row m-content-row match-row')
+            while True:
+                page_count += 1
+                # print(f"📄 Processing page {page_count}...")
 
-            for match in matches:
+                # Extract rows in the browser, or parse the cleaned page source
                 try:
-                    # Extract tournament name from parent match-league
-                    tournament = "Unknown Tournament"
-                    time_text = ""
-                    game_id_text = ""
-                    game_id_match = None
-
-                    match_league = match.find_parent(
-                        'div', class_='match-league')
-                    if match_league:
-                        league_title = match_league.find(
-                            'div', class_='league-title')
-                        if league_title:
-                            text_span = league_title.find(
-                                'span', class_='text')
-                            if text_span:
-                                tournament = text_span.get_text(strip=True)
-
-                    left_team_cell = match.find(
-                        class_='m-table-cell left-team-cell')
-
-                    if left_team_cell:
-                        left_team_table = left_team_cell.find(
-                            class_='left-team-table')
-                        if left_team_table:
-                            game_id_elem = left_team_table.find(
-                                class_='game-id')
-                            if game_id_elem:
-                                game_id_text = game_id_elem.get_text(
-                                    strip=True)
-                                # Extract 5-digit number using regex
-                                game_id_match = re.search(
-                                    r'\b\d{5}\b', game_id_text)
-                                # if game_id_match:
-                                #     match_data['game_id'] = game_id_match.group()
-                                # else:
-                                #     match_data['game_id'] = game_id_text  # Fallback to full text if no 5-digit found
-
-                            # Extract time
-                            time_elem = left_team_table.find(
-                                class_='clock-time')
-                            if time_elem:
-                                time_text = time_elem.get_text(strip=True)
-
-                    # Find teams container
-                    teams_container = match.find(class_='teams')
-                    if not teams_container:
-                        continue
-
-                    # Extract team names
-                    home_team_elem = teams_container.find(class_='home-team')
-                    away_team_elem = teams_container.find(class_='away-team')
-
-                    if not home_team_elem or not away_team_elem:
-                        continue
+                    if SB_EXTRACT_MODE == 'js':
+                        page_matches = extract_today_matches_js(driver, current_date)
+                    elif SB_PARSER == 'lxml':
+                        page_source = clean_page_source(driver.page_source)
+                        page_matches = parse_today_matches(page_source, current_date)
+                    else:
+                        page_source = clean_page_source(driver.page_source)
+                        soup = BeautifulSoup(page_source, 'html.parser')
+                        page_matches = extract_today_matches(soup, current_date)
+                except Exception as e1:
+                    print(f"⚠️ Parser failed on page {page_count + 1}: {e1}")
+                    break
+                all_extracted_data.extend(page_matches)
 
-                    home_team = home_team_elem.get_text(strip=True)
-                    away_team = away_team_elem.get_text(strip=True)
+                # print(f"Found {len(matches)} matches on page {page_count}")
 
-                    # Extract title from teams container
-                    title = teams_container.get(
-                        'title', f"{home_team} vs {away_team}")
-
-                    # Extract odds
-                    pre_match_odds_home = ""
-                    pre_match_odds_draw = ""
-                    pre_match_odds_away = ""
-
-                    market_cell = match.find(
-                        'div', class_='m-table-cell market-cell two-markets')
-                    if market_cell:
-                        m_market = market_cell.find(
-                            'div', class_='m-market market')
-                        if m_market:
-                            outcomes = m_market.find_all(
-                                'div', class_='m-outcome')
-                            if len(outcomes) >= 3:
-                                # Extract odds from each outcome
-                                home_odds = outcomes[0].find(
-                                    'span', class_='m-outcome-odds')
-                                draw_odds = outcomes[1].find(
-                                    'span', class_='m-outcome-odds')
-                                away_odds = outcomes[2].find(
-                                    'span', class_='m-outcome-odds')
-
-                                pre_match_odds_home = home_odds.get_text(
-                                    strip=True) if home_odds else ""
-                                pre_match_odds_draw = draw_odds.get_text(
-                                    strip=True) if draw_odds else ""
-                                pre_match_odds_away = away_odds.get_text(
-                                    strip=True) if away_odds else ""
-
-                    match_data = {
-                        'date': current_date,
-                        'time': time_text,
-                        'title': title,
-                        'tournament': tournament,
-                        'game-id': game_id_match.group() if game_id_match else game_id_text,
-                        'home-team': home_team,
-                        'away-team': away_team,
-                        'pre-match_odds_home': pre_match_odds_home,
-                        'pre-match_odds_draw': pre_match_odds_draw,
-                        'pre-match_odds_away': pre_match_odds_away,
-                    }
-                    all_extracted_data.append(match_data)
-
-                except Exception as e:
-                    print(f"⚠️ Error processing match: {e}")
-                    continue
-
-            # print(f"Found {len(matches)} matches on page {page_count}")
-
-            # Check if there are more pages
-            if not check_and_navigate_pagination(driver):
-                break
-
-            if page_count > 50:  # Safety limit
-                print("⚠️ Reached page limit")
-                break
+                # Check if there are more pages
+                if not check_and_navigate_pagination(driver, TODAY_ROWS_CSS, 'today'):
+                    break
+                session.count_page()
 
-        driver.quit()  # Clean up browser session
-
-        # Convert extracted_data to DataFrame for top 5 kick-off times
-        df = pd.DataFrame(all_extracted_data)
-        total_matches = len(all_extracted_data)
-        print(f"There are {total_matches} more upcoming events today")
-        if not df.empty and 'time' in df.columns:
-            top_times = df['time'].value_counts().head(5)
-            print(f"\n⏱️ Top 5 kick-off time:")
-            for kick_time, count in top_times.items():
-                print(f"  - {count} events at {kick_time}.")
-        else:
-            print(f"\n⏱️ Top 5 kick-off time: No data available")
+                if page_count > 50:  # Safety limit
+                    print("⚠️ Reached page limit")
+                    break
 
+        summarise_today_matches(all_extracted_data)
+        report_wait_stats()
         return all_extracted_data
 
     except requests.exceptions.RequestException as e:
@@ -515,6 +457,147 @@ def scrape_sb_today():
         return []
 
 
+def extract_today_matches(soup, current_date):
+    """
+    Extract match data from a parsed today page (BeautifulSoup extractor)
+    Returns list of dictionaries with match information
+    """
+    # Find all matches with the correct class structure
+    matches = soup.find_all(
+        'div', class_='m-table-row m-content-row match-row')
+
+    extracted_data = []
+    for match in matches:
+        try:
+            # Extract tournament name from parent match-league
+            tournament = "Unknown Tournament"
+            time_text = ""
+            game_id_text = ""
+            game_id_match = None
+
+            match_league = match.find_parent(
+                'div', class_='match-league')
+            if match_league:
+                league_title = match_league.find(
+                    'div', class_='league-title')
+                if league_title:
+                    text_span = league_title.find(
+                        'span', class_='text')
+                    if text_span:
+                        tournament = text_span.get_text(strip=True)
+
+            left_team_cell = match.find(
+                class_='m-table-cell left-team-cell')
+
+            if left_team_cell:
+                left_team_table = left_team_cell.find(
+                    class_='left-team-table')
+                if left_team_table:
+                    game_id_elem = left_team_table.find(
+                        class_='game-id')
+                    if game_id_elem:
+                        game_id_text = game_id_elem.get_text(
+                            strip=True)
+                        # Extract 5-digit number using regex
+                        game_id_match = re.search(
+                            r'\b\d{5}\b', game_id_text)
+                        # if game_id_match:
+                        #     match_data['game_id'] = game_id_match.group()
+                        # else:
+                        #     match_data['game_id'] = game_id_text  # Fallback to full text if no 5-digit found
+
+                    # Extract time
+                    time_elem = left_team_table.find(
+                        class_='clock-time')
+                    if time_elem:
+                        time_text = time_elem.get_text(strip=True)
+
+            # Find teams container
+            teams_container = match.find(class_='teams')
+            if not teams_container:
+                continue
+
+            # Extract team names
+            home_team_elem = teams_container.find(class_='home-team')
+            away_team_elem = teams_container.find(class_='away-team')
+
+            if not home_team_elem or not away_team_elem:
+                continue
+
+            home_team = home_team_elem.get_text(strip=True)
+            away_team = away_team_elem.get_text(strip=True)
+
+            # Extract title from teams container
+            title = teams_container.get(
+                'title', f"{home_team} vs {away_team}")
+
+            # Extract odds
+            pre_match_odds_home = ""
+            pre_match_odds_draw = ""
+            pre_match_odds_away = ""
+
+            market_cell = match.find(
+                'div', class_='m-table-cell market-cell two-markets')
+            if market_cell:
+                m_market = market_cell.find(
+                    'div', class_='m-market market')
+                if m_market:
+                    outcomes = m_market.find_all(
+                        'div', class_='m-outcome')
+                    if len(outcomes) >= 3:
+                        # Extract odds from each outcome
+                        home_odds = outcomes[0].find(
+                            'span', class_='m-outcome-odds')
+                        draw_odds = outcomes[1].find(
+                            'span', class_='m-outcome-odds')
+                        away_odds = outcomes[2].find(
+                            'span', class_='m-outcome-odds')
+
+                        pre_match_odds_home = home_odds.get_text(
+                            strip=True) if home_odds else ""
+                        pre_match_odds_draw = draw_odds.get_text(
+                            strip=True) if draw_odds else ""
+                        pre_match_odds_away = away_odds.get_text(
+                            strip=True) if away_odds else ""
+
+            match_data = {
+                'date': current_date,
+                'time': time_text,
+                'title': title,
+                'tournament': tournament,
+                'game-id': game_id_match.group() if game_id_match else game_id_text,
+                'home-team': home_team,
+                'away-team': away_team,
+                'pre-match_odds_home': pre_match_odds_home,
+                'pre-match_odds_draw': pre_match_odds_draw,
+                'pre-match_odds_away': pre_match_odds_away,
+            }
+            extracted_data.append(match_data)
+
+        except Exception as e:
+            print(f"⚠️ Error processing match: {e}")
+            continue
+
+    return extracted_data
+
+
+def summarise_today_matches(all_extracted_data):
+    """
+    Print the upcoming event count and the top 5 kick-off times
+    """
+    # Convert extracted_data to DataFrame for top 5 kick-off times
+    df = pd.DataFrame(all_extracted_data)
+    total_matches = len(all_extracted_data)
+    print(f"There are {total_matches} more upcoming events today")
+    if not df.empty and 'time' in df.columns:
+        top_times = df['time'].value_counts().head(5)
+        print(f"\n⏱️ Top 5 kick-off time:")
+        for kick_time, count in top_times.items():
+            print(f"  - {count} events at {kick_time}.")
+    else:
+        print(f"\n⏱️ Top 5 kick-off time: No data available")
+
+
 def save_to_csv(data, filename=None):
     """
     Save extracted data to CSV file with timestamp
@@ -540,7 +623,8 @@ def save_to_csv(data, filename=None):
 
 def append_to_csv(data, filename):
     """
-    Append new data to an existing CSV file, avoiding duplicates based on 'title'
+    Append new data to an existing CSV file, avoiding duplicates based on 'date' and 'title'
+    Only the new rows are written; duplicates are found through the file's key index
 
     Args:
         data (list): List of dictionaries containing new scraped data
@@ -555,35 +639,17 @@ def append_to_csv(data, filename):
         return False, 0
 
     try:
-        # Create DataFrame from new data
-        new_df = pd.DataFrame(data)
-
-        if not os.path.exists(filename):
-            # File doesn't exist, create it
-            new_df.to_csv(filename, index=False, quoting=0, escapechar='\\')
-            print(f"💾 Created {filename} with {len(new_df)} records")
-            return True, len(new_df)
+        created = not os.path.exists(filename)
+        unique_records, duplicate_count = append_new_rows(data, filename)
 
-        # Load existing data
-        # existing_df = pd.read_csv(filename, quoting=0, escapechar='\\')
-        existing_df = pd.read_csv(filename)
-
-        # Get existing titles to check for duplicates
-        existing_titles = set(existing_df['title'].tolist())
-
-        # Filter out duplicates
-        unique_records = new_df[~new_df['title'].isin(existing_titles)]
+        if created:
+            print(f"💾 Created {filename} with {len(unique_records)} records")
+            return True, len(unique_records)
 
         if unique_records.empty:
-            print(f"⏭️ All {len(new_df)} records were duplicates - no new data appended")
+            print(f"⏭️ All {duplicate_count} records were duplicates - no new data appended")
             return True, 0
 
-        # Append unique records to existing data
-        updated_df = pd.concat([existing_df, unique_records], ignore_index=True)
-
-        # Save updated data back to CSV
-        updated_df.to_csv(filename, index=False)
-
         print(f"📝 Appended {len(unique_records)} new records to {filename}")
         return True, len(unique_records)
 
@@ -592,149 +658,212 @@ def append_to_csv(data, filename):
         return False, 0
 
 
-def update_alert_log(extracted_data):
+def save_records(data, table):
     """
-    Updates alerts_log.csv with new match data while avoiding duplicates
-    Also merges tournament and odds data from today.csv based on date and title
+    Overwrite a storage table (see storage.py) with data
 
     Args:
-        extracted_data (list): List of dictionaries containing match data from scrape_sb_live()
+        data (list): List of dictionaries containing scraped data
+        table (str): 'today', 'alerts', 'results' or 'final_db'
 
     Returns:
-        int: Number of new records added
+        bool: Success status
     """
+    if not data:
+        print("❌ No data to save")
+        return False
+
+    try:
+        get_storage().replace(table, data)
+        print(f"💾 Data saved to {table_path(table)}")
+        return True
+    except Exception as e:
+        print(f"❌ Error saving {table}: {e}")
+        return False
+
+
+def append_records(data, table):
+    """
+    Add new records to a storage table (see storage.py), skipping (date, title) duplicates
+
+    Args:
+        data (list): List of dictionaries containing new scraped data
+        table (str): 'today', 'alerts', 'results' or 'final_db'
+
+    Returns:
+        tuple: (bool, int) - Success status and number of new records appended
+    """
+    if not data:
+        print("❌ No data to append")
+        return False, 0
 
-    # Define the CSV file paths
-    csv_file = os.getenv('ALERT_LOG_FILE', 'alerts_log.csv')
-    today_csv = 'today.csv'
+    try:
+        unique_records, duplicate_count = get_storage().append(table, data)
 
+        if unique_records.empty:
+            print(f"⏭️ All {duplicate_count} records were duplicates - no new data appended")
+            return True, 0
+
+        print(f"📝 Appended {len(unique_records)} new records to {table_path(table)}")
+        return True, len(unique_records)
+
+    except Exception as e:
+        print(f"❌ Error appending to {table}: {e}")
+        return False, 0
+
+
+# Column types of the alerts log
+ALERT_LOG_DTYPES = {
+    'tournament': 'object',
+    'game-id': 'Int64',
+    'pre-match_odds_home': 'float64',
+    'pre-match_odds_draw': 'float64',
+    'pre-match_odds_away': 'float64',
+    'home_ht_goals': 'Int64',
+    'away_ht_goals': 'Int64',
+    'ht_goals': 'Int64'
+}
+
+
+def load_today_df():
+    """
+    Load the today table (REMOTE_TODAY_FILE) for tournament and odds lookups
+    Returns a DataFrame, or None if the table is missing or unreadable
+    """
+    try:
+        today_df = get_storage().read('today')
+        if today_df is None:
+            return None
+        today_df['date'] = today_df['date'].astype(str).str.strip()
+        return today_df
+    except Exception as e:
+        print(f"⚠️ Error loading {table_path('today')}: {e}")
+        return None
+
+
+def load_alerts_df(**equals):
+    """
+    Load the alerts log (ALERT_LOG_FILE) with its column types
+    Keyword arguments filter on columns, e.g. load_alerts_df(date='07-09-25')
+    Returns a DataFrame, or None if the log doesn't exist
+    """
+    return get_storage().read('alerts', dtype=ALERT_LOG_DTYPES, **equals)
+
+
+def build_alert_records(extracted_data, today_df=None, today_index=None):
+    """
+    Turn scrape_sb_live() output into alerts-log records stamped with the
+    current date/time and enriched with tournament and odds from today.csv
+    (the closing odds from the odds history where it has them)
+
+    Args:
+        extracted_data (list): List of dictionaries containing match data from scrape_sb_live()
+        today_df (DataFrame): Preloaded today.csv, see load_today_df()
+        today_index (TodayIndex): Prebuilt lookup; built from today_df when omitted
+
+    Returns:
+        list: Alerts-log records
+    """
     # Get current date and time
     current_date = datetime.now().strftime('%d-%m-%y')
     current_time = datetime.now().strftime('%H:%M')
 
-    # Check if extracted_data is empty
-    if not extracted_data:
-        return 0
+    # One (date, title) lookup table per run instead of a scan per match
+    if today_index is None and today_df is not None:
+        today_index = TodayIndex(today_df, OddsHistory())
 
-    # Load today.csv for tournament and odds data
-    today_df = None
-    if os.path.exists(today_csv):
-        try:
-            today_df = pd.read_csv(today_csv, quoting=0, escapechar='\\')
-        except Exception as e:
-            print(f"⚠️ Error loading today.csv: {e}")
+    # Odds carried on the live rows themselves, coerced in one pass
+    live_odds = {col: coerce_odds([match.get(col, '') for match in extracted_data])
+                 for col in ODDS_COLUMNS}
 
     # Prepare new data with additional columns
     new_records = []
-    for match in extracted_data:
+    for i, match in enumerate(extracted_data):
+        game_id = parse_game_id(match.get('game-id'))
         new_record = {
             'date': current_date,
             'log_time': current_time,
             'tournament': '',
             'title': match['title'],
+            'game-id': game_id,
             'home-team': match['home-team'],
             'away-team': match['away-team'],
-            'pre-match_odds_home': '' if match.get('pre-match_odds_home', '') == '' else float(match.get('pre-match_odds_home', '')) if str(match.get('pre-match_odds_home', '')).replace('.', '').isdigit() else '',
-            'pre-match_odds_draw': '' if match.get('pre-match_odds_draw', '') == '' else float(match.get('pre-match_odds_draw', '')) if str(match.get('pre-match_odds_draw', '')).replace('.', '').isdigit() else '',
-            'pre-match_odds_away': '' if match.get('pre-match_odds_away', '') == '' else float(match.get('pre-match_odds_away', '')) if str(match.get('pre-match_odds_away', '')).replace('.', '').isdigit() else '',
+            'pre-match_odds_home': live_odds['pre-match_odds_home'].iat[i],
+            'pre-match_odds_draw': live_odds['pre-match_odds_draw'].iat[i],
+            'pre-match_odds_away': live_odds['pre-match_odds_away'].iat[i],
             'home_ht_goals': match['home_ht_goals'],
             'away_ht_goals': match['away_ht_goals'],
             'ht_goals': int(match['ht_goals'])  # Assuming you want ht_goals as integer, per previous discussion
         }
-        # new_record = {
-        #     'date': current_date,
-        #     'log_time': current_time,
-        #     'tournament': '',
-        #     'title': match['title'],
-        #     'home-team': match['home-team'],
-        #     'away-team': match['away-team'],
-        #     'pre-match_odds_home': '',
-        #     'pre-match_odds_draw': '',
-        #     'pre-match_odds_away': '',
-        #     'home_ht_goals': match['home_ht_goals'],
-        #     'away_ht_goals': match['away_ht_goals'],
-        #     'ht_goals': int(match['ht_goals'])
-        # }
-
-        # Try to find matching record in today.csv
-        if today_df is not None:
-            today_df['date'] = today_df['date'].astype(str).str.strip()
-            matching_row = today_df[
-                (today_df['date'] == current_date) &
-                (today_df['title'].str.strip() == match['title'].strip())
-            ]
-
-            if not matching_row.empty:
-                row = matching_row.iloc[0]
-                new_record['tournament'] = row.get('tournament', '')
-                new_record['pre-match_odds_home'] = row.get(
-                    'pre-match_odds_home', '')
-                new_record['pre-match_odds_draw'] = row.get(
-                    'pre-match_odds_draw', '')
-                new_record['pre-match_odds_away'] = row.get(
-                    'pre-match_odds_away', '')
+
+        # Try to find matching record in today.csv (by game id when the live feed had one)
+        if today_index is not None:
+            today_row = today_index.lookup(current_date, match['title'], game_id)
+
+            if today_row is not None:
+                new_record.update(today_row)
+                if new_record['game-id'] is None:
+                    new_record['game-id'] = game_id
             else:
                 print(f"🔍 No match found for date: '{current_date}' and title: '{match['title']}'")
 
         new_records.append(new_record)
 
-    # Create DataFrame from new records
-    new_df = pd.DataFrame(new_records)
+    return new_records
 
-    try:
-        # Check if the CSV file exists
-        if os.path.exists(csv_file):
-            # Load existing data
-            existing_df = pd.read_csv(csv_file, quoting=0, escapechar='\\', dtype={
-                'tournament': 'object',
-                'pre-match_odds_home': 'float64',
-                'pre-match_odds_draw': 'float64',
-                'pre-match_odds_away': 'float64',
-                'home_ht_goals': 'Int64',
-                'away_ht_goals': 'Int64',
-                'ht_goals': 'Int64'
-            })
 
-            # Get existing titles to check for duplicates
-            existing_titles = set(existing_df['title'].tolist())
+def update_alert_log(extracted_data, today_df=None, today_index=None):
+    """
+    Appends new match data to alerts_log.csv while avoiding (date, title) duplicates
+    Also merges tournament and odds data from today.csv based on date and title
 
-            # Filter out duplicates from new data
-            unique_records = []
-            duplicate_count = 0
+    Args:
+        extracted_data (list): List of dictionaries containing match data from scrape_sb_live()
+        today_df (DataFrame): Preloaded today.csv, loaded from disk when omitted
+        today_index (TodayIndex): Prebuilt lookup, shared with backfill_tournament_and_odds()
 
-            for record in new_records:
-                if record['title'] not in existing_titles:
-                    unique_records.append(record)
-                else:
-                    duplicate_count += 1
+    Returns:
+        int: Number of new records added
+    """
 
-            if unique_records:
-                # Create DataFrame from unique records
-                unique_df = pd.DataFrame(unique_records)
+    # Check if extracted_data is empty
+    if not extracted_data:
+        return 0
 
-                # Append unique records to existing data
-                updated_df = pd.concat(
-                    [existing_df, unique_df], ignore_index=True)
+    # Load today.csv for tournament and odds data
+    if today_index is None and today_df is None:
+        today_df = load_today_df()
 
-                # Save updated data back to CSV
-                updated_df.to_csv(csv_file, index=False,
-                                  quoting=0, escapechar='\\')
+    new_records = build_alert_records(extracted_data, today_df, today_index)
+    return append_alert_records(new_records)
 
-                print(
-                    f"📝 Added {len(unique_records)} new records to alerts_log.csv")
-                if duplicate_count > 0:
-                    print(f"⏭️ Skipped {duplicate_count} duplicate records")
 
-                return len(unique_records)
-            else:
-                print(
-                    f"⏭️ All {len(new_records)} records were duplicates - no new data saved")
-                return 0
+def append_alert_records(new_records):
+    """
+    Appends records from build_alert_records() to alerts_log.csv, skipping (date, title) duplicates
 
-        else:
-            # File doesn't exist, create new one with headers
-            new_df.to_csv(csv_file, index=False, quoting=0, escapechar='\\')
-            return len(new_records)
+    Returns:
+        int: Number of new records added
+    """
+    if not new_records:
+        return 0
+    get_alias_cache().save()
+
+    try:
+        # Append only records whose (date, title) isn't logged yet
+        unique_records, duplicate_count = get_storage().append('alerts', new_records)
+
+        if unique_records.empty:
+            print(
+                f"⏭️ All {len(new_records)} records were duplicates - no new data saved")
+            return 0
+
+        print(
+            f"📝 Added {len(unique_records)} new records to alerts_log.csv")
+        if duplicate_count > 0:
+            print(f"⏭️ Skipped {duplicate_count} duplicate records")
+
+        return len(unique_records)
 
     except Exception as e:
         print(f"❌ Error updating alerts_log.csv: {e}")
@@ -781,12 +910,14 @@ def calculate_total_goals(score_text):
         return 0
 
 
-def select_date(driver, target_date):
+def select_date(driver, target_date, rows_css=RESULT_ROWS_CSS):
     """
     Select a specific date from the dropdown
+    Waits until the result list has re-rendered for the new date
     Args:
         driver: Selenium WebDriver instance
         target_date: Date string in format "05/09/2025"
+        rows_css: CSS selector of the list rows that reload with the date
     """
     try:
         # print(f"🗓️ Attempting to select date: {target_date}")
@@ -818,11 +949,10 @@ def select_date(driver, target_date):
 
         # Click the dropdown to open it
         driver.execute_script("arguments[0].click();", dropdown_element)
-        time.sleep(2)
 
         # Look for date options
-        date_options = driver.find_elements(
-            By.CSS_SELECTOR, ".m-select-list span, .select-index")
+        date_options = wait_for_elements(
+            driver, ".m-select-list span, .select-index", 'date_dropdown', timeout=5)
 
         # If no options found, try alternative selectors
         if not date_options:
@@ -836,8 +966,10 @@ def select_date(driver, target_date):
 
                 if target_date in option_text:
                     # print(f"✅ Selecting date: {target_date}")
+                    before_marker = list_marker(driver, rows_css)
                     driver.execute_script("arguments[0].click();", option)
-                    time.sleep(3)  # Wait for page to reload with new date
+                    # Wait for page to reload with new date
+                    wait_for_list_change(driver, rows_css, before_marker, 'date_select')
                     return True
             except Exception as e:
                 print(f"⚠️ Error checking date option: {e}")
@@ -851,9 +983,10 @@ def select_date(driver, target_date):
         return False
 
 
-def check_and_navigate_pagination(driver):
+def check_and_navigate_pagination(driver, rows_css=TODAY_ROWS_CSS, page_type='pagination'):
     """
     Check if there are more pages and navigate to the next one
+    Waits until the list shows the new page instead of sleeping
     Returns True if successfully navigated to next page, False if no more pages
     """
     try:
@@ -865,15 +998,16 @@ def check_and_navigate_pagination(driver):
         ]
 
         for selector in next_selectors:
-            try:
-                next_button = driver.find_element(By.CSS_SELECTOR, selector)
-                if next_button and "icon-disabled" not in next_button.get_attribute("class"):
-                    # print("📄 Navigating to next page...")
-                    driver.execute_script("arguments[0].click();", next_button)
-                    time.sleep(3)  # Wait for page to load
-                    return True
-            except NoSuchElementException:
-                continue
+            # Query through JS so a missing button doesn't sit out the implicit wait
+            next_button = driver.execute_script(
+                "return document.querySelector(arguments[0]);", selector)
+            if next_button and "icon-disabled" not in next_button.get_attribute("class"):
+                # print("📄 Navigating to next page...")
+                before_marker = list_marker(driver, rows_css)
+                driver.execute_script("arguments[0].click();", next_button)
+                # Wait for the next page to render
+                wait_for_list_change(driver, rows_css, before_marker, page_type)
+                return True
 
         # print("📄 No more pages available")
         return False
@@ -1011,397 +1145,849 @@ def extract_match_data(soup):
     return matches
 
 
-def scrape_sb_results(target_date):
+def scrape_sb_results(target_date, wanted=None):
     """
     Main scraping function for sb live results
     Args:
         target_date: Date string in format "05/09/2025"
+        wanted (list): (home team, away team) pairs the caller needs (see result_gaps());
+            pagination stops once all of them are found. Default: every page
+    Returns:
+        list: Result dicts with date ('05-09-25'), tournament, teams and full-time goals
     """
     url = "https://www.sportybet.com/ng/liveResult/"
     headers = get_random_headers()
     all_matches = []
+    # Fuzzy pair matcher over the awaited fixtures, and the ones found so far
+    wanted = list(wanted or [])
+    wanted_matcher = FixtureMatcher((home, away, i) for i, (home, away) in enumerate(wanted)) if wanted else None
+    found = set()
 
     try:
         # print(f"🚀 Starting scraper for date: {target_date}")
 
-        # Set up headless Chrome
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-logging")
-        chrome_options.add_argument("--log-level=3")
-        chrome_options.add_argument(f"user-agent={headers['User-Agent']}")
-        chrome_options.add_argument("--window-size=1920,1080")
-
-        # Initialize driver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-
-        # print("🌐 Loading sb page...")
-        driver.get(url)
-
-        # Wait for initial page load
-        time.sleep(random.uniform(3, 5))
-
-        # Select the target date
-        if not select_date(driver, target_date):
-            print("❌ Failed to select target date")
-            driver.quit()
-            return []
+        # Borrow a warm headless Chrome session from the shared pool
+        with pooled_driver(headers['User-Agent']) as session:
+            driver = session.driver
 
-        page_count = 1
+            # print("🌐 Loading sb page...")
+            started_at = time.monotonic()
+            session.get(url)
 
-        # Process all pages for the selected date
-        while True:
-            # print(f"📄 Processing page {page_count}...")
+            # select_date() waits for the dropdown itself; only keep the politeness floor
+            politeness_delay(started_at)
 
-            # Wait for content to load
-            time.sleep(random.uniform(2, 4))
+            # Select the target date
+            if not select_date(driver, target_date):
+                print("❌ Failed to select target date")
+                return []
+            session.count_page()
 
-            # Get page source and parse
-            page_source = driver.page_source
+            page_count = 1
 
-            # Clean the page source
-            page_source = re.sub(
-                r'/[^<>]*?\.wdm/[^<>]*?chromedriver[^<>]*?', '', page_source)
-            page_source = re.sub(
-                r'\[[^<>\[\]]*?chromedriver[^<>\[\]]*?\]', '', page_source)
+            # Process all pages for the selected date
+            while True:
+                # print(f"📄 Processing page {page_count}...")
 
-            # Parse with BeautifulSoup
-            try:
-                soup = BeautifulSoup(page_source, 'html.parser')
-            except Exception as e1:
-                print(f"⚠️ html.parser failed: {e1}")
-                try:
-                    soup = BeautifulSoup(page_source, 'lxml')
-                except Exception as e2:
-                    print(f"❌ All parsers failed: {e2}")
+                # Rows are already settled by select_date()/pagination waits
+                # Extract match data from current page
+                if SB_EXTRACT_MODE == 'js':
+                    page_matches = extract_result_matches_js(driver)
+                elif SB_PARSER == 'lxml':
+                    try:
+                        page_matches = parse_result_matches(
+                            clean_page_source(driver.page_source))
+                    except Exception as e1:
+                        print(f"❌ lxml parser failed: {e1}")
+                        break
+                else:
+                    # Get page source and clean it
+                    page_source = clean_page_source(driver.page_source)
+
+                    # Parse with BeautifulSoup
+                    try:
+                        soup = BeautifulSoup(page_source, 'html.parser')
+                    except Exception as e1:
+                        print(f"⚠️ html.parser failed: {e1}")
+                        try:
+                            soup = BeautifulSoup(page_source, 'lxml')
+                        except Exception as e2:
+                            print(f"❌ All parsers failed: {e2}")
+                            break
+                    page_matches = extract_match_data(soup)
+                all_matches.extend(page_matches)
+                # print(
+                #     f"📊 Extracted {len(page_matches)} matches from page {page_count}")
+
+                if wanted_matcher is not None:
+                    for match in page_matches:
+                        value = wanted_matcher.match(match.get('home_team'), match.get('away_team'))
+                        if value is not None:
+                            found.add(value)
+                    if len(found) == len(wanted):
+                        print(f"✅ Found all {len(wanted)} awaited results by page {page_count}")
+                        break
+
+                # Check if there are more pages
+                if not check_and_navigate_pagination(driver, RESULT_ROWS_CSS, 'liveResult'):
                     break
+                session.count_page()
 
-            # Extract match data from current page
-            page_matches = extract_match_data(soup)
-            all_matches.extend(page_matches)
-            # print(
-            #     f"📊 Extracted {len(page_matches)} matches from page {page_count}")
+                page_count += 1
 
-            # Check if there are more pages
-            if not check_and_navigate_pagination(driver):
-                break
+                # Safety limit to prevent infinite loops
+                if page_count > 50:  # Reasonable limit
+                    print("⚠️ Reached page limit, stopping pagination")
+                    break
 
-            page_count += 1
+            print(
+                f"🏆 Total match results extracted from yesterday: {len(all_matches)}")
+            report_wait_stats()
 
-            # Safety limit to prevent infinite loops
-            if page_count > 50:  # Reasonable limit
-                print("⚠️ Reached page limit, stopping pagination")
-                break
-
-        driver.quit()
-        print(
-            f"🏆 Total match results extracted from yesterday: {len(all_matches)}")
-        return all_matches
+            # Stamp each result with its match date (alerts-log format) so
+            # final scores can be joined on date as well as teams
+            result_date = datetime.strptime(target_date, '%d/%m/%Y').strftime('%d-%m-%y')
+            return attach_result_game_ids([{'date': result_date, **match} for match in all_matches])
 
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
-        if 'driver' in locals():
-            driver.quit()
         return []
 
 
-def update_alerts_with_final_scores():
+# Full-time score columns shared by results.csv and final_db.csv
+FT_COLUMNS = ['home_ft_goals', 'away_ft_goals', 'ft_goals']
+
+
+def attach_result_game_ids(results):
+    """
+    Give each result the game-id of its fixture in the today table (the liveResult
+    page has none), matched on date + teams with the fuzzy fallback of TodayIndex
+
+    Args:
+        results (list): Result dicts with date, home_team and away_team
+
+    Returns:
+        list: The result dicts with 'game-id' added (None where no fixture matched)
+    """
+    storage = get_storage()
+    indexes = {}
+    with_ids = []
+    for result in results:
+        date = result.get('date')
+        if date not in indexes:
+            try:
+                indexes[date] = TodayIndex(storage.read('today', date=date))
+            except Exception as e:
+                print(f"⚠️ Could not load today fixtures for {date}: {e}")
+                indexes[date] = TodayIndex()
+        game_id = indexes[date].game_id(date, result['home_team'], result['away_team'])
+        # Column order of the results table: date, tournament, game-id, teams, goals
+        with_ids.append({'date': date, 'tournament': result.get('tournament'), 'game-id': game_id,
+                         **{key: value for key, value in result.items() if key not in ('date', 'tournament')}})
+    if with_ids:
+        get_alias_cache().save()
+        found = sum(result['game-id'] is not None for result in with_ids)
+        print(f"🆔 Matched {found} of {len(with_ids)} results to a game id")
+    return with_ids
+
+
+def merge_final_scores(alerts_df, results_df):
+    """
+    Join final scores onto alerts in one vectorised pass on the integer event key
+    (date + game-id) where both sides have one, and on date + home/away team otherwise
+    Result keys that appear with different scores are ambiguous and left unmatched;
+    results without a 'date' column (older files) are joined on teams only
+
+    Args:
+        alerts_df (DataFrame): Alerts log rows (home-team/away-team columns)
+        results_df (DataFrame): Results rows (home_team/away_team columns)
+
+    Returns:
+        tuple: (DataFrame, dict) - alerts_df with the FT columns filled in, and
+               {'matched', 'unmatched', 'ambiguous', 'by_id', 'fuzzy'} row counts
+               ('by_id' and 'fuzzy' are the parts of 'matched' joined on game-id
+               and found by team_matcher)
     """
-    Creates a copy of alerts_log.csv and updates it with final scores from results.csv
-    Matches records based on date and title
+    # Results use home_team/away_team, alerts use home-team/away-team
+    results_df = results_df.rename(columns={'home_team': 'home-team', 'away_team': 'away-team'})
+    keys = ['date', 'home-team', 'away-team']
+    if 'date' not in results_df.columns or results_df['date'].isna().all():
+        print("⚠️ Results have no date column - matching on teams only")
+        keys = ['home-team', 'away-team']
+
+    def join_keys(df):
+        return pd.DataFrame({key: df[key].astype(str).str.strip() for key in keys}, index=df.index)
+
+    results = pd.concat([join_keys(results_df), results_df[FT_COLUMNS]], axis=1).drop_duplicates()
+    conflicting = results.duplicated(subset=keys, keep=False)
+    ambiguous_keys = results.loc[conflicting, keys].drop_duplicates()
+    results = results[~conflicting].rename(columns={col: f"{col}_result" for col in FT_COLUMNS})
+
+    merged = join_keys(alerts_df).merge(results, on=keys, how='left', validate='many_to_one', indicator=True)
+    merged.index = alerts_df.index
+    is_ambiguous = join_keys(alerts_df).merge(
+        ambiguous_keys, on=keys, how='left', indicator=True)['_merge'].eq('both').values
+    result_columns = [f"{col}_result" for col in FT_COLUMNS]
+
+    # Rows with a game-id on both sides take the score of that exact event
+    by_id = 0
+    if 'date' in keys and GAME_ID_COLUMN in alerts_df.columns and GAME_ID_COLUMN in results_df.columns:
+        id_results = results_df[FT_COLUMNS].assign(
+            _event=event_keys(results_df['date'], results_df[GAME_ID_COLUMN]).values)
+        id_results = id_results.dropna(subset=['_event']).drop_duplicates()
+        id_results = id_results[~id_results['_event'].duplicated(keep=False)]
+        id_scores = pd.DataFrame({'_event': event_keys(alerts_df['date'], alerts_df[GAME_ID_COLUMN]).values}).merge(
+            id_results, on='_event', how='left', validate='many_to_one', indicator=True)
+        hit = id_scores['_merge'].eq('both').values
+        if hit.any():
+            merged.loc[hit, result_columns] = id_scores.loc[hit, FT_COLUMNS].values
+            merged.loc[hit, '_merge'] = 'both'
+            is_ambiguous = is_ambiguous & ~hit
+            by_id = int(hit.sum())
+
+    # Team names spelled differently on the two pages: fuzzy-match the rest within their date
+    fuzzy = 0
+    missed = merged[(merged['_merge'] != 'both') & ~is_ambiguous]
+    if not missed.empty and not results.empty:
+        by_date = results.groupby('date') if 'date' in keys else [(None, results)]
+        matchers = {date: FixtureMatcher(zip(group['home-team'], group['away-team'], group.index))
+                    for date, group in by_date}
+        for idx, row in missed.iterrows():
+            matcher = matchers.get(row['date'] if 'date' in keys else None)
+            result_idx = matcher.match(row['home-team'], row['away-team']) if matcher else None
+            if result_idx is not None:
+                merged.loc[idx, result_columns] = results.loc[result_idx, result_columns].values
+                merged.loc[idx, '_merge'] = 'both'
+                fuzzy += 1
+
+    # FT columns go right after ht_goals; scores already present are kept when there is no result
+    columns = [col for col in alerts_df.columns if col not in FT_COLUMNS]
+    position = columns.index('ht_goals') + 1 if 'ht_goals' in columns else len(columns)
+    updated_df = alerts_df[columns].copy()
+    for offset, col in enumerate(FT_COLUMNS):
+        scores = merged[f"{col}_result"]
+        if col in alerts_df.columns:
+            scores = scores.combine_first(pd.to_numeric(alerts_df[col], errors='coerce'))
+        updated_df.insert(position + offset, col, pd.to_numeric(scores, errors='coerce').astype('Int64'))
+
+    matched = int((merged['_merge'] == 'both').sum())
+    ambiguous = int(is_ambiguous.sum())
+    stats = {'matched': matched, 'unmatched': len(alerts_df) - matched - ambiguous,
+             'ambiguous': ambiguous, 'by_id': by_id, 'fuzzy': fuzzy}
+    return updated_df, stats
+
+
+def combine_results(results_df, live_df):
+    """
+    Scraped results plus the live-captured scores they don't cover yet
+    A scraped result wins over a live capture of the same event (date + game-id, or date + teams)
 
     Returns:
-        str: Path to the updated file, or None if error
+        DataFrame: Results rows (date, tournament, game-id, home_team, away_team and the FT columns)
+    """
+    if live_df is None or live_df.empty:
+        return results_df
+    live_df = live_df[[col for col in ['date', 'tournament', GAME_ID_COLUMN, 'home_team', 'away_team'] + FT_COLUMNS
+                       if col in live_df.columns]]
+    if results_df is None or results_df.empty:
+        return live_df.reset_index(drop=True)
+
+    covered = np.zeros(len(live_df), dtype=bool)
+    if 'date' in results_df.columns:
+        def team_keys(df):
+            return (df['date'].astype(str).str.strip() + '|' + df['home_team'].astype(str).str.strip() + '|'
+                    + df['away_team'].astype(str).str.strip())
+        covered |= team_keys(live_df).isin(team_keys(results_df)).to_numpy()
+        if GAME_ID_COLUMN in results_df.columns:
+            scraped = event_keys(results_df['date'], results_df[GAME_ID_COLUMN]).dropna()
+            live_keys = event_keys(live_df['date'], live_df[GAME_ID_COLUMN])
+            covered |= live_keys.isin(scraped).fillna(False).to_numpy(dtype=bool)
+    return pd.concat([results_df, live_df[~covered]], ignore_index=True)
+
+
+def split_live_captures(live_df):
     """
+    Live captures split by how far they can be trusted
 
-    # Define file paths
-    alerts_log_file = os.getenv('ALERT_LOG_FILE', 'alerts_log.csv')
-    results_file = os.getenv('RESULT_LOG_FILE', 'results.csv')
-    output_file = os.getenv('FINAL_DB_FILE', 'final_db.csv')
+    Returns:
+        tuple: (clock captures - the feed said FT, left_h2 captures - last score seen before the
+                match left the list, only provisional until the liveResult page confirms it)
+    """
+    if live_df is None or live_df.empty:
+        return live_df, None
+    provisional = live_df['capture'].astype(str).str.strip().eq('left_h2') if 'capture' in live_df.columns \
+        else pd.Series(False, index=live_df.index)
+    return live_df[~provisional], live_df[provisional]
+
+
+def provisional_final_scores(alerts_df, provisional_df):
+    """
+    Rows of alerts_df still without a score that have a left_h2 live capture, with its score
 
-    # Create output filename with timestamp
-    # current_time = datetime.now().strftime('%d-%m-%y-%H-%M-%S')
-    # output_file = f"alerts_final_{current_time}.csv"
+    Returns:
+        DataFrame: Those rows with the FT columns filled in (empty if none)
+    """
+    missing = alerts_df[alerts_df['ft_goals'].isna()] if 'ft_goals' in alerts_df.columns else alerts_df
+    if provisional_df is None or provisional_df.empty or missing.empty:
+        return missing.iloc[:0]
+    filled, _ = merge_final_scores(missing.drop(columns=[col for col in FT_COLUMNS if col in missing.columns]),
+                                   combine_results(None, provisional_df))
+    return filled[filled['ft_goals'].notna()]
+
+
+def capture_live_final_scores(transitions, alerts_df=None):
+    """
+    Record the full-time scores of alerted events that finished on the live feed:
+    'ft' transitions from LiveStateTracker (the clock said FT, or the match left
+    the list during the second half with its last score)
+
+    Args:
+        transitions (list): LiveStateTracker.transitions of the poll
+        alerts_df (DataFrame): In-memory alerts log; today's and yesterday's alerts are read when omitted
+
+    Returns:
+        int: Number of scores recorded in the live_results table
+    """
+    finished = [transition for transition in transitions or [] if transition['kind'] == 'ft']
+    if not finished:
+        return 0
 
     try:
-        # Load alerts_log.csv
-        if not os.path.exists(alerts_log_file):
-            print(f"❌ {alerts_log_file} not found")
-            return None
+        storage = get_storage()
+        if alerts_df is None:
+            days = [(datetime.now() - timedelta(days=n)).strftime('%d-%m-%y') for n in (1, 0)]
+            frames = [df for df in (storage.read('alerts', date=day) for day in days) if df is not None]
+            alerts_df = pd.concat(frames, ignore_index=True) if frames else None
+        if alerts_df is None or alerts_df.empty:
+            return 0
+
+        # Later alerts win, so a game id reused on another day resolves to the latest one
+        by_id, by_title = {}, {}
+        ids = game_ids(alerts_df[GAME_ID_COLUMN]) if GAME_ID_COLUMN in alerts_df.columns \
+            else pd.Series(pd.NA, index=alerts_df.index, dtype='Int64')
+        for alert, game_id in zip(alerts_df.to_dict('records'), ids):
+            if not pd.isna(game_id):
+                by_id[int(game_id)] = alert
+            by_title[str(alert['title']).strip()] = alert
+
+        captured_at = datetime.now().strftime('%H:%M')
+        rows = []
+        for transition in finished:
+            alert = by_id.get(transition['game-id']) if transition['game-id'] is not None else None
+            if alert is None:
+                alert = by_title.get(str(transition['title']).strip())
+            if alert is None:
+                continue
+            home_goals, away_goals = transition['home_score'], transition['away_score']
+            game_id = parse_game_id(alert.get(GAME_ID_COLUMN))
+            rows.append({
+                'date': str(alert['date']).strip(),
+                'captured_at': captured_at,
+                'tournament': alert.get('tournament'),
+                'title': alert['title'],
+                'game-id': game_id if game_id is not None else transition['game-id'],
+                'home_team': alert['home-team'],
+                'away_team': alert['away-team'],
+                'home_ft_goals': home_goals,
+                'away_ft_goals': away_goals,
+                'ft_goals': home_goals + away_goals,
+                # 'clock': the feed said FT; 'left_h2': last score before the match left the list
+                'capture': 'clock' if transition['row'] is not None else 'left_h2',
+            })
+        if not rows:
+            return 0
 
-        alerts_df = pd.read_csv(alerts_log_file, quoting=0, escapechar='\\')
+        added, _ = storage.append('live_results', rows)
+        if not added.empty:
+            print(f"🏁 Captured {len(added)} full-time scores of alerted matches from the live feed")
+        return len(added)
 
-        # Load results.csv
-        if not os.path.exists(results_file):
-            print(f"❌ {results_file} not found")
-            return None
+    except Exception as e:
+        print(f"❌ Error capturing live final scores: {e}")
+        return 0
 
-        results_df = pd.read_csv(results_file, quoting=0, escapechar='\\')
-
-        # Add these columns to alerts_df if they don't exist, in the desired order
-        if 'home_ft_goals' not in alerts_df.columns:
-            alerts_df.insert(alerts_df.columns.get_loc('ht_goals') + 1, 'home_ft_goals', '')
-        if 'away_ft_goals' not in alerts_df.columns:
-            alerts_df.insert(alerts_df.columns.get_loc('home_ft_goals') + 1, 'away_ft_goals', '')
-        if 'ft_goals' not in alerts_df.columns:
-            alerts_df.insert(alerts_df.columns.get_loc('away_ft_goals') + 1, 'ft_goals', '')
-
-        # Update alerts_df with home_ft_goals, away_ft_goals, and ft_goals from results_df
-        matches_found = 0
-        for idx, alert_row in alerts_df.iterrows():
-            # Try to find matching row in results based on team names
-            # Since results.csv uses home_team/away_team and alerts uses home-team/away-team
-            matching_result = results_df[
-                (results_df['home_team'] == alert_row['home-team']) &
-                (results_df['away_team'] == alert_row['away-team'])
-            ]
-
-            if not matching_result.empty:
-                result_row = matching_result.iloc[0]
-                alerts_df.at[idx, 'home_ft_goals'] = result_row.get('home_ft_goals')
-                alerts_df.at[idx, 'away_ft_goals'] = result_row.get('away_ft_goals')
-                alerts_df.at[idx, 'ft_goals'] = result_row.get('ft_goals')
-                matches_found += 1
-
-        # return alerts_df
-        # Save the updated dataframe to new file
-        # alerts_df.to_csv(output_file, index=False, quoting=3, escapechar='\\')
-        # alerts_df.to_csv(output_file, index=False, quoting=0, escapechar='\\')
-
-        # print(
-        #     f"📝 Created {output_file} with {matches_found} final scores updated")
-        # return output_file
-        # # Ensure goal columns are Int64 to maintain integer types
-        # alerts_df['home_ft_goals'] = alerts_df['home_ft_goals'].astype('Int64')
-        # alerts_df['away_ft_goals'] = alerts_df['away_ft_goals'].astype('Int64')
-        # alerts_df['ft_goals'] = alerts_df['ft_goals'].astype('Int64')
-
-        # Append updated records to final_db.csv
-        success, num_appended = append_to_csv(alerts_df.to_dict('records'), output_file)
-        if success:
-            print(f"📝 Appended {num_appended} updated records with final scores to {output_file}")
-            return output_file
-        else:
-            print(f"❌ Failed to append updated records to {output_file}")
+
+# Incremental final_db build: alert rows already ingested and alerts still waiting for a score
+FINAL_DB_STATE_FILE = os.getenv('FINAL_DB_STATE_FILE', 'final_db_state.json')
+# Days an alert keeps waiting for a late result before it is given up on
+FINAL_DB_LOOKBACK_DAYS = int(os.getenv('FINAL_DB_LOOKBACK_DAYS', '3'))
+
+
+def load_final_db_state():
+    """
+    Read the final_db watermark
+
+    Returns:
+        dict: {'alerts_seen': int, 'pending': list of alert records without a final score}
+    """
+    state = load_state(FINAL_DB_STATE_FILE, {})
+    return {'alerts_seen': int(state.get('alerts_seen', 0)), 'pending': state.get('pending', [])}
+
+
+def pending_result_dates(state=None):
+    """
+    Dates still waiting for results inside the look-back window, e.g. ['05/09/2025']
+    Used by results.py to re-scrape days whose results came in late
+    """
+    state = state or load_final_db_state()
+    cutoff = (datetime.now() - timedelta(days=FINAL_DB_LOOKBACK_DAYS)).date()
+    dates = set()
+    for record in state['pending']:
+        try:
+            match_date = datetime.strptime(str(record.get('date')).strip(), '%d-%m-%y')
+        except ValueError:
+            continue
+        if match_date.date() >= cutoff:
+            dates.add(match_date)
+    return [d.strftime('%d/%m/%Y') for d in sorted(dates)]
+
+
+def result_gaps(state=None):
+    """
+    Alerts the liveResult page still has to provide a score for, by match date:
+    final_db's pending alerts and the alerts logged since the last final_db run,
+    less those the live feed saw reach FT, inside the look-back window and before today
+    (scores captured as a match left the list are only provisional, so those stay in)
+
+    Returns:
+        dict: {'05/09/2025': [(home team, away team), ...]} in date order
+    """
+    state = state or load_final_db_state()
+    storage = get_storage()
+    records = list(state['pending'])
+    alerts_total = storage.count('alerts')
+    new_alerts = storage.read('alerts', offset=state['alerts_seen'] if alerts_total >= state['alerts_seen'] else 0)
+    if new_alerts is not None:
+        records += new_alerts[['date', 'title', 'home-team', 'away-team']].to_dict('records')
+    live, _ = split_live_captures(storage.read('live_results'))
+    captured = set() if live is None else {alert_key(date, title) for date, title in zip(live['date'], live['title'])}
+
+    today = datetime.now().date()
+    cutoff = today - timedelta(days=FINAL_DB_LOOKBACK_DAYS)
+    gaps = {}
+    for record in records:
+        if alert_key(record['date'], record['title']) in captured:
+            continue
+        try:
+            match_date = datetime.strptime(str(record['date']).strip(), '%d-%m-%y').date()
+        except ValueError:
+            continue
+        if cutoff <= match_date < today:
+            gaps.setdefault(match_date, set()).add((record['home-team'], record['away-team']))
+    return {day.strftime('%d/%m/%Y'): sorted(gaps[day]) for day in sorted(gaps)}
+
+
+def keep_stored_final_scores(alerts_df, final_df):
+    """
+    FT columns of alerts_df with the scores final_db already holds for the same (date, title) kept
+    A re-merge never replaces a stored score, it only fills the missing ones
+
+    Args:
+        alerts_df (DataFrame): Output of merge_final_scores()
+        final_df (DataFrame): Stored final_db rows, or None
+
+    Returns:
+        DataFrame: Copy of alerts_df
+    """
+    alerts_df = alerts_df.copy()
+    if final_df is None or final_df.empty:
+        return alerts_df
+    stored = final_df.reindex(columns=['date', 'title'] + FT_COLUMNS)
+    stored.index = [alert_key(date, title) for date, title in zip(stored['date'], stored['title'])]
+    stored = stored[~stored.index.duplicated(keep='last')]
+    keys = [alert_key(date, title) for date, title in zip(alerts_df['date'], alerts_df['title'])]
+    for col in FT_COLUMNS:
+        kept = pd.to_numeric(stored[col], errors='coerce').reindex(keys).values
+        alerts_df[col] = pd.Series(kept, index=alerts_df.index).combine_first(
+            pd.to_numeric(alerts_df[col], errors='coerce')).astype('Int64')
+    return alerts_df
+
+
+def stored_final_scores(storage, alerts_df):
+    """
+    The final_db rows of alerts_df's dates, indexed by alert_key
+
+    Returns:
+        DataFrame: date, title, tournament, ht_goals, pre-match draw odds and the FT columns
+    """
+    columns = ['date', 'title', 'tournament', 'ht_goals', 'pre-match_odds_draw'] + FT_COLUMNS
+    frames = [storage.read('final_db', date=date) for date in sorted(set(alerts_df['date'].astype(str).str.strip()))]
+    frames = [frame.reindex(columns=columns) for frame in frames if frame is not None]
+    stored = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    stored.index = [alert_key(date, title) for date, title in zip(stored['date'], stored['title'])]
+    stored = stored[~stored.index.duplicated(keep='last')]
+    stored['ft_goals'] = pd.to_numeric(stored['ft_goals'], errors='coerce')
+    return stored
+
+
+def _scored_rows(stored, rows):
+    """The rows of stored (see stored_final_scores()) that already hold a score for one of rows."""
+    keys = [alert_key(date, title) for date, title in zip(rows['date'], rows['title'])]
+    return stored[stored['ft_goals'].notna()].reindex(keys).dropna(subset=['ft_goals'])
+
+
+def update_alerts_with_final_scores():
+    """
+    Incrementally builds final_db.csv from alerts_log.csv, results.csv and the
+    scores captured on the live feed (see capture_live_final_scores())
+    Only alerts logged since the last run and alerts still waiting for a score are merged
+    (see merge_final_scores()); late scores are upserted by (date, title) and alerts older
+    than FINAL_DB_LOOKBACK_DAYS stop waiting
+
+    Returns:
+        dict: Match statistics ('matched', 'unmatched', 'ambiguous', 'by_id', 'fuzzy', 'late', 'pending',
+              'expired', 'appended', 'provisional'), or None if error
+    """
+
+    try:
+        storage = get_storage()
+        state = load_final_db_state()
+
+        # Load results.csv, plus the scores the live feed saw reach FT that it doesn't cover.
+        # Scores captured as a match left the list are only written provisionally: those
+        # alerts keep waiting for the liveResult page to confirm or correct them
+        results_df = storage.read('results')
+        live_results, provisional_live = split_live_captures(storage.read('live_results'))
+        if results_df is None and live_results is None:
+            print(f"❌ {table_path('results')} not found")
+            return None
+        results_df = combine_results(results_df, live_results)
+
+        # Load only the alerts logged since the last run
+        alerts_total = storage.count('alerts')
+        if alerts_total < state['alerts_seen']:
+            print(f"⚠️ {table_path('alerts')} shrank below the watermark - rebuilding final_db state")
+            state = {'alerts_seen': 0, 'pending': []}
+        bootstrap = state['alerts_seen'] == 0
+        new_alerts = storage.read('alerts', offset=state['alerts_seen'])
+        if new_alerts is None:
+            print(f"❌ {table_path('alerts')} not found")
             return None
 
+        stats = {'matched': 0, 'unmatched': 0, 'ambiguous': 0, 'by_id': 0, 'fuzzy': 0, 'late': 0, 'appended': 0,
+                 'provisional': 0}
+
+        # New alerts: everything goes to final_db, with a score if one is in
+        written = new_alerts
+        rescored = []
+        if not new_alerts.empty:
+            new_alerts, new_stats = merge_final_scores(new_alerts, results_df)
+            for name in ('matched', 'unmatched', 'ambiguous', 'by_id', 'fuzzy'):
+                stats[name] += new_stats[name]
+            if bootstrap:
+                # final_db may already hold these rows from the old full rebuilds: keep their scores
+                new_alerts = keep_stored_final_scores(new_alerts, storage.read('final_db'))
+            provisional = provisional_final_scores(new_alerts, provisional_live)
+            written = new_alerts.copy()
+            written.loc[provisional.index, FT_COLUMNS] = provisional[FT_COLUMNS]
+            stats['provisional'] += len(provisional)
+            if bootstrap:
+                storage.upsert('final_db', written)
+                stats['appended'] = len(written)
+            else:
+                inserted = storage.append('final_db', written)[0]
+                stats['appended'] = len(inserted)
+                # Rows a run that died before saving its state already wrote: their scores are
+                # rewritten like late ones, replacing (not adding to) what the stats counted
+                again = written[~written.index.isin(inserted.index) & written['ft_goals'].notna()]
+                if not again.empty:
+                    rescored.append(_scored_rows(stored_final_scores(storage, again), again))
+                    storage.upsert('final_db', again[['date', 'title'] + FT_COLUMNS])
+                written = pd.concat([inserted, again])
+
+        # Pending alerts: only the scores that arrived late are written; a provisional
+        # score already stored for one of them is replaced
+        pending_df = pd.DataFrame(state['pending'])
+        late, provisional = pd.DataFrame(), pd.DataFrame()
+        if not pending_df.empty:
+            pending_df, pending_stats = merge_final_scores(pending_df, results_df)
+            stats['by_id'] += pending_stats['by_id']
+            stats['fuzzy'] += pending_stats['fuzzy']
+            stored = stored_final_scores(storage, pending_df)
+            late = pending_df[pending_df['ft_goals'].notna()]
+            if not late.empty:
+                rescored.append(_scored_rows(stored, late))
+                storage.upsert('final_db', late[['date', 'title'] + FT_COLUMNS])
+            stats['late'] = len(late)
+            # Provisional scores of pending alerts are written (and counted) once
+            provisional = provisional_final_scores(pending_df, provisional_live)
+            if not provisional.empty:
+                keys = [alert_key(date, title) for date, title in zip(provisional['date'], provisional['title'])]
+                provisional = provisional[stored['ft_goals'].reindex(keys).isna().to_numpy()]
+            if not provisional.empty:
+                storage.upsert('final_db', provisional[['date', 'title'] + FT_COLUMNS])
+            stats['provisional'] += len(provisional)
+            stats['matched'] += len(late)
+
+        # Tournament stats follow final_db: rows scored by this run are added and the provisional
+        # scores they replaced taken out (a bootstrap rebuilds them from the merged final_db)
+        finalised = [df[df['ft_goals'].notna()] for df in (written, late, provisional) if not df.empty]
+        replaced = [df for df in rescored if not df.empty]
+        update_tournament_stats(pd.concat(finalised, ignore_index=True) if finalised else None,
+                                rebuild=bootstrap, replaced=pd.concat(replaced) if replaced else None)
+
+        # Alerts still without a score keep waiting until the look-back window closes
+        waiting = [df[df['ft_goals'].isna()] for df in (new_alerts, pending_df) if not df.empty]
+        waiting = pd.concat(waiting, ignore_index=True) if waiting else pd.DataFrame()
+        expired = 0
+        if not waiting.empty:
+            cutoff = pd.Timestamp((datetime.now() - timedelta(days=FINAL_DB_LOOKBACK_DAYS)).date())
+            match_dates = pd.to_datetime(waiting['date'].astype(str).str.strip(), format='%d-%m-%y', errors='coerce')
+            keep = match_dates >= cutoff
+            expired = int((~keep).sum()) if not bootstrap else 0
+            waiting = waiting[keep].drop(columns=FT_COLUMNS)
+
+        state['pending'] = json.loads(waiting.to_json(orient='records')) if not waiting.empty else []
+        # Alerts logged after the read are picked up next run
+        state['alerts_seen'] += len(new_alerts)
+        save_state(FINAL_DB_STATE_FILE, state)
+        get_alias_cache().save()
+
+        stats['pending'] = len(state['pending'])
+        stats['expired'] = expired
+        print(f"🔗 Final scores: {stats['matched']} matched "
+              f"({stats['late']} late, {stats['by_id']} by game id, {stats['fuzzy']} fuzzy), "
+              f"{stats['unmatched']} unmatched, {stats['ambiguous']} ambiguous, "
+              f"{stats['provisional']} provisional from the live feed")
+        print(f"📝 Appended {stats['appended']} new alerts to {table_path('final_db')}, "
+              f"{stats['pending']} still waiting for a result, {stats['expired']} given up")
+        return stats
+
     except Exception as e:
         print(f"❌ Error creating final scores file: {e}")
         return None
 
 
-def backfill_tournament_and_odds():
+# Alerts still missing tournament/odds, carried between runs so each run only
+# looks at new alerts and the unresolved ones
+BACKFILL_STATE_FILE = os.getenv('BACKFILL_STATE_FILE', 'backfill_state.json')
+# Days an unresolved alert keeps being retried against today.csv
+BACKFILL_PENDING_DAYS = int(os.getenv('BACKFILL_PENDING_DAYS', '1'))
+
+
+def backfill_tournament_and_odds(alerts_df=None, today_df=None, today_index=None):
     """
     Backfills existing alerts_log.csv records with tournament and odds data from today.csv
-    Updates records where tournament data is missing
+    Only alerts logged since the last run and alerts still queued as missing data are
+    looked at; the log is only written when something was resolved
+
+    Args:
+        alerts_df (DataFrame): In-memory alerts log, updated in place; read from disk when omitted
+        today_df (DataFrame): Preloaded today.csv; read from disk when omitted
+        today_index (TodayIndex): Prebuilt lookup; built from today_df when omitted
 
     Returns:
-        int: Number of records updated
+        DataFrame: The (date, title) rows resolved, with their tournament, odds and game id
     """
 
-    # Define file paths
-    alerts_log_file = os.getenv('ALERT_LOG_FILE', 'alerts_log.csv')
-    today_csv = os.getenv('REMOTE_TODAY_FILE', 'today.csv')
-
+    backfilled = pd.DataFrame(columns=['date', 'title'] + LOOKUP_COLUMNS)
     try:
-        # Load both files
-        if not os.path.exists(alerts_log_file):
-            print(f"❌ {alerts_log_file} not found")
-            return 0
-
-        if not os.path.exists(today_csv):
-            print(f"❌ {today_csv} not found")
-            return 0
-
-        alerts_df = pd.read_csv(alerts_log_file, quoting=0, escapechar='\\')
-        today_df = pd.read_csv(today_csv, quoting=0, escapechar='\\')
-
-        # Add missing columns if they don't exist
-        for col in ['tournament', 'pre-match_odds_home', 'pre-match_odds_draw', 'pre-match_odds_away']:
-            if col not in alerts_df.columns:
-                alerts_df[col] = ''
-
-        # Update records
-        updates_made = 0
-        for idx, alert_row in alerts_df.iterrows():
-            # Only update if tournament is empty or missing
-            if pd.isna(alert_row.get('tournament')) or alert_row.get('tournament') == '':
-                # Find matching record in today.csv
-                matching_row = today_df[
-                    (today_df['date'] == alert_row['date']) &
-                    (today_df['title'] == alert_row['title'])
-                ]
-
-                if not matching_row.empty:
-                    match = matching_row.iloc[0]
-                    alerts_df.at[idx, 'tournament'] = match.get(
-                        'tournament', '')
-                    alerts_df.at[idx, 'pre-match_odds_home'] = match.get(
-                        'pre-match_odds_home', '')
-                    alerts_df.at[idx, 'pre-match_odds_draw'] = match.get(
-                        'pre-match_odds_draw', '')
-                    alerts_df.at[idx, 'pre-match_odds_away'] = match.get(
-                        'pre-match_odds_away', '')
-                    updates_made += 1
-
-        # Save updated file
-        if updates_made > 0:
-            # alerts_df.to_csv(alerts_log_file, index=False,
-            #                  quoting=3, escapechar='\\')
-            alerts_df.to_csv(alerts_log_file, index=False,
-                             quoting=0)
+        storage = get_storage()
+        state = load_state(BACKFILL_STATE_FILE, {})
+        alerts_seen = int(state.get('alerts_seen', 0))
+        # Queue entries are [date, title] or [date, title, game id]
+        pending = {alert_key(entry[0], entry[1]): tuple(entry) + (None,) * (3 - len(entry))
+                   for entry in state.get('pending', [])}
+
+        # Alerts logged since the last run
+        if alerts_df is not None:
+            alerts_total = len(alerts_df)
+            new_rows = alerts_df.iloc[alerts_seen:] if alerts_total >= alerts_seen else alerts_df
+        else:
+            alerts_total = storage.count('alerts')
+            new_rows = storage.read('alerts', offset=alerts_seen if alerts_total >= alerts_seen else 0)
+            if new_rows is None:
+                print(f"❌ {table_path('alerts')} not found")
+                return backfilled
+
+        # Queue the ones whose tournament is empty or missing
+        if 'tournament' in new_rows.columns:
+            missing = new_rows['tournament'].isna() | (new_rows['tournament'].astype(str).str.strip() == '')
+        else:
+            missing = pd.Series(True, index=new_rows.index)
+        queued = new_rows[missing]
+        queued_ids = game_ids(queued[GAME_ID_COLUMN]) if GAME_ID_COLUMN in queued.columns \
+            else pd.Series(pd.NA, index=queued.index, dtype='Int64')
+        for date, title, game_id in zip(queued['date'], queued['title'], queued_ids):
+            pending[alert_key(date, title)] = (str(date).strip(), str(title).strip(),
+                                               None if pd.isna(game_id) else int(game_id))
+
+        # Stop retrying alerts from days today.csv no longer covers
+        cutoff = (datetime.now() - timedelta(days=BACKFILL_PENDING_DAYS)).date()
+
+        def in_window(date_str):
+            try:
+                return datetime.strptime(date_str, '%d-%m-%y').date() >= cutoff
+            except ValueError:
+                return False
+
+        expired = [key for key, (date, _, _) in pending.items() if not in_window(date)]
+        for key in expired:
+            del pending[key]
+
+        if pending:
+            if today_index is None:
+                if today_df is None:
+                    # Only the fixtures of the days still in the queue
+                    pending_dates = sorted({date for date, _, _ in pending.values()})
+                    today_frames = [storage.read('today', date=date) for date in pending_dates]
+                    if any(frame is None for frame in today_frames):
+                        print(f"❌ {table_path('today')} not found")
+                        return backfilled
+                    today_df = pd.concat(today_frames, ignore_index=True)
+                today_index = TodayIndex(today_df, OddsHistory())
+
+            # Resolve the queue through the event key / (date, title) index
+            pending_df = pd.DataFrame(list(pending.values()), columns=['date', 'title', GAME_ID_COLUMN])
+            enrichment = today_index.enrich(pending_df)
+            resolved = pd.concat([pending_df[['date', 'title']], enrichment[LOOKUP_COLUMNS]],
+                                 axis=1)[enrichment['matched']]
+            # Two titles resolved to one fixture: neither gets to claim its game id
+            clash = event_keys(resolved['date'], resolved[GAME_ID_COLUMN]).duplicated(keep=False)
+            resolved.loc[clash, GAME_ID_COLUMN] = pd.NA
+
+            if not resolved.empty:
+                storage.upsert('alerts', resolved)
+                if alerts_df is not None:
+                    _apply_backfill(alerts_df, resolved)
+                for date, title in zip(resolved['date'], resolved['title']):
+                    del pending[alert_key(date, title)]
+                backfilled = resolved
+
+        get_alias_cache().save()
+
+        # Save the queue only when it moved
+        if not backfilled.empty or expired or alerts_total != alerts_seen:
+            save_state(BACKFILL_STATE_FILE, {'alerts_seen': alerts_total, 'pending': list(pending.values())})
+
+        if not backfilled.empty:
             print(
-                f"📝 Backfilled {updates_made} records with tournament and odds data")
+                f"📝 Backfilled {len(backfilled)} records with tournament and odds data")
         else:
             print("📝 No records needed backfilling")
+        if expired:
+            print(f"⏭️ Gave up on {len(expired)} alerts with no today.csv match")
 
-        return updates_made
+        return backfilled
 
     except Exception as e:
         print(f"❌ Error backfilling data: {e}")
-        return 0
+        return backfilled
 
 
-def filter_recent_matches():
-    """
-    Read CSV file, identify matches logged within the last 5 minutes,
-    apply scenario A and B filters, and print matching titles.
-    
-    Parameters:
-    csv_file_path (str): Path to the CSV file
+def _apply_backfill(alerts_df, resolved):
+    """Copy resolved tournament/odds/game-id into an in-memory alerts frame, matching on (date, title)."""
+    for col in LOOKUP_COLUMNS:
+        if col not in alerts_df.columns:
+            alerts_df[col] = None
+    # An all-empty tournament column is read back as float
+    if alerts_df['tournament'].dtype != object:
+        alerts_df['tournament'] = alerts_df['tournament'].astype(object)
+
+    keys = alerts_df['date'].astype(str).str.strip() + '|' + alerts_df['title'].astype(str).str.strip()
+    values = resolved.set_index(resolved['date'] + '|' + resolved['title'])
+    rows = keys.isin(values.index)
+    for col in LOOKUP_COLUMNS:
+        alerts_df.loc[rows, col] = keys[rows].map(values[col])
+
+
+def recent_backfilled_records(backfilled, alerts_df=None, minutes=10):
     """
-    # Define file paths
-    csv_file_path = os.getenv('ALERT_LOG_FILE', 'alerts_log.csv')
+    Rows backfill just completed that were logged within the last minutes, as records
+    for evaluate_live_records()
 
-    # Read the CSV file
-    try:
-        df = pd.read_csv(csv_file_path)
-        print(f"Loaded {len(df)} total matches from CSV")
-    except Exception as e:
-        print(f"Error reading CSV file: {e}")
-        return
-    
-    # Parse datetime from the two columns
-    df['log_datetime'] = pd.to_datetime(
-        df['date'] + ' ' + df['log_time'],
-        format='%d-%m-%y %H:%M'
-    )
+    A match whose tournament or odds were missing when it reached HT is left out of the
+    poll's scenarios; this gives it the same 10-minute window the log re-read used to.
+
+    Args:
+        backfilled (DataFrame): Rows returned by backfill_tournament_and_odds()
+        alerts_df (DataFrame): In-memory alerts log (already backfilled); read from storage when omitted
+        minutes (int): How far back a row's log time may be
+
+    Returns:
+        list: Full alerts-log records of those rows
+    """
+    if backfilled is None or backfilled.empty:
+        return []
+    keys = {alert_key(date, title) for date, title in zip(backfilled['date'], backfilled['title'])}
+    if alerts_df is None:
+        storage = get_storage()
+        frames = [storage.read('alerts', date=date) for date in sorted(set(backfilled['date'].astype(str)))]
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            return []
+        alerts_df = pd.concat(frames, ignore_index=True)
 
-    # Current time and 10 minutes ago
+    rows = alerts_df[[alert_key(date, title) in keys for date, title in zip(alerts_df['date'], alerts_df['title'])]]
+    if rows.empty:
+        return []
+    log_datetime = pd.to_datetime(
+        rows['date'].astype(str).str.strip() + ' ' + rows['log_time'].astype(str).str.strip(),
+        format='%d-%m-%y %H:%M', errors='coerce')
     current_time = datetime.now()
-    ten_minutes_ago = current_time - timedelta(minutes=10)
+    recent = (log_datetime >= current_time - timedelta(minutes=minutes)) & (log_datetime <= current_time)
+    if recent.any():
+        print(f"Found {int(recent.sum())} backfilled matches logged within the last {minutes} minutes")
+    return rows[recent].drop_duplicates(subset=['date', 'title'], keep='last').to_dict('records')
 
-    # Keep only rows from *today* and within the last 10 minutes
-    today = current_time.date()
-    mask = (df['log_datetime'].dt.date == today) & \
-           (df['log_datetime'] >= ten_minutes_ago) & \
-           (df['log_datetime'] <= current_time)
 
-    recent_matches = df[mask].copy()
+def scenario_matches(df):
+    """
+    Apply the scenarios from scenarios.json to alerts-log rows
+    Rows in globally excluded tournaments or with missing odds are left out
+
+    Args:
+        df (DataFrame): Alerts-log rows (in memory or read back from the log)
+
+    Returns:
+        list: One dict per row and scenario it meets, in scenario order
+    """
+    # Scenario rules from scenarios.json, recompiled only when the file changed
+    scenario_set = get_scenarios()
 
-    # Filter for matches logged within the last 5 minutes
-    # recent_matches = df[df['log_datetime'] >= last_5_min].copy()
-    print(f"Found {len(recent_matches)} matches logged within the last 10 minutes")
-    
-    if len(recent_matches) == 0:
-        print("No recent matches found. Exiting.")
-        return
-    
     # Apply the cleaning filters from your EDA
-    df_clean = recent_matches.copy()
-    
-    # 1. Remove tournaments containing "simulated"
-    df_clean = df_clean[~df_clean['tournament'].str.contains('simulated', case=False, na=False)]
+    df_clean = df.copy()
     
-    # 2. Drop rows missing pre-match odds data
-    df_clean = df_clean.dropna(subset=['pre-match_odds_home', 'pre-match_odds_draw', 'pre-match_odds_away'])
+    # 1. Remove tournaments hitting the global exclusions (e.g. "simulated")
+    df_clean = df_clean[~scenario_set.excluded(df_clean)]
     
-    # 3. Convert odds columns to numeric
-    df_clean['pre-match_odds_home'] = pd.to_numeric(df_clean['pre-match_odds_home'], errors='coerce')
-    df_clean['pre-match_odds_draw'] = pd.to_numeric(df_clean['pre-match_odds_draw'], errors='coerce')
-    df_clean['pre-match_odds_away'] = pd.to_numeric(df_clean['pre-match_odds_away'], errors='coerce')
+    # 2. Convert odds columns to numeric
+    for col in ODDS_COLUMNS:
+        df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
     
-    # 4. Drop any rows with missing values in these columns
-    df_clean = df_clean.dropna(subset=['pre-match_odds_home', 'pre-match_odds_draw', 'pre-match_odds_away'])
-    
-    # print(f"After cleaning: {len(df_clean)} matches remain")
+    # 3. Drop any rows with missing odds
+    df_clean = df_clean.dropna(subset=ODDS_COLUMNS)
+
+    # 4. Tournament stats from final_db, for scenarios bounded on them
+    df_clean = get_tournament_stats().attach(df_clean)
+
+    # 5. Second-half goal probability from the exported model, scored in one batch
+    df_clean = attach_model_probability(df_clean)
     
     if len(df_clean) == 0:
         print("No matches remain after cleaning filters.")
-        return
+        return []
     
-    # Initialize results list
+    # Every scenario's matches, in scenario order
     matching_titles = []
-    
-    # SCENARIO A: 0-0 at halftime with strong favorite filter and exclude some tournaments
-    scenario_a = df_clean[df_clean['ht_goals'] == 0].copy()
-    keywords_a = 'women|juniori|ghana|oman|friendly|liga alef|guatemala|egypt|portugal|spain amateur|segunda|india|peru|bolivia'
-    scenario_a = scenario_a[~scenario_a['tournament'].str.contains(keywords_a, case=False, na=False)]
-    if len(scenario_a) > 0:
-        # Apply filter: either team is a strong favorite (odds <= 1.6)
-        # filtered_a = scenario_a[
-        #     (scenario_a['pre-match_odds_home'] <= 1.6) | 
-        #     (scenario_a['pre-match_odds_away'] <= 1.6)
-        # ]
-        filtered_a = scenario_a[scenario_a['pre-match_odds_draw'] >= 3.9]
-        
-        for _, match in filtered_a.iterrows():
+    for rule, matches in scenario_set.evaluate(df_clean):
+        for match in matches.to_dict('records'):
             matching_titles.append({
+                'date': match['date'],
                 'title': match['title'],
-                'filter': 'Scenario 🅰️ (0aHT + HDO)',
+                'filter': rule.label,
                 'tournament': match['tournament'],
-                'log_time': match['log_datetime'].strftime('%H:%M'),
+                'log_time': str(match['log_time']).strip(),
                 'home_odds': match['pre-match_odds_home'],
                 'draw_odds': match['pre-match_odds_draw'],
-                'away_odds': match['pre-match_odds_away']
-            })
-    
-    # SCENARIO B: 1 goal at halftime with high draw odds filter and exclude some tournaments
-    scenario_b = df_clean[df_clean['ht_goals'] == 1].copy()
-    keywords_b = 'argentina|reserves|india|juniori|egypt|friendly|portugal|spain amateur|oman|segunda|peru|bolivia|malta'
-    scenario_b = scenario_b[~scenario_b['tournament'].str.contains(keywords_b, case=False, na=False)]
-    if len(scenario_b) > 0:
-        # Apply filter: draw odds >= 4.7
-        filtered_b = scenario_b[scenario_b['pre-match_odds_draw'] >= 4.7]
-        
-        for _, match in filtered_b.iterrows():
-            matching_titles.append({
-                'title': match['title'],
-                'filter': 'Scenario 🇧 (1aHT + HDO)',
-                'tournament': match['tournament'],
-                'log_time': match['log_datetime'].strftime('%H:%M'),
-                'home_odds': match['pre-match_odds_home'],
-                'draw_odds': match['pre-match_odds_draw'],
-                'away_odds': match['pre-match_odds_away']
+                'away_odds': match['pre-match_odds_away'],
+                'model_probability': match[PROBABILITY_COLUMN]
             })
+    return matching_titles
 
-    # SCENARIO C: high-scoring tournaments
-    green_leagues = "finland|netherlands|sweden|germany 3. liga|saudi arabia|japan"
-    scenario_c = df_clean[df_clean['tournament'].str.contains(green_leagues, case=False, na=False)].copy()
-    if len(scenario_c) > 0:
-        # Apply filter: draw odds >= 3.8 combined with 0 HT goals condition:
-        filtered_c = scenario_c[
-            (scenario_c['pre-match_odds_draw'] >= 3.8) &
-            (scenario_c['ht_goals'] == 0)
-        ]
-        
-        for _, match in filtered_c.iterrows():
-            matching_titles.append({
-                'title': match['title'],
-                'filter': 'Scenario 🇨 (GL + 0aHT + HDO)',
-                'tournament': match['tournament'],
-                'log_time': match['log_datetime'].strftime('%H:%M'),
-                'home_odds': match['pre-match_odds_home'],
-                'draw_odds': match['pre-match_odds_draw'],
-                'away_odds': match['pre-match_odds_away']
-            })
-    
-    # Print results
+
+def print_scenario_matches(matching_titles):
+    """Print the scenario hits in the format the Slack step forwards."""
     if len(matching_titles) == 0:
         print("\nNo matches found that meet the filter threshold.")
     else:
@@ -1414,61 +2000,81 @@ def filter_recent_matches():
             print(f"   Tournament: {match['tournament']}")
             print(f"   Log Time: {match['log_time']}")
             print(f"   Odds - Home: {match['home_odds']}, Draw: {match['draw_odds']}, Away: {match['away_odds']}")
+            if not pd.isna(match.get('model_probability')):
+                print(f"   Model: {match['model_probability']:.0%} chance of a second-half goal")
             print("-" * 10)
-    
+
+
+def evaluate_live_records(records, alerted=None, outbox=None):
+    """
+    Apply the scenarios to freshly scraped, enriched records before they are
+    persisted, so alerts don't wait on the alerts-log write and backfill
+
+    Args:
+        records (list): Records from build_alert_records()
+        alerted (AlertedState): Matches already alerted; skipped, and updated with the new hits
+        outbox (AlertOutbox): Queue the hits for delivery (see alert_outbox.py)
+
+    Returns:
+        list: Matches that triggered an alert (see scenario_matches())
+    """
+    if not records:
+        print("No live matches to evaluate.")
+        return []
+    df = pd.DataFrame(records)
+    if alerted is not None and len(alerted):
+        keys = df['date'].astype(str).str.strip() + '|' + df['title'].astype(str).str.strip()
+        df = df[~keys.isin(alerted.keys())]
+    print(f"Evaluating {len(df)} live matches not alerted yet")
+    if df.empty:
+        return []
+
+    matching_titles = scenario_matches(df)
+    print_scenario_matches(matching_titles)
+    if outbox is not None:
+        outbox.enqueue(matching_titles)
+    if alerted is not None:
+        alerted.mark(matching_titles)
     return matching_titles
 
 
-def backfill_tournament_averages(main_csv_path, averages_csv_path):
+def backfill_tournament_averages(table='final_db'):
     """
-    Extends a CSV file with tournament averages by matching tournament names.
-    
+    Fills the tournament_averages column of a table from the tournament stats store
+    (mean FT goals per tournament, see tournament_stats.py)
+    Only rows still missing an average are looked up and written back
+
     Args:
-        main_csv_path (str): Path to the main CSV file to be extended
-        averages_csv_path (str): Path to the CSV file containing tournament averages
-    
+        table (str): Storage table to extend ('final_db' or 'alerts')
+
     Returns:
-        None: Overwrites the main CSV file with the extended data
+        int: Number of rows filled, or None if error
     """
-    
+
     try:
-        # Read the main CSV file
-        main_df = pd.read_csv(main_csv_path)
-        
-        # Read the tournament averages CSV file  
-        averages_df = pd.read_csv(averages_csv_path)
-        
-        # Create a dictionary for quick lookup of tournament averages
-        tournament_avg_dict = dict(zip(averages_df['tournament'], averages_df['tournament_average']))
-        
-        # If tournament_averages column doesn't exist, create it
-        if 'tournament_averages' not in main_df.columns:
-            main_df['tournament_averages'] = None
-        
-        # Only fill missing values, preserve existing ones
-        mask = main_df['tournament_averages'].isna()
-        main_df.loc[mask, 'tournament_averages'] = main_df.loc[mask, 'tournament'].map(tournament_avg_dict)
-        
-        # Save back to the original file, overwriting it
-        main_df.to_csv(main_csv_path, index=False)
-        
-        # Print summary statistics
-        total_rows = len(main_df)
-        matched_rows = main_df['tournament_averages'].notna().sum()
-        unmatched_rows = main_df['tournament_averages'].isna().sum()
-        
-        print(f"Safe backfill complete!")
-        print(f"Total rows processed: {total_rows}")
-        print(f"Rows with tournament averages: {matched_rows}")
-        print(f"Rows still missing tournament averages: {unmatched_rows}")
-        
-        if unmatched_rows > 0:
-            unmatched_tournaments = main_df[main_df['tournament_averages'].isna()]['tournament'].unique()
-            print(f"Tournaments without averages: {list(unmatched_tournaments)}")
-    
-    except FileNotFoundError as e:
-        print(f"Error: Could not find file - {e}")
-    except KeyError as e:
-        print(f"Error: Expected column not found - {e}")
+        storage = get_storage()
+        df = storage.read(table)
+        if df is None:
+            print(f"❌ {table_path(table)} not found")
+            return None
+        if 'tournament_averages' not in df.columns:
+            df['tournament_averages'] = None
+
+        # Point lookups per distinct tournament of the rows still missing one
+        missing = df[df['tournament_averages'].isna()]
+        filled = get_tournament_stats().attach(
+            missing[['date', 'title', 'tournament']], {'tournament_averages': 'mean_ft_goals'})
+        filled = filled[filled['tournament_averages'].notna()]
+        if not filled.empty:
+            storage.upsert(table, filled[['date', 'title', 'tournament_averages']])
+
+        unmatched = missing[~missing.index.isin(filled.index)]
+        print(f"📊 Filled tournament averages for {len(filled)} of {len(missing)} rows in {table_path(table)} "
+              f"({len(df) - len(unmatched)} of {len(df)} rows now have one)")
+        if not unmatched.empty:
+            print(f"⏭️ Tournaments without stats: {list(unmatched['tournament'].dropna().unique())}")
+        return len(filled)
+
     except Exception as e:
-        print(f"Error: {e}")
\ No newline at end of file
+        print(f"❌ Error backfilling tournament averages: {e}")
+        return None
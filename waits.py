@@ -0,0 +1,161 @@
+"""DOM readiness waits for the browser scrapers, with per-page-type timing stats."""
+
+
+import os
+import random
+import time
+from collections import defaultdict
+
+from selenium.common.exceptions import WebDriverException
+
+
+# Politeness: never act sooner than FLOOR (+ up to JITTER) seconds after a navigation.
+# This is a lower bound that overlaps with the readiness wait, not an extra sleep.
+POLITENESS_FLOOR = float(os.getenv('SB_POLITENESS_FLOOR', '0.5'))
+POLITENESS_JITTER = float(os.getenv('SB_POLITENESS_JITTER', '0.5'))
+
+WAIT_TIMEOUT = float(os.getenv('SB_WAIT_TIMEOUT', '15'))
+# Row count must hold steady this long before the page counts as rendered
+SETTLE_SECONDS = float(os.getenv('SB_WAIT_SETTLE', '0.4'))
+POLL_SECONDS = 0.1
+# Print the wait summary after each scrape
+WAIT_REPORT = os.getenv('SB_WAIT_REPORT', '') not in ('', '0', 'false')
+
+# Row selectors per page type
+LIVE_ROWS_CSS = 'div.m-table-row.m-content-row.match-row.football-row'
+TODAY_ROWS_CSS = 'div.m-table-row.m-content-row.match-row'
+RESULT_ROWS_CSS = 'section.result-list dl.list dd'
+
+# page type -> list of (seconds, timed_out)
+WAIT_STATS = defaultdict(list)
+
+_ROW_COUNT_JS = "return document.querySelectorAll(arguments[0]).length;"
+# Identifies the rendered list: selected page number plus the first row's text
+_LIST_MARKER_JS = """
+const rows = document.querySelectorAll(arguments[0]);
+const page = document.querySelector('.pagination .pageNum.selected, .pagination .active');
+return [rows.length, rows.length ? rows[0].textContent : '', page ? page.textContent : ''].join('|');
+"""
+
+
+def politeness_delay(started_at=None):
+    """
+    Sleep whatever remains of the politeness floor since started_at
+    """
+    floor = POLITENESS_FLOOR + random.uniform(0, POLITENESS_JITTER)
+    elapsed = time.monotonic() - started_at if started_at is not None else 0
+    if floor > elapsed:
+        time.sleep(floor - elapsed)
+
+
+def record_wait(page_type, seconds, timed_out=False):
+    WAIT_STATS[page_type].append((seconds, timed_out))
+
+
+def _poll(driver, condition, page_type, timeout, started_at):
+    """
+    Poll condition(driver) until it returns a truthy value or timeout passes
+    Returns the last value; the wait is recorded under page_type
+    """
+    started_at = time.monotonic() if started_at is None else started_at
+    deadline = started_at + timeout
+    value = None
+    while True:
+        try:
+            value = condition(driver)
+        except WebDriverException:
+            value = None
+        if value or time.monotonic() >= deadline:
+            break
+        time.sleep(POLL_SECONDS)
+    record_wait(page_type, time.monotonic() - started_at, timed_out=not value)
+    return value
+
+
+def wait_for_rows_stable(driver, rows_css, page_type, timeout=WAIT_TIMEOUT, started_at=None):
+    """
+    Wait until at least one row matches rows_css and the count has stopped changing
+
+    Args:
+        driver: Selenium WebDriver instance
+        rows_css (str): CSS selector of the list rows
+        page_type (str): Label the wait is recorded under, e.g. 'live_list'
+        started_at (float): time.monotonic() of the navigation, for the politeness floor
+
+    Returns:
+        int: Number of rows found (0 on timeout)
+    """
+    state = {'count': -1, 'since': time.monotonic()}
+
+    def settled(driver):
+        count = driver.execute_script(_ROW_COUNT_JS, rows_css)
+        now = time.monotonic()
+        if count != state['count']:
+            state['count'], state['since'] = count, now
+            return None
+        return count if count and now - state['since'] >= SETTLE_SECONDS else None
+
+    count = _poll(driver, settled, page_type, timeout, started_at) or 0
+    politeness_delay(started_at)
+    return count
+
+
+def list_marker(driver, rows_css):
+    """Snapshot that changes whenever the list is re-rendered (new page or date)."""
+    try:
+        return driver.execute_script(_LIST_MARKER_JS, rows_css)
+    except WebDriverException:
+        return None
+
+
+def wait_for_list_change(driver, rows_css, before_marker, page_type, timeout=WAIT_TIMEOUT):
+    """
+    Wait for the list to differ from before_marker, then for its rows to settle
+    Used after clicking 'next page' or picking a date
+
+    Returns:
+        bool: True if the list changed before the timeout
+    """
+    started_at = time.monotonic()
+    changed = _poll(driver, lambda d: list_marker(d, rows_css) != before_marker,
+                    f"{page_type}:change", timeout, started_at)
+    wait_for_rows_stable(driver, rows_css, page_type, timeout, started_at)
+    return bool(changed)
+
+
+def wait_for_elements(driver, css, page_type, timeout=WAIT_TIMEOUT):
+    """
+    Wait for elements matching css to be present without relying on implicit waits
+
+    Returns:
+        list: The matching WebElements (empty on timeout)
+    """
+    return _poll(driver, lambda d: d.execute_script(
+        "return Array.from(document.querySelectorAll(arguments[0]));", css),
+        page_type, timeout, None) or []
+
+
+def wait_summary():
+    """
+    Return {page_type: {'count', 'mean', 'max', 'timeouts'}} for every recorded wait
+    """
+    summary = {}
+    for page_type, waits in WAIT_STATS.items():
+        durations = [seconds for seconds, _ in waits]
+        summary[page_type] = {
+            'count': len(durations),
+            'mean': sum(durations) / len(durations),
+            'max': max(durations),
+            'timeouts': sum(1 for _, timed_out in waits if timed_out),
+        }
+    return summary
+
+
+def report_wait_stats(force=False):
+    """Print the wait summary when SB_WAIT_REPORT is set (or force=True)."""
+    if not (WAIT_REPORT or force):
+        return
+    print("\n⏳ Wait times:")
+    for page_type, stats in sorted(wait_summary().items()):
+        print(f"  - {page_type}: {stats['count']} waits, mean {stats['mean']:.2f}s, "
+              f"max {stats['max']:.2f}s, {stats['timeouts']} timeouts")